@@ -0,0 +1,367 @@
+"""ObsidianVault synchronizes the task lines of an Obsidian vault with Taskr.
+
+Task lines are markdown checkboxes, as rendered by `ObsidianTask.__str__`:
+
+    - [ ] 🔼 name - description - 2024-10-30 📅 #tag
+
+Scans are incremental: the state file remembers the size, modification time and hash of every markdown file together
+with the tasks parsed from it, so only the files that changed since the last scan are read and parsed again. Writing
+back rewrites only the lines whose task changed.
+"""
+
+from primitives.Task import ObsidianTask;
+from TaskJournal import write_atomic;
+from TaskManager import TaskManager;
+from concurrent.futures import ProcessPoolExecutor;
+from dataclasses import dataclass;
+from datetime import datetime;
+from itertools import repeat;
+from typing import Iterable, Iterator;
+import hashlib;
+import json;
+import logging;
+import os;
+import re;
+
+DEFAULT_STATE_FILE:str = os.path.join(".taskr", "vault.json");
+"""`DEFAULT_STATE_FILE` is where the scan state of the vault is kept."""
+
+DEFAULT_PRIORITY:int = 3;
+"""`DEFAULT_PRIORITY` is the priority of task lines without a priority emoji."""
+
+DEFAULT_CHUNKSIZE:int = 64;
+"""`DEFAULT_CHUNKSIZE` is the number of files sent to a worker process at a time, to amortize pickling."""
+
+STATE_VERSION:int = 1;
+
+VARIATION_SELECTOR:str = "\ufe0f";
+
+TASK_LINE = re.compile(r"^(?P<indent>\s*[-*+] \[)(?P<mark>[ xX])\](?: (?P<text>.*))?$");
+"""`TASK_LINE` matches a markdown checkbox, capturing everything up to the mark so it can be kept on write back."""
+
+DUE_DATE = re.compile(r"(?:" + ObsidianTask.DUE + r"\s*(\d{4}-\d{2}-\d{2})|(\d{4}-\d{2}-\d{2})\s*" + ObsidianTask.DUE + r")");
+"""`DUE_DATE` matches `2024-10-30 📅`, as written by `ObsidianTask.dueDate`, and `📅 2024-10-30`, as written by Obsidian."""
+
+TAG = re.compile(r"(?<!\S)#[^\s#]+");
+
+TRAILING_SEPARATORS = re.compile(r"(\s+-)+$");
+
+PRIORITY_OF:dict[str, int] = {emoji.replace(VARIATION_SELECTOR, ""): priority for priority, emoji in ObsidianTask.PRIORITIES.items()};
+
+def parse_task_line(line:str) -> ObsidianTask | None:
+    """Parses a markdown task line into an `ObsidianTask`.
+
+    Args:
+        line (str):         The line, without its line break.
+
+    Returns:
+        ObsidianTask | None:    The task, or None if the line is not a task line or has no name.
+    """
+    match = TASK_LINE.match(line);
+    if(match == None):
+        return None;
+    text = (match.group("text") or "").replace(VARIATION_SELECTOR, "");
+    priority = DEFAULT_PRIORITY;
+    for emoji, value in PRIORITY_OF.items():
+        if(emoji in text):
+            priority = value;
+            text = text.replace(emoji, "", 1);
+            break;
+    due_date = None;
+    due = DUE_DATE.search(text);
+    if(due != None):
+        due_date = datetime.strptime(due.group(1) or due.group(2), "%Y-%m-%d");
+        text = text[:due.start()] + text[due.end():];
+    tags = TAG.findall(text);
+    text = TAG.sub("", text);
+    #   `name - description - due date`, where the description may itself contain " - "
+    parts = [part.strip() for part in TRAILING_SEPARATORS.sub("", text.strip()).split(" - ")];
+    name = parts[0];
+    if(name == ""):
+        return None;
+    return ObsidianTask(name, " - ".join(parts[1:]), priority, due_date, match.group("mark") != " ", tags);
+
+def format_task_line(task:ObsidianTask, indent:str = "- [") -> str:
+    """Renders a task as a markdown task line that `parse_task_line` reads back.
+
+    Args:
+        task (ObsidianTask):    The task.
+        indent (str):           The text preceding the checkbox mark, e.g. `    - [` for a nested task.
+
+    Returns:
+        str:                The task line, without a line break.
+    """
+    text = str(task).strip();
+    #   `ObsidianTask.__str__` leaves a trailing separator when there is no due date
+    if(text.endswith(" -")):
+        text = text[:-2];
+    if(len(task.tags) > 0):
+        text += " " + " ".join(task.tags);
+    return indent + text[len("- ["):];
+
+def read_markdown(root:str, path:str, previous_hash:str | None = None) -> dict | None:
+    """Reads and parses a markdown file of a vault. Runs in worker processes, so it only takes and returns plain data.
+
+    Args:
+        root (str):                 The directory of the vault.
+        path (str):                 The path of the file, relative to `root`.
+        previous_hash (str | None): The hash of the file at the last scan. The file is not parsed again if it still matches.
+
+    Returns:
+        dict | None:        The scan state entry of the file, with `tasks` set to None if the hash matched, or None if the file is gone.
+    """
+    try:
+        with open(os.path.join(root, path), "rb") as f:
+            stat = os.fstat(f.fileno());
+            content = f.read();
+    except FileNotFoundError:
+        return None;
+    digest = hashlib.blake2b(content, digest_size=16).hexdigest();
+    tasks = None if(digest == previous_hash) else ObsidianVault.parse(content.decode("utf-8", errors="replace"));
+    return {"mtime_ns": stat.st_mtime_ns, "size": stat.st_size, "hash": digest, "tasks": tasks};
+
+@dataclass(slots=True)
+class VaultTask:
+    """A VaultTask is a task found in the vault, with the place it was found at."""
+    path            :str;
+    line            :int;
+    text            :str;
+    task            :ObsidianTask;
+
+class ObsidianVault:
+    """An `ObsidianVault` scans the markdown files of a vault for task lines, re-reading only the files that changed.
+
+    The state of the last scan is kept in a JSON file: for each markdown file, its size, modification time, content
+    hash and tasks. A file whose size and modification time are unchanged is not read; a file whose content hash is
+    unchanged is not parsed. With `workers`, the files that must be read are read and parsed by a process pool.
+    """
+    def __init__(self, root:str, state_path:str = DEFAULT_STATE_FILE, workers:int | None = None, chunksize:int = DEFAULT_CHUNKSIZE) -> None:
+        """Creates a new ObsidianVault.
+
+        Args:
+            root (str):         The directory of the vault.
+            state_path (str):   The file the scan state is kept in.
+            workers (int | None):   The number of processes reading changed files, or None to read them in this process.
+            chunksize (int):    The number of files sent to a worker process at a time.
+        """
+        self.root = root;
+        self.state_path = state_path;
+        self.workers = workers;
+        self.chunksize = chunksize;
+        self.files = self.__load_state();
+
+    def __load_state(self) -> dict[str, dict]:
+        """Loads the scan state, or returns an empty state if there is none or it cannot be read."""
+        try:
+            with open(self.state_path, "r") as f:
+                data = json.loads(f.read());
+            if(data.get("version") == STATE_VERSION and os.path.abspath(data.get("root", "")) == os.path.abspath(self.root)):
+                return data["files"];
+        except FileNotFoundError:
+            pass;
+        except Exception as e:
+            logging.error(f"Error loading vault state, rescanning: {e}");
+        return {};
+
+    def save_state(self) -> None:
+        """Atomically writes the scan state."""
+        directory = os.path.dirname(self.state_path);
+        if(directory != "" and not os.path.exists(directory)):
+            os.makedirs(directory);
+        write_atomic(self.state_path, json.dumps({"version": STATE_VERSION, "root": os.path.abspath(self.root), "files": self.files}));
+
+    def markdown_files(self) -> list[str]:
+        """Returns the paths of the markdown files of the vault, relative to its root, in sorted order. Hidden directories are skipped."""
+        paths = [];
+        for directory, directories, files in os.walk(self.root):
+            directories[:] = sorted(d for d in directories if not d.startswith("."));
+            for file in files:
+                if(file.endswith(".md")):
+                    paths.append(os.path.relpath(os.path.join(directory, file), self.root));
+        return sorted(paths);
+
+    @staticmethod
+    def parse(text:str) -> list[dict]:
+        """Parses the task lines of a markdown file.
+
+        Args:
+            text (str):         The content of the file.
+
+        Returns:
+            list[dict]:         For each task line, its line number, text and task, as stored in the scan state.
+        """
+        entries = [];
+        for number, line in enumerate(text.splitlines()):
+            task = parse_task_line(line);
+            if(task != None):
+                entries.append({"line": number, "text": line, "task": task.to_dict()});
+        return entries;
+
+    def __read(self, path:str) -> dict | None:
+        """Reads a markdown file into its scan state entry, reusing the parsed tasks if its content is unchanged."""
+        previous = self.files.get(path);
+        state = read_markdown(self.root, path, None if(previous == None) else previous["hash"]);
+        if(state != None and state["tasks"] == None):
+            state["tasks"] = previous["tasks"];
+        return state;
+
+    def __read_all(self, paths:list[str]) -> list[dict | None]:
+        """Reads markdown files into their scan state entries, in the order of `paths`, with a process pool if configured."""
+        if(self.workers == None or self.workers <= 1 or len(paths) < 2):
+            return [self.__read(path) for path in paths];
+        hashes = [self.files[path]["hash"] if(path in self.files) else None for path in paths];
+        with ProcessPoolExecutor(max_workers=self.workers) as executor:
+            #   `map` returns the results in the order of `paths`, whichever worker finishes first
+            states = list(executor.map(read_markdown, repeat(self.root), paths, hashes, chunksize=self.chunksize));
+        for path, state in zip(paths, states):
+            if(state != None and state["tasks"] == None):
+                state["tasks"] = self.files[path]["tasks"];
+        return states;
+
+    def scan(self) -> list[str]:
+        """Updates the scan state with the markdown files that changed, appeared or disappeared since the last scan.
+
+        Returns:
+            list[str]:          The paths of the files whose tasks changed, relative to the root of the vault.
+        """
+        changed = [];
+        files = {};
+        unread = [];
+        for path in self.markdown_files():
+            try:
+                stat = os.stat(os.path.join(self.root, path));
+            except OSError:
+                continue;
+            previous = self.files.get(path);
+            if(previous != None and previous["mtime_ns"] == stat.st_mtime_ns and previous["size"] == stat.st_size):
+                files[path] = previous;
+            else:
+                unread.append(path);
+        for path, state in zip(unread, self.__read_all(unread)):
+            if(state == None):
+                continue;
+            files[path] = state;
+            previous = self.files.get(path);
+            if(previous == None or previous["tasks"] != state["tasks"]):
+                changed.append(path);
+        #   Keep the files in sorted order, so `tasks` is deterministic however the files were read
+        files = {path: files[path] for path in sorted(files)};
+        changed.extend(path for path in self.files if path not in files);
+        self.files = files;
+        return changed;
+
+    def __iter__(self) -> Iterator[VaultTask]:
+        for path, state in self.files.items():
+            for entry in state["tasks"]:
+                yield VaultTask(path, entry["line"], entry["text"], ObsidianTask.from_dict(entry["task"]));
+
+    def tasks(self) -> TaskManager:
+        """Returns the tasks of the last scan."""
+        return TaskManager.from_tasks(vault_task.task for vault_task in self);
+
+    def write_back(self, tasks:Iterable[ObsidianTask]) -> int:
+        """Rewrites the task lines whose task differs from the task of the same name in `tasks`.
+
+        A line whose only change is its completion only has its checkbox mark replaced, so text the parser does not
+        understand is kept. Files modified since the last scan are left untouched and must be scanned first.
+
+        Args:
+            tasks (Iterable[ObsidianTask]):  The current tasks, e.g. `Taskr.getAllTasks()`.
+
+        Returns:
+            int:                The number of lines rewritten.
+        """
+        by_name = {};
+        for task in tasks:
+            by_name.setdefault(task.name, task);
+        rewritten = 0;
+        for path, state in self.files.items():
+            updates = {};
+            for entry in state["tasks"]:
+                current = by_name.get(entry["task"]["name"]);
+                if(current == None or current.to_dict() == entry["task"]):
+                    continue;
+                match = TASK_LINE.match(entry["text"]);
+                previous = ObsidianTask.from_dict(entry["task"]);
+                previous.completed = current.completed;
+                if(previous == current):
+                    updates[entry["line"]] = entry["text"][:match.end("indent")] + ("x" if(current.completed) else " ") + entry["text"][match.end("mark"):];
+                else:
+                    updates[entry["line"]] = format_task_line(current, match.group("indent"));
+            if(len(updates) > 0 and self.__rewrite(path, state, updates)):
+                rewritten += len(updates);
+        return rewritten;
+
+    def __rewrite(self, path:str, state:dict, updates:dict[int, str]) -> bool:
+        """Replaces lines of a markdown file and updates its scan state entry.
+
+        Args:
+            path (str):             The path of the file, relative to the root of the vault.
+            state (dict):           The scan state entry of the file.
+            updates (dict[int, str]):   The new text of each line to replace, by line number.
+
+        Returns:
+            bool:                   True if the file was rewritten, False if it changed since the last scan.
+        """
+        full_path = os.path.join(self.root, path);
+        with open(full_path, "rb") as f:
+            content = f.read();
+        if(hashlib.blake2b(content, digest_size=16).hexdigest() != state["hash"]):
+            logging.error(f"Vault file changed since the last scan, not writing back: {path}");
+            return False;
+        lines = content.decode("utf-8").splitlines(keepends=True);
+        for number, text in updates.items():
+            ending = lines[number][len(lines[number].rstrip("\r\n")):];
+            lines[number] = text + ending;
+        write_atomic(full_path, "".join(lines).encode("utf-8"));
+        updated = self.__read(path);
+        if(updated != None):
+            state.update(updated);
+        return True;
+
+    def sync(self, taskr) -> tuple[int, int]:
+        """Synchronizes the vault with a `Taskr` storage in both directions.
+
+        Tasks of the files that changed since the last scan are reconciled with the tasks Taskr holds, by name, the
+        vault winning for them: a task Taskr holds exactly once, as in the vault, is left alone; otherwise every task
+        of that name is removed and the vault task added. Tasks gone from the changed files, and from every other file
+        of the vault, are removed. Then the task lines that differ from Taskr are written back.
+
+        Since Taskr is consulted, a sync without a scan state, e.g. the first one against a populated storage or one
+        after the state file was deleted, does not duplicate the tasks Taskr already holds.
+
+        Args:
+            taskr (Taskr):      The Taskr object to synchronize with.
+
+        Returns:
+            tuple[int, int]:    The number of tasks pushed to Taskr, and the number of lines written back to the vault.
+        """
+        previous = {path: [entry["task"] for entry in state["tasks"]] for path, state in self.files.items()};
+        changed = self.scan();
+        held = {};
+        for task in taskr.getAllTasks():
+            held.setdefault(task.name, []).append(task.to_dict());
+        in_vault = {entry["task"]["name"] for state in self.files.values() for entry in state["tasks"]};
+        stale = set();
+        wanted = {};
+        for path in changed:
+            stale.update(task["name"] for task in previous.get(path, []));
+            for entry in (self.files[path]["tasks"] if(path in self.files) else []):
+                wanted.setdefault(entry["task"]["name"], entry["task"]);
+        removed = [];
+        added = [];
+        for name in sorted(stale - in_vault):
+            removed.extend([name] * len(held.get(name, [])));
+        for name, task in wanted.items():
+            if(held.get(name) == [task]):
+                continue;
+            removed.extend([name] * len(held.get(name, [])));
+            added.append(ObsidianTask.from_dict(task));
+        #   Stale tasks go first, so an edited task never coexists with its previous version
+        if(len(removed) > 0):
+            taskr.remove_tasks(removed);
+        if(len(added) > 0):
+            taskr.add_tasks(added);
+        written = self.write_back(taskr.getAllTasks());
+        self.save_state();
+        return (len(added), written);
@@ -0,0 +1,167 @@
+"""TaskArchive moves completed tasks out of the task file into compressed, month-partitioned archive segments.
+
+Tasks have no completion date, so the due date stands in for it: a completed task is archived once its due date is
+before the cutoff, into the segment of the month it was due (`2024-10.json.gz`). Completed tasks without a due date
+are only archived on request, into the `undated.json.gz` segment.
+
+Archived tasks are read lazily: queries only open the segments of the months they cover.
+"""
+
+from primitives.Task import Task;
+from TaskJournal import write_atomic;
+from TaskManager import TaskManager;
+from TaskStream import decode_task, encode_task;
+from datetime import datetime;
+from typing import Iterable, Iterator;
+import gzip;
+import json;
+import os;
+
+UNDATED_SEGMENT:str = "undated";
+"""`UNDATED_SEGMENT` is the segment of the completed tasks without a due date."""
+
+SEGMENT_SUFFIX:str = ".json.gz";
+
+def segment_of(task:Task) -> str:
+    """Returns the segment a task is archived in: the `YYYY-MM` month of its due date, or `UNDATED_SEGMENT`."""
+    if(task.due_date == None):
+        return UNDATED_SEGMENT;
+    return task.due_date.strftime("%Y-%m");
+
+class TaskArchive:
+    """A `TaskArchive` is a directory of gzip-compressed JSON segments of completed tasks, one per month."""
+    __slots__ = ['directory'];
+
+    def __init__(self, directory:str) -> None:
+        """Creates a new TaskArchive.
+
+        Args:
+            directory (str):    The directory of the segments. It is created on the first archive.
+        """
+        self.directory = directory;
+
+    def __path(self, segment:str) -> str:
+        return os.path.join(self.directory, segment + SEGMENT_SUFFIX);
+
+    def segments(self) -> list[str]:
+        """Returns the names of the segments of the archive, dated segments first, in chronological order."""
+        if(not os.path.exists(self.directory)):
+            return [];
+        names = [name[:-len(SEGMENT_SUFFIX)] for name in os.listdir(self.directory) if name.endswith(SEGMENT_SUFFIX)];
+        return sorted(name for name in names if name != UNDATED_SEGMENT) + ([UNDATED_SEGMENT] if(UNDATED_SEGMENT in names) else []);
+
+    def __read(self, segment:str) -> list[dict]:
+        path = self.__path(segment);
+        if(not os.path.exists(path)):
+            return [];
+        with gzip.open(path, "rt", encoding="utf-8") as f:
+            return json.loads(f.read())["tasks"];
+
+    def __write(self, segment:str, tasks:list[dict]) -> None:
+        data = json.dumps({"tasks": tasks}, ensure_ascii=False).encode("utf-8");
+        write_atomic(self.__path(segment), gzip.compress(data));
+
+    def select(self, task_manager:TaskManager, cutoff:datetime, include_undated:bool = False) -> list[Task]:
+        """Returns the tasks of a TaskManager that `archive` would move.
+
+        Args:
+            task_manager (TaskManager): The hot tasks.
+            cutoff (datetime):          Completed tasks due before this time are selected.
+            include_undated (bool):     If True, completed tasks without a due date are selected too.
+
+        Returns:
+            list[Task]:         The completed tasks due before `cutoff`, by due date.
+        """
+        selected = [task for task in task_manager.due_between(datetime.min, cutoff) if task.completed];
+        if(include_undated):
+            selected.extend(task for task in task_manager.get_undated() if task.completed);
+        return selected;
+
+    def add(self, tasks:Iterable[Task]) -> int:
+        """Appends tasks to their segments. Tasks already archived are not archived twice.
+
+        Args:
+            tasks (Iterable[Task]): The tasks to archive.
+
+        Returns:
+            int:                The number of tasks added to the archive.
+        """
+        by_segment = {};
+        for task in tasks:
+            by_segment.setdefault(segment_of(task), []).append(encode_task(task));
+        if(len(by_segment) > 0 and not os.path.exists(self.directory)):
+            os.makedirs(self.directory, exist_ok=True);
+        added = 0;
+        for segment, tasks in by_segment.items():
+            archived = self.__read(segment);
+            #   A crash between archiving and saving the task file leaves the tasks in both, so they come again
+            seen = {json.dumps(task, sort_keys=True) for task in archived};
+            for task in tasks:
+                key = json.dumps(task, sort_keys=True);
+                if(key not in seen):
+                    seen.add(key);
+                    archived.append(task);
+                    added += 1;
+            self.__write(segment, archived);
+        return added;
+
+    def archive(self, task_manager:TaskManager, cutoff:datetime, include_undated:bool = False) -> list[Task]:
+        """Moves the completed tasks due before `cutoff` from a TaskManager into the archive.
+
+        The segments are written before the tasks are removed from the TaskManager; the caller then saves it.
+
+        Args:
+            task_manager (TaskManager): The hot tasks.
+            cutoff (datetime):          Completed tasks due before this time are archived.
+            include_undated (bool):     If True, completed tasks without a due date are archived too.
+
+        Returns:
+            list[Task]:         The archived tasks.
+        """
+        tasks = self.select(task_manager, cutoff, include_undated);
+        self.add(tasks);
+        for task in tasks:
+            task_manager.remove_task(task);
+        return tasks;
+
+    def iter_tasks(self, start:datetime | None = None, end:datetime | None = None) -> Iterator[Task]:
+        """Lazily iterates over the archived tasks, opening only the segments of the months in `[start, end)`.
+
+        Args:
+            start (datetime | None):    Only tasks due at or after this time, or None for no lower bound.
+            end (datetime | None):      Only tasks due before this time, or None for no upper bound.
+
+        Yields:
+            Task:               The next archived task, segment by segment. Undated tasks only come without bounds.
+        """
+        bounded = start != None or end != None;
+        for segment in self.segments():
+            if(segment == UNDATED_SEGMENT):
+                if(bounded):
+                    continue;
+            elif((start != None and segment < start.strftime("%Y-%m")) or (end != None and segment > end.strftime("%Y-%m"))):
+                continue;
+            for data in self.__read(segment):
+                task = decode_task(data);
+                if(bounded and ((start != None and task.due_date < start) or (end != None and task.due_date >= end))):
+                    continue;
+                yield task;
+
+    def get_task(self, name:str) -> Task | None:
+        """Finds an archived task by name, in the dated segments from the newest month back, then in the undated segment."""
+        segments = self.segments();
+        #   `segments` lists the undated segment last
+        dated = [segment for segment in segments if segment != UNDATED_SEGMENT];
+        for segment in dated[::-1] + segments[len(dated):]:
+            for data in self.__read(segment):
+                if(data["name"] == name):
+                    return decode_task(data);
+        return None;
+
+    def get_by_tag(self, tag:str) -> list[Task]:
+        """Returns the archived tasks with the given tag."""
+        return [task for task in self.iter_tasks() if tag in getattr(task, "tags", ())];
+
+    def due_between(self, start:datetime, end:datetime) -> list[Task]:
+        """Returns the archived tasks due in `[start, end)`, by due date."""
+        return sorted(self.iter_tasks(start, end), key=lambda task: task.due_date);
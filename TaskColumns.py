@@ -0,0 +1,286 @@
+"""TaskColumns is a column-oriented, read-only copy of a task set for reporting.
+
+Only the fields reports need are kept, in packed `array` columns: priority, due date (as an epoch), a completion
+bitmask and the tags of each task in CSR form (a flat array of tag ids plus an offset per task). Filters are computed
+as bitsets held in Python integers, so combining and counting them runs in C over whole columns at once.
+"""
+
+from primitives.Task import Task, ObsidianTask;
+from TaskManager import TaskManager;
+from TaskStream import iter_task_dicts;
+from array import array;
+from bisect import bisect_left;
+from datetime import date, datetime, timedelta, timezone;
+from typing import Iterable, Iterator;
+import calendar;
+
+UNDATED:int = -(1 << 63);
+"""`UNDATED` is the due date epoch stored for tasks without a due date."""
+
+WEEK:int = 7 * 24 * 3600;
+"""`WEEK` is the length of a week, in seconds."""
+
+FIRST_MONDAY:int = -3 * 24 * 3600;
+"""`FIRST_MONDAY` is the epoch of the Monday before 1970-01-01, which was a Thursday. Weeks start on Mondays at 00:00 UTC."""
+
+BINARY:bytes = bytes.maketrans(b"\x00\x01", b"01");
+"""`BINARY` translates a vector of 0/1 bytes into the ASCII digits of a binary number."""
+
+def to_epoch(due_date:datetime | None) -> int:
+    """Converts a due date to seconds since the epoch. Naive datetimes are taken as UTC.
+
+    Args:
+        due_date (datetime | None): The due date.
+
+    Returns:
+        int:                The epoch of the due date, or `UNDATED`.
+    """
+    if(due_date == None):
+        return UNDATED;
+    if(due_date.tzinfo == None):
+        return calendar.timegm(due_date.timetuple());
+    return int(due_date.timestamp());
+
+def to_bits(flags:bytes | bytearray) -> int:
+    """Packs a vector of 0/1 bytes into a bitset, byte `i` becoming bit `i`."""
+    if(len(flags) == 0):
+        return 0;
+    return int(flags.translate(BINARY)[::-1], 2);
+
+class TaskColumns:
+    """A `TaskColumns` holds the priority, due date, completion and tags of a task set in parallel columns.
+
+    Filters return bitsets (Python integers whose bit `i` stands for row `i`) that can be combined with `&`, `|` and
+    `~`, and counted with `int.bit_count`. Derived structures are cached and rebuilt after `append`.
+    """
+    __slots__ = ['names', 'priority', 'due', 'completed', 'tags', 'tag_ids', 'tag_offsets', '_tag_index', '_cache'];
+
+    def __init__(self) -> None:
+        self.names = [];
+        self.priority = array("b");
+        self.due = array("q");
+        self.completed = bytearray();
+        self.tags = [];
+        self.tag_ids = array("I");
+        self.tag_offsets = array("I", [0]);
+        self._tag_index = {};
+        self._cache = {};
+
+    def append(self, name:str, priority:int, due_date:datetime | None, completed:bool, tags:Iterable[str] = ()) -> None:
+        """Appends a row.
+
+        Args:
+            name (str):                 The name of the task.
+            priority (int):             The priority of the task.
+            due_date (datetime | None): The due date of the task.
+            completed (bool):           Whether the task is completed.
+            tags (Iterable[str]):       The tags of the task.
+        """
+        row = len(self.names);
+        self.names.append(name);
+        self.priority.append(priority);
+        self.due.append(to_epoch(due_date));
+        if(row % 8 == 0):
+            self.completed.append(0);
+        if(completed):
+            self.completed[row >> 3] |= 1 << (row & 7);
+        for tag in tags:
+            tag_id = self._tag_index.get(tag);
+            if(tag_id == None):
+                tag_id = self._tag_index[tag] = len(self.tags);
+                self.tags.append(tag);
+            self.tag_ids.append(tag_id);
+        self.tag_offsets.append(len(self.tag_ids));
+        self._cache.clear();
+
+    @staticmethod
+    def from_tasks(tasks:Iterable[Task]) -> "TaskColumns":
+        """Builds the columns of a task set.
+
+        Args:
+            tasks (Iterable[Task]):     The tasks, e.g. a `TaskManager` or `TaskStorage.iter_tasks()`.
+
+        Returns:
+            TaskColumns:        The columns of the tasks.
+        """
+        columns = TaskColumns();
+        for task in tasks:
+            columns.append(task.name, task.priority, task.due_date, task.completed, getattr(task, "tags", ()));
+        return columns;
+
+    @staticmethod
+    def from_task_manager(task_manager:TaskManager) -> "TaskColumns":
+        """Builds the columns of the tasks of a `TaskManager`, in priority order."""
+        return TaskColumns.from_tasks(task_manager.get_tasks());
+
+    @staticmethod
+    def from_file(path:str) -> "TaskColumns":
+        """Builds the columns of a task file by streaming it, without creating a `Task` per row.
+
+        The journal of the task file is not applied; use `from_tasks(storage.iter_tasks())` to include it.
+
+        Args:
+            path (str):         The path of the task file.
+
+        Returns:
+            TaskColumns:        The columns of the tasks in the file.
+        """
+        columns = TaskColumns();
+        with open(path, "r") as f:
+            for data in iter_task_dicts(f):
+                columns.append(data["name"], data["priority"], ObsidianTask.parseDueDate(data["due_date"]), data["completed"], data.get("tags", ()));
+        return columns;
+
+    def __len__(self) -> int:
+        return len(self.names);
+
+    def is_completed(self, row:int) -> bool:
+        return bool(self.completed[row >> 3] & (1 << (row & 7)));
+
+    def get_tags(self, row:int) -> list[str]:
+        """Returns the tags of a row."""
+        return [self.tags[tag_id] for tag_id in self.tag_ids[self.tag_offsets[row]:self.tag_offsets[row + 1]]];
+
+    def get_due_date(self, row:int) -> datetime | None:
+        """Returns the due date of a row, as an aware UTC datetime."""
+        if(self.due[row] == UNDATED):
+            return None;
+        return datetime.fromtimestamp(self.due[row], timezone.utc);
+
+    def rows(self, mask:int) -> Iterator[int]:
+        """Iterates over the rows of a bitset, in order."""
+        digits = bin(mask)[:1:-1];
+        row = digits.find("1");
+        while(row != -1):
+            yield row;
+            row = digits.find("1", row + 1);
+
+    def __cached(self, key, build):
+        if(key not in self._cache):
+            self._cache[key] = build();
+        return self._cache[key];
+
+    def all_mask(self) -> int:
+        """Returns the bitset of every row."""
+        return (1 << len(self.names)) - 1;
+
+    def completed_mask(self) -> int:
+        """Returns the bitset of the completed rows."""
+        return int.from_bytes(self.completed, "little");
+
+    def priority_mask(self, priority:int) -> int:
+        """Returns the bitset of the rows with the given priority."""
+        def build():
+            table = bytes(0x31 if(i == priority & 0xff) else 0x30 for i in range(256));
+            digits = self.priority.tobytes().translate(table)[::-1];
+            return int(digits, 2) if(len(digits) > 0) else 0;
+        return self.__cached(("priority", priority), build);
+
+    def tag_mask(self, tag:str) -> int:
+        """Returns the bitset of the rows with the given tag."""
+        def build():
+            tag_id = self._tag_index.get(tag);
+            if(tag_id == None):
+                return 0;
+            flags = bytearray(len(self.names));
+            for row in self.__tag_rows()[tag_id]:
+                flags[row] = 1;
+            return to_bits(flags);
+        return self.__cached(("tag", tag), build);
+
+    def __tag_rows(self) -> list[array]:
+        """Returns the rows of each tag id, inverting the CSR columns in a single pass."""
+        def build():
+            tag_rows = [array("I") for tag in self.tags];
+            offsets = self.tag_offsets;
+            for row in range(len(self.names)):
+                for i in range(offsets[row], offsets[row + 1]):
+                    tag_rows[self.tag_ids[i]].append(row);
+            return tag_rows;
+        return self.__cached("tag_rows", build);
+
+    def __due_order(self) -> tuple[array, array]:
+        """Returns the dated rows sorted by due date, and their sorted due dates."""
+        def build():
+            order = array("I", sorted((row for row in range(len(self.due)) if self.due[row] != UNDATED), key=self.due.__getitem__));
+            return (order, array("q", (self.due[row] for row in order)));
+        return self.__cached("due", build);
+
+    def due_mask(self, start:datetime | None = None, end:datetime | None = None) -> int:
+        """Returns the bitset of the rows due in `[start, end)`. A missing bound is open; undated rows never match."""
+        order, dues = self.__due_order();
+        lo = 0 if(start == None) else bisect_left(dues, to_epoch(start));
+        hi = len(dues) if(end == None) else bisect_left(dues, to_epoch(end));
+        flags = bytearray(len(self.names));
+        for row in order[lo:hi]:
+            flags[row] = 1;
+        return to_bits(flags);
+
+    def mask(self, priority:int | None = None, completed:bool | None = None, tags:Iterable[str] = (), any_tags:Iterable[str] = (), due_from:datetime | None = None, due_to:datetime | None = None) -> int:
+        """Returns the bitset of the rows matching every given filter.
+
+        Args:
+            priority (int | None):      Only rows with this priority.
+            completed (bool | None):    Only completed, or only open, rows.
+            tags (Iterable[str]):       Only rows with all of these tags.
+            any_tags (Iterable[str]):   Only rows with at least one of these tags.
+            due_from (datetime | None): Only rows due at or after this time.
+            due_to (datetime | None):   Only rows due before this time.
+
+        Returns:
+            int:                The bitset of the matching rows.
+        """
+        mask = self.all_mask();
+        if(priority != None):
+            mask &= self.priority_mask(priority);
+        if(completed == True):
+            mask &= self.completed_mask();
+        elif(completed == False):
+            mask &= ~self.completed_mask();
+        for tag in tags:
+            mask &= self.tag_mask(tag);
+        any_tags = list(any_tags);
+        if(len(any_tags) > 0):
+            found = 0;
+            for tag in any_tags:
+                found |= self.tag_mask(tag);
+            mask &= found;
+        if(due_from != None or due_to != None):
+            mask &= self.due_mask(due_from, due_to);
+        return mask;
+
+    def count(self, **filters) -> int:
+        """Returns the number of rows matching the filters of `mask`."""
+        return self.mask(**filters).bit_count();
+
+    def count_by_priority(self, **filters) -> dict[int, int]:
+        """Returns the number of rows matching the filters of `mask`, for each priority."""
+        mask = self.mask(**filters);
+        return {priority: (mask & self.priority_mask(priority)).bit_count() for priority in sorted(set(self.priority))};
+
+    def count_by_tag(self, **filters) -> dict[str, int]:
+        """Returns the number of rows matching the filters of `mask`, for each tag."""
+        mask = self.mask(**filters);
+        return {tag: (mask & self.tag_mask(tag)).bit_count() for tag in self.tags};
+
+    def open_by_priority_per_week(self) -> dict[date, dict[int, int]]:
+        """Counts the open rows of each priority, for each week they are due in. Undated rows are not counted.
+
+        Returns:
+            dict[date, dict[int, int]]: For the Monday starting each week, the number of open rows of each priority.
+        """
+        order, dues = self.__due_order();
+        if(len(order) == 0):
+            return {};
+        #   One byte per dated row, in due order: the priority, and whether the row is completed
+        codes = self.__cached("codes", lambda: bytes(((self.priority[row] & 0x7f) << 1) | self.is_completed(row) for row in order));
+        priorities = sorted(set(self.priority));
+        report = {};
+        lo = 0;
+        while(lo < len(dues)):
+            week = FIRST_MONDAY + (dues[lo] - FIRST_MONDAY) // WEEK * WEEK;
+            hi = bisect_left(dues, week + WEEK, lo);
+            chunk = codes[lo:hi];
+            report[date(1970, 1, 1) + timedelta(seconds=week)] = {priority: chunk.count((priority & 0x7f) << 1) for priority in priorities};
+            lo = hi;
+        return report;
@@ -0,0 +1,108 @@
+"""TaskFeed is a persistent change feed of a `TaskManager`.
+
+A `TaskFeed` subscribes to a TaskManager and appends every `TaskEvent` to a log file, numbered with its own sequence
+numbers that keep increasing across processes and restarts. A consumer that remembers the last sequence number it
+processed resumes with `since`, and keeps a derived view (tag counts, due reminders, ...) up to date without reading
+every task again.
+"""
+
+from primitives.Task import Task, ObsidianTask;
+from TaskJournal import OPERATIONS, TaskJournal;
+from TaskManager import TaskEvent, TaskManager;
+from TaskStream import decode_task, encode_due_date, encode_task;
+from typing import Iterator;
+
+class TaskFeedGap(Exception):
+    """`TaskFeedGap` is raised when events a consumer has not seen yet were truncated from the feed."""
+    pass;
+
+class TaskFeedLog(TaskJournal):
+    """A `TaskFeedLog` is a journal whose records are events rather than mutations, so it also accepts `edit`."""
+    __slots__ = [];
+
+    operations:tuple = OPERATIONS + ("edit",);
+
+class TaskFeed:
+    """A `TaskFeed` records the events of TaskManagers in a log file and replays them from a sequence number.
+
+    Events are written as they happen, or, with `buffered`, kept in memory until `flush`, so bulk changes cost a single
+    write.
+    """
+    __slots__ = ['log', 'buffered', 'pending'];
+
+    def __init__(self, path:str, buffered:bool = False) -> None:
+        """Creates a new TaskFeed.
+
+        Args:
+            path (str):         The path of the log file. It is created on the first event.
+            buffered (bool):    If True, events are written by `flush` instead of as they happen.
+        """
+        self.log = TaskFeedLog(path);
+        self.buffered = buffered;
+        self.pending = [];
+
+    def attach(self, task_manager:TaskManager) -> None:
+        """Records every change of a TaskManager from now on."""
+        task_manager.subscribe(self.record);
+
+    def detach(self, task_manager:TaskManager) -> None:
+        """Stops recording the changes of a TaskManager."""
+        task_manager.unsubscribe(self.record);
+
+    def record(self, event:TaskEvent) -> None:
+        """Records an event. Subscribed to TaskManagers by `attach`."""
+        record = {"op": event.op, "task": encode_task(event.task)};
+        if(event.previous != None):
+            previous = dict(event.previous);
+            if("due_date" in previous):
+                previous["due_date"] = encode_due_date(previous["due_date"]);
+            record["previous"] = previous;
+        self.pending.append(record);
+        if(not self.buffered):
+            self.flush();
+
+    def flush(self) -> int:
+        """Writes the buffered events with a single write.
+
+        Returns:
+            int:                The sequence number of the last event of the feed.
+        """
+        if(len(self.pending) == 0):
+            return self.log.last_seq;
+        seq = self.log.extend(self.pending);
+        self.pending = [];
+        return seq;
+
+    @property
+    def last_seq(self) -> int:
+        """The sequence number of the last event written to the feed."""
+        return self.log.last_seq;
+
+    def since(self, seq:int) -> Iterator[TaskEvent]:
+        """Iterates over the events written after `seq`, in order.
+
+        Args:
+            seq (int):          The sequence number of the last event already processed, or 0 for every event.
+
+        Yields:
+            TaskEvent:          The next event. Its task is a copy decoded from the feed.
+
+        Raises:
+            TaskFeedGap:        If events after `seq` were truncated; the consumer must rebuild its view from the tasks.
+        """
+        for record in self.log.records():
+            if(record["op"] == "base"):
+                if(record["seq"] > seq):
+                    raise TaskFeedGap(f"Events {seq + 1} to {record['seq']} were truncated from {self.log.path}");
+                continue;
+            if(record["seq"] <= seq):
+                continue;
+            previous = record.get("previous");
+            if(previous != None and "due_date" in previous):
+                previous["due_date"] = ObsidianTask.parseDueDate(previous["due_date"]);
+            yield TaskEvent(record["seq"], record["op"], decode_task(record["task"]), previous);
+
+    def truncate(self) -> None:
+        """Discards every written event, keeping the sequence numbers increasing. Consumers that are behind get a `TaskFeedGap`."""
+        self.flush();
+        self.log.reset(self.log.last_seq);
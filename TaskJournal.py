@@ -0,0 +1,241 @@
+"""TaskJournal is an append-only write-ahead journal for the `TaskManager` class.
+
+Each mutation is stored as a single JSON record on its own line, so recording a change costs O(1) on disk
+instead of rewriting the whole task file. The journal is folded back into the task file by `Taskr.compact`.
+"""
+
+from primitives.Task import Task, ObsidianTask;
+from TaskManager import TaskManager;
+from TaskStream import decode_task;
+from typing import Iterator;
+import json;
+import logging;
+import os;
+import tempfile;
+
+OPERATIONS:tuple = ("add", "remove", "complete", "uncomplete");
+"""`OPERATIONS` are the mutations that can be recorded in a `TaskJournal`."""
+
+def write_atomic(path:str, text:str | bytes) -> None:
+    """Replaces the content of a file so that a crash leaves either the old or the new content, never a truncated file.
+
+    The text is written to a temporary file in the same directory, synced to disk and renamed over `path`.
+
+    Args:
+        path (str):         The path of the file to replace.
+        text (str | bytes): The new content of the file. Bytes are written as they are.
+    """
+    directory = os.path.dirname(os.path.abspath(path));
+    fd, tmp = tempfile.mkstemp(prefix=os.path.basename(path) + ".", suffix=".tmp", dir=directory);
+    try:
+        with os.fdopen(fd, "wb" if(isinstance(text, bytes)) else "w") as f:
+            f.write(text);
+            f.flush();
+            os.fsync(f.fileno());
+        os.replace(tmp, path);
+    except BaseException:
+        os.unlink(tmp);
+        raise;
+    #   Make the rename itself durable; directories cannot be opened on every platform
+    try:
+        dir_fd = os.open(directory, os.O_RDONLY);
+    except OSError:
+        return;
+    try:
+        os.fsync(dir_fd);
+    except OSError:
+        pass;
+    finally:
+        os.close(dir_fd);
+
+def apply_record(task_manager:TaskManager, record:dict) -> bool:
+    """Applies a journal record to a `TaskManager`.
+
+    A `remove` record may carry the whole `task` besides its `name`, as written by `TaskStream.encode_task`: among the
+    tasks of that name, it then removes the one equal to it rather than the first by priority.
+
+    Args:
+        task_manager (TaskManager): The TaskManager to mutate.
+        record (dict):              The record to apply, as written by `TaskJournal.append`.
+
+    Returns:
+        bool:                       True if the record was applied, False if it targets a missing task.
+    """
+    op = record["op"];
+    if(op == "add"):
+        task_manager.add_task(ObsidianTask.from_dict(record["task"]));
+        return True;
+    if(op not in OPERATIONS):
+        raise ValueError(f"Invalid journal operation: {op}");
+    task = task_manager.get_task(record["name"]) if(op != "remove" or "task" not in record) else decode_task(record["task"]);
+    if(task == None or task not in task_manager):
+        return False;
+    if(op == "remove"):
+        task_manager.remove_task(task);
+    elif(op == "complete"):
+        task_manager.complete_task(task);
+    elif(op == "uncomplete"):
+        task_manager.uncomplete_task(task);
+    return True;
+
+class TaskJournal:
+    """A `TaskJournal` is an append-only file of mutation records.
+
+    Every record carries a monotonically increasing `seq` number. The task file stores the `seq` of the last record
+    folded into it, so records already present in the task file are skipped on replay even if the process died
+    between writing the task file and resetting the journal.
+    """
+    __slots__ = ['path'];
+
+    operations:tuple = OPERATIONS;
+    """`operations` are the values of `op` accepted by `extend`."""
+
+    def __init__(self, path:str) -> None:
+        """Creates a new TaskJournal.
+
+        Args:
+            path (str):         The path of the journal file. It is created on the first append.
+        """
+        self.path = path;
+
+    def __bounds(self) -> tuple[int, int]:
+        """Reads the base and last sequence numbers of the journal from its first and last lines.
+
+        Sequence numbers are contiguous, so this is enough to know the number of pending records without
+        reading the whole journal, and it stays correct when another `Taskr` appends to the same file.
+
+        Returns:
+            tuple[int, int]:    The sequence number folded into the task file and the last sequence number.
+        """
+        if(not os.path.exists(self.path) or os.path.getsize(self.path) == 0):
+            return (0, 0);
+        with open(self.path, "rb") as f:
+            first = f.readline();
+            f.seek(0, os.SEEK_END);
+            end = f.tell();
+            block = min(end, 4096);
+            while True:
+                f.seek(end - block);
+                tail = f.read(block);
+                if(tail.count(b"\n") >= 2 or block == end):
+                    break;
+                block = min(end, block * 2);
+        base = self.__base(first);
+        if(base == None):
+            #   The first line was torn by a crash: the base is that of the first record written after it
+            with open(self.path, "rb") as f:
+                f.readline();
+                for line in f:
+                    base = self.__base(line);
+                    if(base != None):
+                        break;
+            if(base == None):
+                return (0, 0);
+        for line in reversed(tail.splitlines()):
+            try:
+                return (base, json.loads(line)["seq"]);
+            except json.JSONDecodeError:
+                continue;
+        return (base, base);
+
+    @staticmethod
+    def __base(line:bytes) -> int | None:
+        """Returns the sequence number a line of the journal starts after, or None if the line is not a record."""
+        try:
+            record = json.loads(line);
+            return record["seq"] if(record["op"] == "base") else record["seq"] - 1;
+        except (json.JSONDecodeError, KeyError, TypeError):
+            return None;
+
+    @property
+    def last_seq(self) -> int:
+        """The sequence number of the last record written to the journal."""
+        return self.__bounds()[1];
+
+    def append(self, record:dict) -> int:
+        """Appends a record to the journal.
+
+        Args:
+            record (dict):      The record to append. It must have an `op` key from `operations`.
+
+        Returns:
+            int:                The sequence number assigned to the record.
+        """
+        return self.extend([record]);
+
+    def extend(self, records:list[dict]) -> int:
+        """Appends several records to the journal with a single write.
+
+        Args:
+            records (list[dict]): The records to append. Each must have an `op` key from `operations`.
+
+        Returns:
+            int:                The sequence number assigned to the last record.
+        """
+        seq = self.last_seq;
+        lines = [];
+        for record in records:
+            if(record["op"] not in self.operations):
+                raise ValueError(f"Invalid journal operation: {record['op']}");
+            seq += 1;
+            lines.append(json.dumps({"seq": seq, **record}) + "\n");
+        with open(self.path, "ab+") as f:
+            #   Never glue a record to a line torn by a previous crash
+            if(f.tell() > 0):
+                f.seek(-1, os.SEEK_END);
+                if(f.read(1) != b"\n"):
+                    lines.insert(0, "\n");
+            f.write("".join(lines).encode());
+            f.flush();
+            os.fsync(f.fileno());
+        return seq;
+
+    def records(self) -> Iterator[dict]:
+        """Iterates over the records in the journal, in the order they were written.
+
+        Torn lines (e.g. left behind by a crash during an append) are ignored.
+
+        Yields:
+            dict:               The next record in the journal.
+        """
+        if(not os.path.exists(self.path)):
+            return;
+        with open(self.path, "r") as f:
+            for line in f:
+                if(not line.strip()):
+                    continue;
+                try:
+                    yield json.loads(line);
+                except json.JSONDecodeError:
+                    logging.warning(f"Ignoring torn record in Taskr journal: {line!r}");
+
+    def replay(self, task_manager:TaskManager, after:int = 0) -> int:
+        """Replays the journal over a `TaskManager`.
+
+        Args:
+            task_manager (TaskManager): The TaskManager loaded from the task file.
+            after (int):                The sequence number already folded into the task file.
+
+        Returns:
+            int:                        The sequence number of the last record applied, or `after` if none was.
+        """
+        seq = after;
+        for record in self.records():
+            if(record["op"] == "base" or record["seq"] <= seq):
+                continue;
+            apply_record(task_manager, record);
+            seq = record["seq"];
+        return seq;
+
+    def reset(self, seq:int) -> None:
+        """Discards every record of the journal, keeping its sequence number at `seq`.
+
+        Args:
+            seq (int):          The sequence number folded into the task file.
+        """
+        write_atomic(self.path, json.dumps({"seq": seq, "op": "base"}) + "\n");
+
+    def __len__(self) -> int:
+        """Returns the number of records waiting to be folded into the task file."""
+        base, last_seq = self.__bounds();
+        return last_seq - base;
@@ -1,60 +1,360 @@
-from primitives.Task import Task;
+from primitives.Task import Task, ObsidianTask;
+from bisect import bisect_left, bisect_right, insort_right;
+from dataclasses import dataclass;
+from datetime import datetime;
+from operator import attrgetter;
+from typing import Callable, Iterable;
+import sys;
+
+priority_of = attrgetter("priority");
+"""`priority_of` is the sort key of the tasks of a `TaskManager`."""
+
+due_date_of = attrgetter("due_date");
+"""`due_date_of` is the sort key of the due date index of a `TaskManager`."""
+
+EDITABLE:tuple = ("name", "description", "priority", "due_date", "completed", "tags");
+"""`EDITABLE` are the fields of a task that `TaskManager.edit_task` can change."""
+
+@dataclass(slots=True)
+class TaskEvent:
+    """A TaskEvent is a change made to a `TaskManager`, as delivered to its subscribers.
+
+    `seq` increases by one with every change of the TaskManager. `op` is `add`, `remove`, `complete`, `uncomplete` or
+    `edit`; for `edit`, `previous` holds the values the changed fields had before.
+    """
+    seq             :int;
+    op              :str;
+    task            :Task;
+    previous        :dict | None = None;
 
 class TaskManager:
-    __slots__ = ['tasks'];
+    """A TaskManager keeps a list of tasks sorted by priority.
+
+    Tasks are inserted with a binary search, after every task of the same priority, so the list is always ordered by
+    priority and then by insertion order without being re-sorted.
+
+    Tasks are also indexed by name, by tag (for `ObsidianTask` objects) and by due date, so lookups do not scan the
+    whole list. The indexes are kept consistent by `add_task`, `remove_task` and `edit_task`; a task must not be
+    renamed, retagged, rescheduled or reprioritized in place while it is managed.
+
+    Every change is numbered and delivered as a `TaskEvent` to the subscribers of the TaskManager, in order.
+    """
+    __slots__ = ['tasks', '_by_name', '_by_tag', '_by_due', '_undated', '_seq', '_listeners'];
     
     def __init__(self):
         self.tasks = [];
+        self._by_name = {};
+        self._by_tag = {};
+        self._by_due = [];
+        self._undated = {};
+        self._seq = 0;
+        self._listeners = [];
+        
+    @property
+    def seq(self) -> int:
+        """The sequence number of the last change."""
+        return self._seq;
+        
+    def subscribe(self, listener:Callable[[TaskEvent], None]) -> Callable[[TaskEvent], None]:
+        """Calls `listener` with a `TaskEvent` after every change, until it is unsubscribed.
+
+        Args:
+            listener (Callable[[TaskEvent], None]): The function to call. It must not change the TaskManager.
+
+        Returns:
+            Callable[[TaskEvent], None]:    The listener, to pass to `unsubscribe`.
+        """
+        self._listeners.append(listener);
+        return listener;
+        
+    def unsubscribe(self, listener:Callable[[TaskEvent], None]):
+        self._listeners.remove(listener);
+        
+    def __emit(self, op:str, task:Task, previous:dict | None = None):
+        """Numbers a change and delivers it to the subscribers."""
+        self._seq += 1;
+        if(len(self._listeners) > 0):
+            event = TaskEvent(self._seq, op, task, previous);
+            for listener in tuple(self._listeners):
+                listener(event);
+        
+    def __index(self, task:Task):
+        """Adds a task to the name and tag indexes."""
+        self._by_name.setdefault(task.name, []).append(task);
+        for tag in getattr(task, "tags", ()):
+            self._by_tag.setdefault(tag, {})[id(task)] = task;
+        if(task.due_date == None):
+            self._undated[id(task)] = task;
+            
+    def __unindex(self, task:Task):
+        """Removes a task from the name and tag indexes."""
+        named = self._by_name[task.name];
+        named[:] = [t for t in named if t is not task];
+        if(len(named) == 0):
+            del self._by_name[task.name];
+        for tag in getattr(task, "tags", ()):
+            tagged = self._by_tag.get(tag);
+            if(tagged != None):
+                tagged.pop(id(task), None);
+                if(len(tagged) == 0):
+                    del self._by_tag[tag];
+        if(task.due_date == None):
+            del self._undated[id(task)];
+        else:
+            lo = bisect_left(self._by_due, task.due_date, key=due_date_of);
+            hi = bisect_right(self._by_due, task.due_date, lo=lo, key=due_date_of);
+            for i in range(lo, hi):
+                if(self._by_due[i] is task):
+                    del self._by_due[i];
+                    break;
+                    
+    def __position(self, task:Task) -> int:
+        """Returns the position of a managed task in the sorted list, searching only among the tasks of its priority."""
+        lo = bisect_left(self.tasks, task.priority, key=priority_of);
+        hi = bisect_right(self.tasks, task.priority, lo=lo, key=priority_of);
+        for i in range(lo, hi):
+            if(self.tasks[i] is task):
+                return i;
+        raise ValueError(f"Task not found: {task.name}");
+        
+    def __find(self, task:Task) -> Task | None:
+        """Returns the managed task that is, or is equal to, the given task."""
+        named = self._by_name.get(task.name, ());
+        for t in named:
+            if(t is task):
+                return t;
+        for t in named:
+            if(t == task):
+                return t;
+        return None;
+        
+    def __insert(self, task:Task):
+        """Inserts a task in the sorted lists and the indexes."""
+        insort_right(self.tasks, task, key=priority_of);
+        if(task.due_date != None):
+            insort_right(self._by_due, task, key=due_date_of);
+        self.__index(task);
         
     def add_task(self, task:Task):
-        self.tasks.append(task);
-        self.tasks.sort(key=lambda x: x.priority);
+        self.__insert(task);
+        self.__emit("add", task);
+        
+    def add_tasks(self, tasks:Iterable[Task]):
+        """Adds several tasks at once, sorting the list a single time.
+
+        Args:
+            tasks (Iterable[Task]): The tasks to add.
+        """
+        tasks = list(tasks);
+        self.tasks.extend(tasks);
+        self.tasks.sort(key=priority_of);
+        self._by_due.extend(task for task in tasks if task.due_date != None);
+        self._by_due.sort(key=due_date_of);
+        for task in tasks:
+            self.__index(task);
+        for task in tasks:
+            self.__emit("add", task);
         
     def remove_task(self, task:Task):
-        self.tasks.remove(task);
+        managed = self.__find(task);
+        if(managed == None):
+            raise ValueError(f"Task not found: {task.name}");
+        del self.tasks[self.__position(managed)];
+        self.__unindex(managed);
+        self.__emit("remove", managed);
         
     def complete_task(self, task:Task):
         task.completed = True;
+        self.__emit("complete", task);
         
     def uncomplete_task(self, task:Task):
         task.completed = False;
+        self.__emit("uncomplete", task);
+        
+    def edit_task(self, task:Task, **changes) -> Task:
+        """Changes fields of a managed task, moving it in the sorted lists and the indexes as needed.
+
+        Args:
+            task (Task):        The task to edit, or a task equal to it.
+            **changes:          The new values of fields of `EDITABLE`, e.g. `priority=4` or `due_date=None`.
+
+        Returns:
+            Task:               The edited task.
+
+        Raises:
+            ValueError:         If the task is not managed or a field cannot be edited.
+        """
+        for field in changes:
+            if(field not in EDITABLE or (field == "tags" and not hasattr(task, "tags"))):
+                raise ValueError(f"Invalid task field: {field}");
+        managed = self.__find(task);
+        if(managed == None):
+            raise ValueError(f"Task not found: {task.name}");
+        previous = {field: getattr(managed, field) for field in changes};
+        if("tags" in changes):
+            changes["tags"] = [sys.intern(tag) for tag in changes["tags"]];
+        #   Only fields that are indexed require moving the task
+        moved = any(field in changes for field in ("name", "priority", "due_date", "tags"));
+        if(moved):
+            del self.tasks[self.__position(managed)];
+            self.__unindex(managed);
+        for field, value in changes.items():
+            setattr(managed, field, value);
+        if(moved):
+            self.__insert(managed);
+        self.__emit("edit", managed, previous);
+        return managed;
         
     def get_tasks(self):
         return self.tasks;
-    
+        
     def get_task(self, name:str):
-        for task in self.tasks:
-            if(task.name == name):
-                return task;
-        return None;
-    
+        named = self._by_name.get(name);
+        if(named == None):
+            return None;
+        #   `min` keeps the first of equal priorities, as the sorted list does
+        return min(named, key=priority_of);
+        
+    def get_tags(self) -> dict[str, int]:
+        """Returns the number of tasks of each tag.
+
+        Returns:
+            dict[str, int]:     A dictionary from tag to the number of tasks with that tag.
+        """
+        return {tag: len(tagged) for tag, tagged in self._by_tag.items()};
+        
+    def get_by_tag(self, tag:str) -> list[Task]:
+        """Returns the tasks with the given tag, sorted by priority.
+
+        Args:
+            tag (str):          The tag to look for, e.g. `#work`.
+
+        Returns:
+            list[Task]:         The tasks with the tag.
+        """
+        return sorted(self._by_tag.get(tag, {}).values(), key=priority_of);
+        
+    def get_by_tags(self, tags:list[str], match:str = "all") -> list[Task]:
+        """Returns the tasks with all, or any, of the given tags, sorted by priority.
+
+        Args:
+            tags (list[str]):   The tags to look for.
+            match (str):        `all` to require every tag, `any` to require at least one of them.
+
+        Returns:
+            list[Task]:         The matching tasks.
+        """
+        tagged = [self._by_tag.get(tag, {}) for tag in tags];
+        if(len(tagged) == 0):
+            return [];
+        if(match == "all"):
+            tagged.sort(key=len);
+            found = {key: task for key, task in tagged[0].items() if all(key in other for other in tagged[1:])};
+        elif(match == "any"):
+            found = {};
+            for other in tagged:
+                found.update(other);
+        else:
+            raise ValueError(f"Invalid match: {match}");
+        return sorted(found.values(), key=priority_of);
+        
+    def due_between(self, start:datetime, end:datetime) -> list[Task]:
+        """Returns the tasks due in `[start, end)`, sorted by due date.
+
+        Args:
+            start (datetime):   The start of the window, inclusive.
+            end (datetime):     The end of the window, exclusive.
+
+        Returns:
+            list[Task]:         The tasks due in the window, completed or not.
+        """
+        lo = bisect_left(self._by_due, start, key=due_date_of);
+        hi = bisect_left(self._by_due, end, lo=lo, key=due_date_of);
+        return self._by_due[lo:hi];
+        
+    def overdue(self, now:datetime | None = None) -> list[Task]:
+        """Returns the uncompleted tasks due before `now`, sorted by due date.
+
+        Args:
+            now (datetime | None):  The current time, or None to use `datetime.now()`.
+
+        Returns:
+            list[Task]:         The overdue tasks.
+        """
+        if(now == None):
+            now = datetime.now();
+        hi = bisect_left(self._by_due, now, key=due_date_of);
+        return [task for task in self._by_due[:hi] if not task.completed];
+        
+    def next_due(self, k:int, now:datetime | None = None) -> list[Task]:
+        """Returns the first `k` uncompleted tasks due at or after `now`, sorted by due date.
+
+        Args:
+            k (int):                The number of tasks to return.
+            now (datetime | None):  The current time, or None to use `datetime.now()`.
+
+        Returns:
+            list[Task]:         Up to `k` upcoming tasks.
+        """
+        if(now == None):
+            now = datetime.now();
+        upcoming = [];
+        for i in range(bisect_left(self._by_due, now, key=due_date_of), len(self._by_due)):
+            if(len(upcoming) == k):
+                break;
+            if(not self._by_due[i].completed):
+                upcoming.append(self._by_due[i]);
+        return upcoming;
+        
+    def get_undated(self) -> list[Task]:
+        """Returns the tasks without a due date, sorted by priority.
+
+        Returns:
+            list[Task]:         The tasks whose `due_date` is None.
+        """
+        return sorted(self._undated.values(), key=priority_of);
+        
     def to_dict(self):
         return {
             "tasks": [task.to_dict() for task in self.tasks]
         };
         
     @staticmethod
-    def from_dict(data):
+    def from_tasks(tasks:Iterable[Task]):
+        """Creates a TaskManager from several tasks, sorting them a single time.
+
+        Args:
+            tasks (Iterable[Task]): The tasks to manage.
+
+        Returns:
+            TaskManager:        The new TaskManager.
+        """
         task_manager = TaskManager();
-        for task_data in data["tasks"]:
-            task_manager.add_task(Task.from_dict(task_data));
+        task_manager.add_tasks(tasks);
         return task_manager;
-    
+        
+    @staticmethod
+    def from_dict(data):
+        return TaskManager.from_tasks(
+            ObsidianTask.from_dict(task_data) if("tags" in task_data) else Task.from_dict(task_data)
+            for task_data in data["tasks"]
+        );
+        
     def __str__(self):
         return "\n".join([str(task) for task in self.tasks]);
-    
+        
     def __repr__(self):
         return self.__str__();
-    
+        
     def __len__(self):
         return len(self.tasks);
-    
+        
     def __getitem__(self, index):
         return self.tasks[index];
-    
+        
     def __iter__(self):
         return iter(self.tasks);
-    
+        
     def __contains__(self, task:Task):
-        return task in self.tasks;
-    
\ No newline at end of file
+        return self.__find(task) != None;
+        
\ No newline at end of file
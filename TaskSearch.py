@@ -0,0 +1,178 @@
+"""TaskSearch is an inverted full-text index over the names and descriptions of tasks.
+
+Text is split into words, case-folded and stripped of accents, so `Reunião` is found by `reuniao`. Every word of a
+query matches the indexed words it is a prefix of, and a task must match every word of the query. Results are ranked
+by how rare the matched words are, whether they were matched whole, and whether they appear in the name.
+
+The index is kept up to date by subscribing to the changes of a `TaskManager`.
+"""
+
+from primitives.Task import Task;
+from TaskManager import TaskEvent, TaskManager;
+from bisect import bisect_left, insort;
+from heapq import nlargest;
+from math import log;
+from typing import Iterable;
+import re;
+import unicodedata;
+
+WORD = re.compile(r"\w+");
+
+NAME_WEIGHT:float = 3.0;
+"""`NAME_WEIGHT` is how much more a word of the name counts than a word of the description."""
+
+PREFIX_WEIGHT:float = 0.5;
+"""`PREFIX_WEIGHT` is how much a word matched by a prefix counts, compared to a word matched whole."""
+
+def normalize(text:str) -> str:
+    """Case-folds a text and strips its accents, e.g. `Ação` becomes `acao`."""
+    decomposed = unicodedata.normalize("NFKD", text.casefold());
+    return "".join(char for char in decomposed if not unicodedata.combining(char));
+
+def tokenize(text:str) -> list[str]:
+    """Splits a text into normalized words."""
+    return WORD.findall(normalize(text));
+
+class TaskSearch:
+    """A `TaskSearch` indexes the words of the names and descriptions of tasks.
+
+    For each word it keeps the tasks containing it (its postings) with the weight of the word in each task, and it
+    keeps every word in a sorted list, so the words starting with a prefix are found with a binary search.
+    """
+    __slots__ = ['postings', 'words', 'terms'];
+
+    def __init__(self, tasks:Iterable[Task] = ()) -> None:
+        """Creates a new TaskSearch.
+
+        Args:
+            tasks (Iterable[Task]): The tasks to index.
+        """
+        self.postings = {};
+        self.words = [];
+        self.terms = {};
+        for task in tasks:
+            self.add(task);
+
+    @staticmethod
+    def from_task_manager(task_manager:TaskManager) -> "TaskSearch":
+        """Indexes the tasks of a TaskManager and follows its changes."""
+        search = TaskSearch(task_manager);
+        task_manager.subscribe(search.on_event);
+        return search;
+
+    def __len__(self) -> int:
+        return len(self.terms);
+
+    def add(self, task:Task) -> None:
+        """Indexes a task. A task already indexed is indexed again."""
+        if(id(task) in self.terms):
+            self.remove(task);
+        weights = {};
+        for word in tokenize(task.description):
+            weights[word] = weights.get(word, 0.0) + 1.0;
+        for word in tokenize(task.name):
+            weights[word] = weights.get(word, 0.0) + NAME_WEIGHT;
+        self.terms[id(task)] = (task, weights);
+        for word, weight in weights.items():
+            posting = self.postings.get(word);
+            if(posting == None):
+                posting = self.postings[word] = {};
+                insort(self.words, word);
+            posting[id(task)] = weight;
+
+    def remove(self, task:Task) -> None:
+        """Removes a task from the index, if it is indexed."""
+        entry = self.terms.pop(id(task), None);
+        if(entry == None):
+            return;
+        for word in entry[1]:
+            posting = self.postings[word];
+            del posting[id(task)];
+            if(len(posting) == 0):
+                del self.postings[word];
+                del self.words[bisect_left(self.words, word)];
+
+    def on_event(self, event:TaskEvent) -> None:
+        """Updates the index with a change of a TaskManager. Subscribed by `from_task_manager`."""
+        if(event.op == "add"):
+            self.add(event.task);
+        elif(event.op == "remove"):
+            self.remove(event.task);
+        elif(event.op == "edit" and ("name" in event.previous or "description" in event.previous)):
+            self.add(event.task);
+
+    def __expand(self, term:str) -> list[str]:
+        """Returns the indexed words starting with a query word."""
+        words = [];
+        for i in range(bisect_left(self.words, term), len(self.words)):
+            if(not self.words[i].startswith(term)):
+                break;
+            words.append(self.words[i]);
+        return words;
+
+    def __factor(self, term:str, word:str) -> float:
+        """Returns how much an indexed word matched by a query word counts: rare words and whole words count more."""
+        return log(1.0 + len(self.terms) / len(self.postings[word])) * (1.0 if(word == term) else PREFIX_WEIGHT);
+
+    def __matches(self, term:str, words:list[str]) -> dict[int, float]:
+        """Returns the score of every task containing one of the words a query word expands to."""
+        scores = {};
+        for word in words:
+            factor = self.__factor(term, word);
+            for key, weight in self.postings[word].items():
+                score = weight * factor;
+                if(score > scores.get(key, 0.0)):
+                    scores[key] = score;
+        return scores;
+
+    def __probe(self, term:str, words:list[str], scores:dict[int, float]) -> dict[int, float]:
+        """Adds the score of a query word to the candidates that contain one of its words, dropping the others."""
+        factors = [(self.postings[word], self.__factor(term, word)) for word in words];
+        matched = {};
+        for key, score in scores.items():
+            best = 0.0;
+            for posting, factor in factors:
+                weight = posting.get(key);
+                if(weight != None and weight * factor > best):
+                    best = weight * factor;
+            if(best > 0.0):
+                matched[key] = score + best;
+        return matched;
+
+    def search(self, query:str, limit:int | None = None, include_completed:bool = True) -> list[Task]:
+        """Finds the tasks matching every word of a query.
+
+        Args:
+            query (str):                The query, e.g. `reun proj`.
+            limit (int | None):         The maximum number of tasks to return, or None for all of them.
+            include_completed (bool):   If False, completed tasks are left out.
+
+        Returns:
+            list[Task]:             The matching tasks, the best first; ties are broken by priority and then name.
+        """
+        expansions = [];
+        for term in set(tokenize(query)):
+            words = self.__expand(term);
+            expansions.append((sum(len(self.postings[word]) for word in words), term, words));
+        if(len(expansions) == 0):
+            return [];
+        #   Start with the rarest query word, then only look at the tasks that matched every word so far
+        expansions.sort();
+        size, term, words = expansions[0];
+        scores = self.__matches(term, words);
+        for size, term, words in expansions[1:]:
+            if(len(scores) == 0):
+                break;
+            if(len(scores) * len(words) < size):
+                scores = self.__probe(term, words, scores);
+            else:
+                matches = self.__matches(term, words);
+                scores = {key: score + matches[key] for key, score in scores.items() if key in matches};
+        if(not include_completed):
+            scores = {key: score for key, score in scores.items() if not self.terms[key][0].completed};
+        if(limit != None and len(scores) > limit):
+            #   Only the tasks scoring at least as much as the `limit`-th best can be returned
+            threshold = nlargest(limit, scores.values())[-1];
+            scores = {key: score for key, score in scores.items() if score >= threshold};
+        tasks = sorted(((score, self.terms[key][0]) for key, score in scores.items()), key=lambda entry: (-entry[0], entry[1].priority, entry[1].name));
+        return [task for score, task in tasks[:limit]];
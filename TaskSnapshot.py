@@ -0,0 +1,245 @@
+"""TaskSnapshot is a compact, versioned binary snapshot of a task set, read through a memory map.
+
+Layout, little-endian:
+
+    header      magic, version, record count, string count, tag count, the version and journal sequence number of the
+                task file the snapshot was written from, and the offset of every section
+    records     one fixed-size record per task: name and description string ids, priority, flags, due date in
+                microseconds, its time zone, and the range of the task's tags in the tag section
+    tags        the string id of every tag of every task, task after task
+    index       the record numbers sorted by name, for binary search
+    strings     the offset of every string, then the UTF-8 bytes of every distinct string
+
+Opening a snapshot only reads its header, so `len()` and `get(name)` cost the same for any size of task set; records
+are decoded only when they are accessed.
+
+Due dates are kept to the microsecond with their time zone: naive due dates are counted on the wall clock, aware ones
+from 1970-01-01 UTC, with their fixed UTC offset or the key of their `ZoneInfo`. Any other time zone, and priorities
+outside the signed 32-bit range, are rejected when writing instead of being stored wrong.
+"""
+
+from primitives.Task import Task, ObsidianTask;
+from TaskColumns import UNDATED;
+from TaskJournal import write_atomic;
+from TaskManager import TaskManager;
+from bisect import bisect_left;
+from datetime import datetime, timedelta, timezone;
+from typing import Iterable, Iterator;
+from zoneinfo import ZoneInfo;
+import mmap;
+import struct;
+
+MAGIC:bytes = b"TSNP";
+
+VERSION:int = 2;
+"""`VERSION` is the version of the snapshot layout. Readers reject snapshots of any other version."""
+
+HEADER = struct.Struct("<4sHHIIIqq5Q");
+"""`HEADER` packs the magic, version, flags, record, string and tag counts, the stamp, and the offsets of the sections."""
+
+RECORD = struct.Struct("<IIiBxxxqqII");
+"""`RECORD` packs a task: name id, description id, priority, flags, due date, time zone, first tag and tag count."""
+
+COMPLETED:int = 1;
+OBSIDIAN:int = 2;
+OFFSET:int = 4;
+"""`OFFSET` flags a due date with a fixed UTC offset, stored in microseconds as its time zone."""
+ZONE:int = 8;
+"""`ZONE` flags a due date in a `ZoneInfo`, whose key is stored as a string id as its time zone."""
+
+U32 = struct.Struct("<I");
+U64 = struct.Struct("<Q");
+
+EPOCH:datetime = datetime(1970, 1, 1);
+UTC_EPOCH:datetime = datetime(1970, 1, 1, tzinfo=timezone.utc);
+
+PRIORITY_RANGE:range = range(-(1 << 31), 1 << 31);
+
+class TaskSnapshotError(Exception):
+    """`TaskSnapshotError` is raised when a file is not a task snapshot of a supported version."""
+    pass;
+
+def microseconds(delta:timedelta) -> int:
+    return (delta.days * 86400 + delta.seconds) * 1000000 + delta.microseconds;
+
+def write_snapshot(path:str, tasks:Iterable[Task], stamp:tuple[int, int] = (0, 0)) -> int:
+    """Atomically writes a snapshot of tasks, keeping their order.
+
+    Args:
+        path (str):             The path of the snapshot.
+        tasks (Iterable[Task]): The tasks, e.g. a `TaskManager`.
+        stamp (tuple[int, int]):    The version and journal sequence number of the task file the tasks were read from.
+
+    Returns:
+        int:                    The number of tasks written.
+
+    Raises:
+        ValueError:             If a priority is outside the signed 32-bit range, or a due date has a time zone that is neither a fixed offset nor a `ZoneInfo`.
+    """
+    strings = {};
+    def string_id(string:str) -> int:
+        if(string not in strings):
+            strings[string] = len(strings);
+        return strings[string];
+
+    def due_fields(due_date:datetime | None) -> tuple[int, int, int]:
+        """Returns the flags, the due date and the time zone stored for a due date."""
+        if(due_date == None):
+            return (0, UNDATED, 0);
+        if(due_date.tzinfo == None):
+            return (0, microseconds(due_date - EPOCH), 0);
+        due = microseconds(due_date - UTC_EPOCH);
+        if(isinstance(due_date.tzinfo, ZoneInfo) and due_date.tzinfo.key != None):
+            return (ZONE, due, string_id(due_date.tzinfo.key));
+        if(isinstance(due_date.tzinfo, timezone)):
+            return (OFFSET, due, microseconds(due_date.utcoffset()));
+        raise ValueError(f"Cannot store the time zone of due date {due_date} in a task snapshot");
+
+    records = bytearray();
+    tags = bytearray();
+    names = [];
+    tag_count = 0;
+    for task in tasks:
+        task_tags = getattr(task, "tags", None);
+        if(task.priority not in PRIORITY_RANGE):
+            raise ValueError(f"Cannot store priority {task.priority} of task {task.name} in a task snapshot");
+        due_flags, due, zone = due_fields(task.due_date);
+        flags = (COMPLETED if(task.completed) else 0) | (OBSIDIAN if(task_tags != None) else 0) | due_flags;
+        names.append(task.name.encode("utf-8"));
+        records += RECORD.pack(string_id(task.name), string_id(task.description), task.priority, flags, due, zone, tag_count, len(task_tags or ()));
+        for tag in task_tags or ():
+            tags += U32.pack(string_id(tag));
+            tag_count += 1;
+    #   Equal names keep their record order, so the first match is the one `TaskManager.get_task` returns
+    index = bytearray();
+    for row in sorted(range(len(names)), key=names.__getitem__):
+        index += U32.pack(row);
+    encoded = [string.encode("utf-8") for string in strings];
+    offsets = bytearray();
+    offset = 0;
+    for string in encoded:
+        offsets += U64.pack(offset);
+        offset += len(string);
+    offsets += U64.pack(offset);
+
+    records_offset = HEADER.size;
+    tags_offset = records_offset + len(records);
+    index_offset = tags_offset + len(tags);
+    string_offsets_offset = index_offset + len(index);
+    strings_offset = string_offsets_offset + len(offsets);
+    header = HEADER.pack(MAGIC, VERSION, 0, len(names), len(encoded), tag_count, *stamp, records_offset, tags_offset, index_offset, string_offsets_offset, strings_offset);
+    write_atomic(path, b"".join([header, records, tags, index, offsets] + encoded));
+    return len(names);
+
+class TaskSnapshot:
+    """A `TaskSnapshot` reads a snapshot written by `write_snapshot` through a memory map, decoding records on demand.
+
+    It is a read-only sequence of tasks in the order they were written. `get` finds a task by name with a binary
+    search over the name index. `stamp` is the stamp it was written with. Used as a context manager, the snapshot is
+    closed on exit.
+    """
+    __slots__ = ['file', 'map', 'count', 'string_count', 'tag_count', 'stamp', 'records_offset', 'tags_offset', 'index_offset', 'string_offsets_offset', 'strings_offset'];
+
+    def __init__(self, path:str) -> None:
+        """Opens a snapshot.
+
+        Args:
+            path (str):         The path of the snapshot.
+
+        Raises:
+            TaskSnapshotError:  If the file is not a snapshot of a supported version.
+        """
+        self.file = open(path, "rb");
+        try:
+            self.map = mmap.mmap(self.file.fileno(), 0, access=mmap.ACCESS_READ);
+        except ValueError:
+            self.file.close();
+            raise TaskSnapshotError(f"Empty task snapshot: {path}");
+        if(len(self.map) < HEADER.size):
+            self.close();
+            raise TaskSnapshotError(f"Truncated task snapshot: {path}");
+        magic, version, flags, self.count, self.string_count, self.tag_count, file_version, seq, self.records_offset, self.tags_offset, self.index_offset, self.string_offsets_offset, self.strings_offset = HEADER.unpack_from(self.map, 0);
+        if(magic != MAGIC or version != VERSION):
+            self.close();
+            raise TaskSnapshotError(f"Not a version {VERSION} task snapshot: {path}");
+        self.stamp = (file_version, seq);
+
+    def close(self) -> None:
+        self.map.close();
+        self.file.close();
+
+    def __enter__(self) -> "TaskSnapshot":
+        return self;
+
+    def __exit__(self, exc_type, exc_value, traceback) -> None:
+        self.close();
+
+    def __len__(self) -> int:
+        return self.count;
+
+    def __string_bytes(self, string_id:int) -> bytes:
+        start, end = struct.unpack_from("<QQ", self.map, self.string_offsets_offset + string_id * U64.size);
+        return self.map[self.strings_offset + start:self.strings_offset + end];
+
+    def __string(self, string_id:int) -> str:
+        return self.__string_bytes(string_id).decode("utf-8");
+
+    def __name_bytes(self, row:int) -> bytes:
+        """Returns the encoded name of a record, without decoding the rest of it."""
+        return self.__string_bytes(U32.unpack_from(self.map, self.records_offset + row * RECORD.size)[0]);
+
+    def __getitem__(self, row:int) -> Task:
+        """Decodes the task of a record.
+
+        Args:
+            row (int):          The number of the record, negative numbers counting from the end.
+
+        Returns:
+            Task:               The task, an `ObsidianTask` if it was written from one.
+        """
+        if(row < 0):
+            row += self.count;
+        if(row < 0 or row >= self.count):
+            raise IndexError("Task snapshot index out of range");
+        name, description, priority, flags, due, zone, first_tag, tag_count = RECORD.unpack_from(self.map, self.records_offset + row * RECORD.size);
+        if(due == UNDATED):
+            due_date = None;
+        elif(flags & ZONE):
+            due_date = (UTC_EPOCH + timedelta(microseconds=due)).astimezone(ZoneInfo(self.__string(zone)));
+        elif(flags & OFFSET):
+            due_date = (UTC_EPOCH + timedelta(microseconds=due)).astimezone(timezone(timedelta(microseconds=zone)));
+        else:
+            due_date = EPOCH + timedelta(microseconds=due);
+        if(flags & OBSIDIAN):
+            tags = [self.__string(U32.unpack_from(self.map, self.tags_offset + (first_tag + i) * U32.size)[0]) for i in range(tag_count)];
+            return ObsidianTask(self.__string(name), self.__string(description), priority, due_date, bool(flags & COMPLETED), tags);
+        return Task(self.__string(name), self.__string(description), priority, due_date, bool(flags & COMPLETED));
+
+    def __iter__(self) -> Iterator[Task]:
+        for row in range(self.count):
+            yield self[row];
+
+    def __index_row(self, position:int) -> int:
+        return U32.unpack_from(self.map, self.index_offset + position * U32.size)[0];
+
+    def get(self, name:str) -> Task | None:
+        """Finds a task by name, decoding only the names visited by a binary search.
+
+        Args:
+            name (str):         The name of the task.
+
+        Returns:
+            Task | None:        The first task written with that name, as `TaskManager.get_task` returns it, or None.
+        """
+        target = name.encode("utf-8");
+        position = bisect_left(range(self.count), target, key=lambda position: self.__name_bytes(self.__index_row(position)));
+        if(position == self.count or self.__name_bytes(self.__index_row(position)) != target):
+            return None;
+        return self[self.__index_row(position)];
+
+    def __contains__(self, name:str) -> bool:
+        return self.get(name) != None;
+
+    def to_task_manager(self) -> TaskManager:
+        """Decodes every record into a `TaskManager`."""
+        return TaskManager.from_tasks(self);
@@ -0,0 +1,608 @@
+"""TaskStorage is the storage backend interface of `Taskr`, with a JSON file implementation and a SQLite implementation.
+
+Every backend loads a `TaskManager` and persists lists of mutation records, as understood by `TaskJournal.apply_record`.
+"""
+
+from primitives.Task import ObsidianTask;
+from TaskManager import TaskManager;
+from TaskJournal import TaskJournal, apply_record, write_atomic;
+from TaskSnapshot import TaskSnapshot, TaskSnapshotError, write_snapshot;
+from TaskStream import decode_task, iter_task_dicts, task_from_dict;
+from contextlib import contextmanager;
+from datetime import datetime, timedelta, timezone;
+from typing import Iterator;
+import itertools;
+import json;
+import logging;
+import os;
+import re;
+import sqlite3;
+
+try:
+    import fcntl;
+except ImportError:
+    fcntl = None;
+    import msvcrt;
+
+UTC_EPOCH:datetime = datetime(1970, 1, 1, tzinfo=timezone.utc);
+
+def due_epoch(due_date:datetime | None) -> int | None:
+    """Converts a due date to microseconds since 1970-01-01 UTC, so due dates with different UTC offsets compare in time order.
+
+    Args:
+        due_date (datetime | None): The due date. Naive datetimes are taken as UTC.
+
+    Returns:
+        int | None:         The epoch of the due date, or None if there is none.
+    """
+    if(due_date == None):
+        return None;
+    if(due_date.tzinfo == None):
+        due_date = due_date.replace(tzinfo=timezone.utc);
+    return (due_date - UTC_EPOCH) // timedelta(microseconds=1);
+
+class TaskStorageConflict(Exception):
+    """`TaskStorageConflict` is raised when a storage was modified by another writer since it was loaded."""
+    pass;
+
+class FileLock:
+    """A `FileLock` is an advisory lock on a lock file, shared between every process using the same path.
+
+    The lock is reentrant within a process: nested acquisitions only count, and the lock is released by the outermost
+    release. A nested acquisition never changes the mode of the outermost one.
+    """
+    def __init__(self, path:str) -> None:
+        """Creates a new FileLock.
+
+        Args:
+            path (str):         The path of the lock file. It is created on first use.
+        """
+        self.path = path;
+        self.file = None;
+        self.depth = 0;
+
+    def acquire(self, shared:bool = False) -> None:
+        """Blocks until the lock is acquired.
+
+        Args:
+            shared (bool):      If True, other readers may hold the lock at the same time (where the platform supports it).
+        """
+        if(self.depth == 0):
+            self.file = open(self.path, "a+");
+            if(fcntl != None):
+                fcntl.flock(self.file.fileno(), fcntl.LOCK_SH if(shared) else fcntl.LOCK_EX);
+            else:
+                self.file.seek(0);
+                msvcrt.locking(self.file.fileno(), msvcrt.LK_LOCK, 1);
+        self.depth += 1;
+
+    def release(self) -> None:
+        """Releases the lock."""
+        self.depth -= 1;
+        if(self.depth == 0):
+            if(fcntl != None):
+                fcntl.flock(self.file.fileno(), fcntl.LOCK_UN);
+            else:
+                self.file.seek(0);
+                msvcrt.locking(self.file.fileno(), msvcrt.LK_UNLCK, 1);
+            self.file.close();
+            self.file = None;
+
+    @contextmanager
+    def __call__(self, shared:bool = False) -> Iterator["FileLock"]:
+        """Holds the lock for the duration of a `with` block.
+
+        Args:
+            shared (bool):      If True, other readers may hold the lock at the same time (where the platform supports it).
+        """
+        self.acquire(shared);
+        try:
+            yield self;
+        finally:
+            self.release();
+
+class TaskStorage:
+    """The `TaskStorage` interface provides the methods `Taskr` uses to read and persist tasks.
+
+    `load` and `commit` must be implemented by every backend. The query methods have default implementations
+    over `load`, which backends with an index of their own should override.
+    """
+    def exists(self) -> bool:
+        """Checks if the storage has been created.
+
+        Returns:
+            bool:               True if the storage exists, False otherwise.
+        """
+        raise NotImplementedError;
+
+    def create(self) -> None:
+        """Creates an empty storage."""
+        raise NotImplementedError;
+
+    def prepare(self) -> None:
+        """Creates the storage if it does not exist yet."""
+        if(not self.exists()):
+            self.create();
+
+    def load(self) -> tuple[TaskManager, object]:
+        """Loads every task of the storage.
+
+        Returns:
+            tuple[TaskManager, object]: The loaded TaskManager, and an opaque version to hand back to `commit`.
+        """
+        raise NotImplementedError;
+
+    def commit(self, records:list[dict], task_manager:TaskManager | None = None, version:object = None) -> object | None:
+        """Persists mutation records.
+
+        Records are applied all or nothing: if one of them targets a missing task, none is persisted. On success, the
+        version returned is the one to hand back to the next `commit` of the same `task_manager`, so it is not loaded
+        again; if another writer saved meanwhile, that is still the old version, and the next `commit` rebases again.
+
+        Args:
+            records (list[dict]):           The mutation records, as understood by `TaskJournal.apply_record`.
+            task_manager (TaskManager):     A TaskManager returned by `load` with the records already applied, or None.
+            version (object):               The version returned by `load` alongside `task_manager`.
+
+        Returns:
+            object | None:      The version of `task_manager` after the commit, or None if some record targets a missing task.
+        """
+        raise NotImplementedError;
+
+    def compact(self) -> None:
+        """Reorganizes the storage to make it faster to load. Does nothing by default."""
+        pass;
+
+    def iter_tasks(self) -> Iterator[ObsidianTask]:
+        """Lazily iterates over the tasks of the storage, for read-only queries.
+
+        The default implementation loads every task; backends that can read their tasks incrementally override it.
+
+        Yields:
+            ObsidianTask:       The next task.
+        """
+        yield from self.load()[0];
+
+    def get_task(self, name:str) -> ObsidianTask | None:
+        """Gets a task by name.
+
+        Args:
+            name (str):         The name of the task.
+
+        Returns:
+            ObsidianTask | None:    The task, or None if there is no task with that name.
+        """
+        return self.load()[0].get_task(name);
+
+    def get_by_tag(self, tag:str) -> list[ObsidianTask]:
+        """Gets the tasks with the given tag, sorted by priority.
+
+        Args:
+            tag (str):          The tag to look for.
+
+        Returns:
+            list[ObsidianTask]: The tasks with the tag.
+        """
+        return self.load()[0].get_by_tag(tag);
+
+    def due_between(self, start:datetime, end:datetime) -> list[ObsidianTask]:
+        """Gets the tasks due in `[start, end)`, sorted by due date.
+
+        Args:
+            start (datetime):   The start of the window, inclusive.
+            end (datetime):     The end of the window, exclusive.
+
+        Returns:
+            list[ObsidianTask]: The tasks due in the window.
+        """
+        return self.load()[0].due_between(start, end);
+
+class JSONTaskStorage(TaskStorage):
+    """A `JSONTaskStorage` stores every task in a single JSON task file, optionally with a `TaskJournal` of pending mutations.
+
+    In journal mode, `commit` checks the records against the current tasks, appends them to the journal and folds it
+    into the task file once it reaches `compaction_threshold` records. Otherwise the whole task file is rewritten on every `commit`.
+
+    The task file is replaced atomically, and every read and write holds an advisory `FileLock`, so several processes
+    can share the same storage. The task file carries a `version`, bumped on every save: a `commit` of a TaskManager
+    loaded before another process saved is rebased, i.e. its records are applied to the current tasks instead.
+
+    Every save also writes a `TaskSnapshot` of the task file, stamped with its version, which `snapshot` returns while
+    no other save or journal record has made it stale, so read-only queries can skip parsing the task file.
+    """
+    HEADER:re.Pattern = re.compile(r'^\{"version": (\d+), "seq": (\d+)');
+
+    def __init__(self, directory:str, taskfile:str = "tasks.json", journalfile:str = "tasks.journal", journal:bool = False, compaction_threshold:int = 1000, lockfile:str = "tasks.lock", snapshotfile:str | None = "tasks.snapshot") -> None:
+        """Creates a new JSONTaskStorage.
+
+        Args:
+            directory (str):                The directory of the task file and journal.
+            taskfile (str):                 The name of the task file.
+            journalfile (str):              The name of the journal file.
+            journal (bool):                 If True, mutations are appended to the journal instead of rewriting the task file.
+            compaction_threshold (int):     The number of journal records after which the journal is folded into the task file.
+            lockfile (str):                 The name of the lock file.
+            snapshotfile (str | None):      The name of the snapshot file, or None to write no snapshot.
+        """
+        self.directory = directory;
+        self.path = os.path.join(directory, taskfile);
+        self.journal_mode = journal;
+        self.compaction_threshold = compaction_threshold;
+        self.journal = TaskJournal(os.path.join(directory, journalfile));
+        self.lock = FileLock(os.path.join(directory, lockfile));
+        self.snapshot_path = None if(snapshotfile == None) else os.path.join(directory, snapshotfile);
+
+    def exists(self) -> bool:
+        return os.path.exists(self.directory) and os.path.exists(self.path);
+
+    def create(self) -> None:
+        if(not os.path.exists(self.directory)):
+            os.makedirs(self.directory, exist_ok=True);
+        with self.lock():
+            if(not os.path.exists(self.path)):
+                self.__write(TaskManager(), 0, 0);
+
+    def __version(self) -> tuple[int, int]:
+        """Reads the version of the task file from its header, and the last sequence number of the journal.
+
+        Returns:
+            tuple[int, int]:    The version of the task file and the last journal sequence number.
+        """
+        with open(self.path, "r") as f:
+            match = JSONTaskStorage.HEADER.match(f.read(64));
+        if(match == None):
+            #   Task files written before versioning have no header
+            return (0, self.journal.last_seq);
+        return (int(match.group(1)), self.journal.last_seq);
+
+    def load(self) -> tuple[TaskManager, tuple[int, int]]:
+        """Loads the task file and replays the journal over it.
+
+        Returns:
+            tuple[TaskManager, tuple[int, int]]:    The loaded TaskManager, and its version: the version of the task file and the sequence number of the last journal record it contains.
+        """
+        with self.lock(shared=True):
+            header = {};
+            with open(self.path, "r") as f:
+                task_manager = TaskManager.from_tasks(task_from_dict(data) for data in iter_task_dicts(f, header));
+            return (task_manager, (header.get("version", 0), self.journal.replay(task_manager, header.get("seq", 0))));
+
+    def iter_tasks(self) -> Iterator[ObsidianTask]:
+        """Lazily iterates over the tasks of the task file, then over the tasks added by the journal.
+
+        Only the journal is read up front; the task file is parsed one task at a time. Tasks are yielded in file order,
+        which is by priority except for the tasks added by the journal, and are assumed to have unique names.
+
+        Yields:
+            ObsidianTask:       The next task.
+        """
+        with self.lock(shared=True):
+            #   The open file keeps this version of the task file readable even if a writer replaces it meanwhile
+            f = open(self.path, "r");
+            header = {};
+            tasks = iter_task_dicts(f, header);
+            first = next(tasks, None);
+            records = [record for record in self.journal.records() if(record["op"] != "base" and record["seq"] > header.get("seq", 0))];
+        with f:
+            #   Journal records are applied to the tasks they added, or else remembered as overrides of the task file
+            added = TaskManager();
+            removed = set();
+            removed_tasks = [];
+            completed = {};
+            for record in records:
+                if(record["op"] == "add" or added.get_task(record["name"]) != None):
+                    apply_record(added, record);
+                elif(record["op"] == "remove" and "task" in record):
+                    removed_tasks.append(decode_task(record["task"]));
+                elif(record["op"] == "remove"):
+                    removed.add(record["name"]);
+                else:
+                    completed[record["name"]] = (record["op"] == "complete");
+            #   An empty task file still yields the tasks added by the journal
+            for data in ([] if(first == None) else itertools.chain([first], tasks)):
+                if(data["name"] in removed):
+                    continue;
+                task = task_from_dict(data);
+                if(task.name in completed):
+                    task.completed = completed[task.name];
+                if(task in removed_tasks):
+                    removed_tasks.remove(task);
+                    continue;
+                yield task;
+        yield from added;
+
+    def __write(self, task_manager:TaskManager, version:int, seq:int) -> None:
+        """Atomically writes the task file, then its snapshot."""
+        data = {"version": version, "seq": seq};
+        data.update(task_manager.to_dict());
+        write_atomic(self.path, json.dumps(data));
+        if(self.snapshot_path == None):
+            return;
+        #   The snapshot holds the tasks as they are read back from the task file, not as they are in memory
+        try:
+            write_snapshot(self.snapshot_path, (task_from_dict(task) for task in data["tasks"]), (version, seq));
+        except ValueError as e:
+            #   A stale snapshot would be ignored anyway, as its stamp no longer matches the task file
+            logging.warning(f"Not writing Taskr snapshot: {e}");
+            if(os.path.exists(self.snapshot_path)):
+                os.unlink(self.snapshot_path);
+
+    def snapshot(self) -> TaskSnapshot | None:
+        """Opens the snapshot of the task file, if it holds every task of the storage.
+
+        Checking it only reads the header of the task file and the ends of the journal, so it costs the same for any
+        number of tasks. The caller must close the snapshot.
+
+        Returns:
+            TaskSnapshot | None:    The snapshot, or None if there is none, or if the task file was saved or the journal appended to since it was written.
+        """
+        if(self.snapshot_path == None or not self.exists()):
+            return None;
+        with self.lock(shared=True):
+            try:
+                snapshot = TaskSnapshot(self.snapshot_path);
+            except (OSError, TaskSnapshotError):
+                return None;
+            if(snapshot.stamp != self.__version()):
+                snapshot.close();
+                return None;
+            return snapshot;
+
+    def get_task(self, name:str) -> ObsidianTask | None:
+        """Gets a task by name, from the snapshot if it is current, without loading the task file.
+
+        Args:
+            name (str):         The name of the task.
+
+        Returns:
+            ObsidianTask | None:    The task, or None if there is no task with that name.
+        """
+        snapshot = self.snapshot();
+        if(snapshot == None):
+            return super().get_task(name);
+        with snapshot:
+            return snapshot.get(name);
+
+    def __save(self, task_manager:TaskManager, version:tuple[int, int]) -> None:
+        """Saves the task file, folding the journal records contained in `task_manager` into it. The lock must be held.
+
+        Args:
+            task_manager (TaskManager): The TaskManager object to save.
+            version (tuple[int, int]):  The version returned by `load` alongside `task_manager`.
+        """
+        file_version, seq = version;
+        self.__write(task_manager, self.__version()[0] + 1, seq);
+        #   Records newer than `seq` are not in the task file yet, so they must stay in the journal
+        if(len(self.journal) > 0 and self.journal.last_seq == seq):
+            self.journal.reset(seq);
+
+    def commit(self, records:list[dict], task_manager:TaskManager | None = None, version:tuple[int, int] | None = None) -> tuple[int, int] | None:
+        with self.lock():
+            current = task_manager != None and version == self.__version();
+            given = version;
+            if(not current):
+                #   Another writer saved since `task_manager` was loaded, or there is none: rebase the records on the current tasks
+                if(self.journal_mode and all(record["op"] == "add" for record in records)):
+                    #   Additions apply to any tasks, so the journal does not need to be replayed to check them
+                    task_manager, version = (TaskManager(), None);
+                else:
+                    task_manager, version = self.load();
+                #   Nothing is written unless every record applies, in both modes
+                if(not all(apply_record(task_manager, record) for record in records)):
+                    return None;
+            if(self.journal_mode):
+                self.journal.extend(records);
+                if(len(self.journal) >= self.compaction_threshold):
+                    self.compact();
+            else:
+                self.__save(task_manager, version);
+            #   A rebased commit saved tasks the caller's TaskManager does not hold, so it keeps its old version
+            return self.__version() if(current or given == None) else given;
+
+    def save(self, task_manager:TaskManager, version:tuple[int, int]) -> None:
+        """Saves a whole TaskManager, replacing every task of the storage.
+
+        Args:
+            task_manager (TaskManager): The TaskManager object to save.
+            version (tuple[int, int]):  The version returned by `load` alongside `task_manager`.
+
+        Raises:
+            TaskStorageConflict:    If another writer saved since `task_manager` was loaded.
+        """
+        with self.lock():
+            if(version != self.__version()):
+                raise TaskStorageConflict(f"{self.path} was modified since it was loaded");
+            self.__save(task_manager, version);
+
+    def compact(self) -> None:
+        """Folds the journal into the task file."""
+        with self.lock():
+            self.__save(*self.load());
+
+class SQLiteTaskStorage(TaskStorage):
+    """A `SQLiteTaskStorage` stores tasks as rows of a SQLite database, indexed on name, priority, due date and completion,
+    with the tags of each task in a join table.
+
+    Due dates are kept as ISO-8601 text, which round-trips their UTC offset, and as `due_epoch`, microseconds since
+    1970-01-01 UTC, which orders and filters them.
+
+    Mutations and queries touch only the rows involved, instead of the whole task set.
+    """
+    SCHEMA:str = """
+        CREATE TABLE IF NOT EXISTS tasks (
+            id          INTEGER PRIMARY KEY AUTOINCREMENT,
+            name        TEXT NOT NULL,
+            description TEXT NOT NULL,
+            priority    INTEGER NOT NULL,
+            due_date    TEXT,
+            completed   INTEGER NOT NULL,
+            due_epoch   INTEGER
+        );
+        CREATE INDEX IF NOT EXISTS tasks_name ON tasks(name, priority, id);
+        CREATE INDEX IF NOT EXISTS tasks_priority ON tasks(priority, id);
+        CREATE INDEX IF NOT EXISTS tasks_completed ON tasks(completed);
+        CREATE TABLE IF NOT EXISTS task_tags (
+            task_id     INTEGER NOT NULL REFERENCES tasks(id) ON DELETE CASCADE,
+            tag         TEXT NOT NULL,
+            PRIMARY KEY (tag, task_id)
+        );
+        CREATE INDEX IF NOT EXISTS task_tags_task ON task_tags(task_id);
+    """;
+    INDEXES:str = """
+        DROP INDEX IF EXISTS tasks_due_date;
+        CREATE INDEX IF NOT EXISTS tasks_due_epoch ON tasks(due_epoch);
+    """;
+    COLUMNS:str = "id, name, description, priority, due_date, completed";
+
+    def __init__(self, path:str) -> None:
+        """Creates a new SQLiteTaskStorage.
+
+        Args:
+            path (str):         The path of the SQLite database file.
+        """
+        self.path = path;
+        self.connection = None;
+
+    def __connect(self) -> sqlite3.Connection:
+        """Returns the connection to the database, opening it on first use."""
+        if(self.connection == None):
+            self.connection = sqlite3.connect(self.path);
+            self.connection.execute("PRAGMA foreign_keys = ON");
+        return self.connection;
+
+    def close(self) -> None:
+        """Closes the connection to the database."""
+        if(self.connection != None):
+            self.connection.close();
+            self.connection = None;
+
+    def exists(self) -> bool:
+        return os.path.exists(self.path);
+
+    def create(self) -> None:
+        directory = os.path.dirname(self.path);
+        if(directory != "" and not os.path.exists(directory)):
+            os.mkdir(directory);
+        connection = self.__connect();
+        connection.executescript(SQLiteTaskStorage.SCHEMA);
+        self.__migrate();
+        connection.executescript(SQLiteTaskStorage.INDEXES);
+
+    def __migrate(self) -> None:
+        """Adds `due_epoch` to a database created before it existed, computing it from `due_date`."""
+        connection = self.__connect();
+        if(any(column[1] == "due_epoch" for column in connection.execute("PRAGMA table_info(tasks)"))):
+            return;
+        with connection:
+            connection.execute("ALTER TABLE tasks ADD COLUMN due_epoch INTEGER");
+            rows = connection.execute("SELECT id, due_date FROM tasks WHERE due_date IS NOT NULL").fetchall();
+            connection.executemany("UPDATE tasks SET due_epoch = ? WHERE id = ?", [(due_epoch(datetime.fromisoformat(due_date)), task_id) for task_id, due_date in rows]);
+
+    def prepare(self) -> None:
+        #   The schema statements are idempotent, and also upgrade a database created by an older version
+        self.create();
+
+    def __tasks(self, rows:list[tuple]) -> list[ObsidianTask]:
+        """Builds tasks from `tasks` rows, fetching their tags."""
+        if(len(rows) == 0):
+            return [];
+        tags = {};
+        connection = self.__connect();
+        if(len(rows) > 500):
+            query = connection.execute("SELECT task_id, tag FROM task_tags ORDER BY rowid");
+        else:
+            ids = [row[0] for row in rows];
+            query = connection.execute(f"SELECT task_id, tag FROM task_tags WHERE task_id IN ({','.join('?' * len(ids))}) ORDER BY rowid", ids);
+        for task_id, tag in query:
+            tags.setdefault(task_id, []).append(tag);
+        return [
+            ObsidianTask(name, description, priority, None if(due_date == None) else datetime.fromisoformat(due_date), bool(completed), tags.get(task_id, []))
+            for task_id, name, description, priority, due_date, completed in rows
+        ];
+
+    def load(self) -> tuple[TaskManager, int]:
+        rows = self.__connect().execute(f"SELECT {SQLiteTaskStorage.COLUMNS} FROM tasks ORDER BY priority, id").fetchall();
+        return (TaskManager.from_tasks(self.__tasks(rows)), 0);
+
+    def iter_tasks(self) -> Iterator[ObsidianTask]:
+        """Lazily iterates over the tasks of the database, sorted by priority, fetching a batch of rows at a time.
+
+        Yields:
+            ObsidianTask:       The next task.
+        """
+        cursor = self.__connect().execute(f"SELECT {SQLiteTaskStorage.COLUMNS} FROM tasks ORDER BY priority, id");
+        while True:
+            rows = cursor.fetchmany(500);
+            if(len(rows) == 0):
+                return;
+            yield from self.__tasks(rows);
+
+    def __find(self, name:str) -> int | None:
+        """Returns the id of the task `TaskManager.get_task` would return for the given name."""
+        row = self.__connect().execute("SELECT id FROM tasks WHERE name = ? ORDER BY priority, id LIMIT 1", (name,)).fetchone();
+        return None if(row == None) else row[0];
+
+    def __find_task(self, data:dict) -> int | None:
+        """Returns the id of the task equal to the task of a `remove` record, among the tasks of its name."""
+        target = decode_task(data);
+        rows = self.__connect().execute(f"SELECT {SQLiteTaskStorage.COLUMNS} FROM tasks WHERE name = ? ORDER BY priority, id", (target.name,)).fetchall();
+        for row, task in zip(rows, self.__tasks(rows)):
+            if(task == target):
+                return row[0];
+        return None;
+
+    def __apply(self, record:dict) -> bool:
+        """Applies a mutation record to the database, inside the current transaction."""
+        connection = self.__connect();
+        op = record["op"];
+        if(op == "add"):
+            task = ObsidianTask.from_dict(record["task"]);
+            cursor = connection.execute(
+                "INSERT INTO tasks (name, description, priority, due_date, completed, due_epoch) VALUES (?, ?, ?, ?, ?, ?)",
+                (task.name, task.description, task.priority, None if(task.due_date == None) else task.due_date.isoformat(), int(task.completed), due_epoch(task.due_date))
+            );
+            connection.executemany("INSERT OR IGNORE INTO task_tags (task_id, tag) VALUES (?, ?)", [(cursor.lastrowid, tag) for tag in task.tags]);
+            return True;
+        task_id = self.__find(record["name"]) if(op != "remove" or "task" not in record) else self.__find_task(record["task"]);
+        if(task_id == None):
+            return False;
+        if(op == "remove"):
+            connection.execute("DELETE FROM tasks WHERE id = ?", (task_id,));
+        elif(op == "complete"):
+            connection.execute("UPDATE tasks SET completed = 1 WHERE id = ?", (task_id,));
+        elif(op == "uncomplete"):
+            connection.execute("UPDATE tasks SET completed = 0 WHERE id = ?", (task_id,));
+        else:
+            raise ValueError(f"Invalid journal operation: {op}");
+        return True;
+
+    def commit(self, records:list[dict], task_manager:TaskManager | None = None, version:object = None) -> int | None:
+        #   The rows are the source of truth, so `task_manager` is not needed: every record is applied in one transaction,
+        #   which is rolled back as a whole if one of them targets a missing task
+        with self.__connect() as connection:
+            for record in records:
+                if(not self.__apply(record)):
+                    connection.rollback();
+                    return None;
+        return 0;
+
+    def compact(self) -> None:
+        self.__connect().execute("VACUUM");
+
+    def get_task(self, name:str) -> ObsidianTask | None:
+        row = self.__connect().execute(f"SELECT {SQLiteTaskStorage.COLUMNS} FROM tasks WHERE name = ? ORDER BY priority, id LIMIT 1", (name,)).fetchone();
+        return None if(row == None) else self.__tasks([row])[0];
+
+    def get_by_tag(self, tag:str) -> list[ObsidianTask]:
+        rows = self.__connect().execute(
+            f"SELECT {', '.join('t.' + column.strip() for column in SQLiteTaskStorage.COLUMNS.split(','))} FROM task_tags g JOIN tasks t ON t.id = g.task_id WHERE g.tag = ? ORDER BY t.priority, t.id",
+            (tag,)
+        ).fetchall();
+        return self.__tasks(rows);
+
+    def due_between(self, start:datetime, end:datetime) -> list[ObsidianTask]:
+        rows = self.__connect().execute(
+            f"SELECT {SQLiteTaskStorage.COLUMNS} FROM tasks WHERE due_epoch >= ? AND due_epoch < ? ORDER BY due_epoch, id",
+            (due_epoch(start), due_epoch(end))
+        ).fetchall();
+        return self.__tasks(rows);
@@ -0,0 +1,145 @@
+"""TaskStream is an incremental reader for Taskr task files.
+
+It parses the `"tasks"` array of a task file element by element, reading the file in chunks, so the whole text and the
+whole object graph are never held in memory at once.
+
+It also holds the JSON form of a task used everywhere outside the task file (journal records, the change feed, archive
+segments and the daemon protocol): `encode_task` writes it and `decode_task` reads it back.
+"""
+
+from primitives.Task import Task, ObsidianTask;
+from datetime import datetime;
+from typing import Iterator, TextIO;
+import json;
+
+DEFAULT_CHUNK_SIZE:int = 1 << 16;
+"""`DEFAULT_CHUNK_SIZE` is the number of characters read from the task file at a time."""
+
+WHITESPACE:str = " \t\n\r";
+
+class TaskStreamError(Exception):
+    """`TaskStreamError` is raised when a task file is not a JSON object with a `"tasks"` array."""
+    pass;
+
+class _Reader:
+    """A `_Reader` is a window over a text file that is refilled on demand."""
+    __slots__ = ['file', 'chunk_size', 'buffer', 'pos', 'eof'];
+
+    def __init__(self, file:TextIO, chunk_size:int) -> None:
+        self.file = file;
+        self.chunk_size = chunk_size;
+        self.buffer = "";
+        self.pos = 0;
+        self.eof = False;
+
+    def fill(self) -> bool:
+        """Reads the next chunk, dropping the consumed part of the buffer. Returns False at the end of the file."""
+        if(self.eof):
+            return False;
+        chunk = self.file.read(self.chunk_size);
+        if(chunk == ""):
+            self.eof = True;
+            return False;
+        self.buffer = self.buffer[self.pos:] + chunk;
+        self.pos = 0;
+        return True;
+
+    def peek(self) -> str:
+        """Skips whitespace and returns the next character, or an empty string at the end of the file."""
+        while True:
+            while(self.pos < len(self.buffer) and self.buffer[self.pos] in WHITESPACE):
+                self.pos += 1;
+            if(self.pos < len(self.buffer) or not self.fill()):
+                return self.buffer[self.pos:self.pos + 1];
+
+    def expect(self, char:str) -> None:
+        """Consumes the next non-whitespace character, which must be `char`."""
+        if(self.peek() != char):
+            raise TaskStreamError(f"Expected {char!r} in task file, found {self.peek()!r}");
+        self.pos += 1;
+
+    def value(self, decoder:json.JSONDecoder):
+        """Decodes the next JSON value, reading more of the file until it is complete."""
+        self.peek();
+        while True:
+            try:
+                value, end = decoder.raw_decode(self.buffer, self.pos);
+                #   A number at the end of the buffer may continue in the next chunk
+                if(end < len(self.buffer) or self.eof or not isinstance(value, (int, float))):
+                    self.pos = end;
+                    return value;
+            except json.JSONDecodeError:
+                if(self.eof):
+                    raise;
+            self.fill();
+
+def iter_task_dicts(f:TextIO, header:dict | None = None, chunk_size:int = DEFAULT_CHUNK_SIZE) -> Iterator[dict]:
+    """Iterates over the elements of the `"tasks"` array of a task file, without reading the whole file.
+
+    Args:
+        f (TextIO):             The task file, opened for reading.
+        header (dict | None):   If given, it is filled with the other keys of the task file that precede `"tasks"`.
+        chunk_size (int):       The number of characters read at a time.
+
+    Yields:
+        dict:                   The next task, as written by `Task.to_dict`.
+    """
+    reader = _Reader(f, chunk_size);
+    decoder = json.JSONDecoder();
+    reader.expect("{");
+    while True:
+        key = reader.value(decoder);
+        reader.expect(":");
+        if(key == "tasks"):
+            break;
+        value = reader.value(decoder);
+        if(header != None):
+            header[key] = value;
+        if(reader.peek() != ","):
+            raise TaskStreamError("Task file has no \"tasks\" array");
+        reader.pos += 1;
+    reader.expect("[");
+    if(reader.peek() == "]"):
+        return;
+    while True:
+        yield reader.value(decoder);
+        if(reader.peek() == "]"):
+            return;
+        reader.expect(",");
+
+def task_from_dict(data:dict) -> Task:
+    """Builds an `ObsidianTask`, or a plain `Task` if the data has no tags, as `TaskManager.from_dict` does."""
+    if("tags" in data):
+        return ObsidianTask.from_dict(data);
+    return Task.from_dict(data);
+
+def encode_due_date(due_date:datetime | None) -> str | None:
+    """Returns the JSON form of a due date, `YYYY-MM-DD`, or None."""
+    return None if(due_date == None) else due_date.strftime("%Y-%m-%d");
+
+def encode_task(task:Task) -> dict:
+    """Returns the JSON form of a task: the keys of its `to_dict`, with the due date as `YYYY-MM-DD` or None."""
+    data = task.to_dict();
+    data["due_date"] = encode_due_date(task.due_date);
+    return data;
+
+def decode_task(data:dict) -> Task:
+    """Builds a task from its JSON form, or from its form in a task file: the due date may also carry the due marker."""
+    task = task_from_dict(data);
+    task.due_date = ObsidianTask.parseDueDate(data["due_date"]);
+    return task;
+
+def iter_tasks(path:str, header:dict | None = None, chunk_size:int = DEFAULT_CHUNK_SIZE) -> Iterator[Task]:
+    """Lazily iterates over the tasks of a task file, in file order.
+
+    Args:
+        path (str):             The path of the task file.
+        header (dict | None):   If given, it is filled with the other keys of the task file that precede `"tasks"`.
+        chunk_size (int):       The number of characters read at a time.
+
+    Yields:
+        Task:                   The next task.
+    """
+    with open(path, "r") as f:
+        for data in iter_task_dicts(f, header, chunk_size):
+            yield task_from_dict(data);
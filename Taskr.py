@@ -2,17 +2,23 @@
 
 from primitives.Task import ObsidianTask;
 from TaskManager import TaskManager;
+from TaskArchive import TaskArchive;
+from TaskJournal import apply_record;
+from TaskStorage import TaskStorage, JSONTaskStorage;
+from TaskStream import encode_task;
+from TaskrClient import DEFAULT_SOCKET_FILE, TaskrClient, task_from_command;
 from datetime import datetime;
 from enum import Enum;
 from os import listdir;
 from os.path import isfile, join;
-from typing import List;
+from typing import Iterable, Iterator, List;
 import json;
 import os;
 import shutil;
 
 import logging;
 import sys;
+import time;
 import traceback;
 
 class TaskrStatus(Enum):
@@ -24,76 +30,146 @@ class TaskrStatus(Enum):
 class Taskr:
     DEFAULT_TASKR_DIRECTORY:str = ".taskr";
     DEFAULT_TASKR_TASKFILE:str = "tasks.json";
+    DEFAULT_TASKR_JOURNALFILE:str = "tasks.journal";
+    DEFAULT_COMPACTION_THRESHOLD:int = 1000;
+    DEFAULT_TASKR_ARCHIVE:str = "archive";
     
-    def __init__(self) -> None:
-        """Creates a new Taskr object."""
-        pass;
-    
-    def __chkFiles(self) -> TaskrStatus:
-        """Checks if the Taskr directory and Taskr task file exists.
+    def __init__(self, journal:bool = False, compaction_threshold:int = DEFAULT_COMPACTION_THRESHOLD, storage:TaskStorage | None = None, socket_path:str | None = None, archive_directory:str | None = None) -> None:
+        """Creates a new Taskr object.
 
-        Returns:
-            TaskrStatus:        SUCCESS if the directory and file exists, FAILURE otherwise.
+        With a `socket_path`, if a Taskr daemon is listening on it, the task methods send their commands to it instead of
+        loading the storage, until `close`. Without one, the storage is always used. `load`, `commit`, `session`
+        `compact` and `archive_tasks` always use the storage directly.
+
+        Args:
+            journal (bool):                 If True, mutations are appended to the Taskr journal instead of rewriting the task file.
+            compaction_threshold (int):     The number of journal records after which the journal is folded into the task file.
+            storage (TaskStorage | None):   The storage backend, or None for the JSON task file in the Taskr directory.
+            socket_path (str | None):       The socket of the Taskr daemon to use if it is running, or None to never use a daemon.
+            archive_directory (str | None): The directory of the archived tasks, or None for `archive` in the storage directory.
         """
-        if(os.path.exists(Taskr.DEFAULT_TASKR_DIRECTORY) and os.path.exists(os.path.join(Taskr.DEFAULT_TASKR_DIRECTORY, Taskr.DEFAULT_TASKR_TASKFILE))):
-            return TaskrStatus.SUCCESS;
-        return TaskrStatus.FAILURE;
+        if(storage == None):
+            storage = JSONTaskStorage(Taskr.DEFAULT_TASKR_DIRECTORY, Taskr.DEFAULT_TASKR_TASKFILE, Taskr.DEFAULT_TASKR_JOURNALFILE, journal, compaction_threshold);
+        self.storage = storage;
+        self.client = None if(socket_path == None) else TaskrClient.connect(socket_path);
+        if(archive_directory == None):
+            archive_directory = join(getattr(storage, "directory", Taskr.DEFAULT_TASKR_DIRECTORY), Taskr.DEFAULT_TASKR_ARCHIVE);
+        self.archive = TaskArchive(archive_directory);
+        
+    def __enter__(self) -> "Taskr":
+        return self;
     
-    def __createTaskrDirectory(self) -> TaskrStatus:
-        """Creates the Taskr directory.
+    def __exit__(self, exc_type, exc_value, traceback) -> None:
+        self.close();
+        
+    def close(self) -> None:
+        """Closes the connection to the Taskr daemon, if any. The task methods use the storage afterwards."""
+        if(self.client != None):
+            self.client.close();
+            self.client = None;
+        
+    def __remote(self, command:dict) -> dict:
+        """Sends a command to the Taskr daemon.
+
+        Args:
+            command (dict):     The command, as understood by `TaskrCLI.execute_command`.
 
         Returns:
-            TaskrStatus:        SUCCESS if the directory was created, FAILURE otherwise.
+            dict:               The result of the command, with `ok` False if the daemon could not be reached.
         """
         try:
-            os.mkdir(Taskr.DEFAULT_TASKR_DIRECTORY);
-            return TaskrStatus.SUCCESS;
+            return self.client.request(command);
         except Exception as e:
-            logging.error(f"Error creating Taskr directory: {e}");
-            return TaskrStatus.FAILURE;
+            logging.error(f"Error contacting Taskr daemon: {e}");
+            return {"ok": False, "error": str(e)};
         
-    def __createTaskrTaskFile(self) -> TaskrStatus:
-        """Creates the Taskr task file.
+    def __remote_status(self, command:dict) -> TaskrStatus:
+        return TaskrStatus.SUCCESS if(self.__remote(command)["ok"]) else TaskrStatus.FAILURE;
+        
+    def load(self) -> tuple[TaskManager, object]:
+        """Loads the tasks of the Taskr storage.
 
         Returns:
-            TaskrStatus:        SUCCESS if the file was created, FAILURE otherwise.
+            tuple[TaskManager, object]: The loaded TaskManager, and the opaque version to hand back to `commit`.
         """
         try:
-            with open(os.path.join(Taskr.DEFAULT_TASKR_DIRECTORY, Taskr.DEFAULT_TASKR_TASKFILE), "w") as f:
-                f.write(json.dumps(TaskManager().to_dict()));
-            return TaskrStatus.SUCCESS;
+            self.storage.prepare();
+            return self.storage.load();
         except Exception as e:
-            logging.error(f"Error creating Taskr task file: {e}");
+            logging.error(f"Error loading Taskr task file: {e}");
+            return (TaskManager(), None);
+
+    def commit(self, records:list[dict], task_manager:TaskManager | None = None, version:object = None) -> TaskrStatus:
+        """Persists mutation records to the Taskr storage.
+
+        Args:
+            records (list[dict]):           The mutation records, as understood by `TaskJournal.apply_record`.
+            task_manager (TaskManager):     A TaskManager returned by `load` with the records already applied, or None.
+            version (object):               The version returned by `load` alongside `task_manager`.
+
+        Returns:
+            TaskrStatus:        SUCCESS if every record was persisted, FAILURE otherwise.
+        """
+        try:
+            self.storage.prepare();
+            if(self.storage.commit(records, task_manager, version) != None):
+                return TaskrStatus.SUCCESS;
             return TaskrStatus.FAILURE;
+        except Exception as e:
+            logging.error(f"Error saving Taskr task file: {e}");
+            return TaskrStatus.FAILURE;
+        
+    def session(self, autosave_every:int | None = None, autosave_interval:float | None = None) -> "TaskrSession":
+        """Opens a session that keeps the tasks loaded in memory and persists them in batches.
+
+        Args:
+            autosave_every (int | None):        Flush after this many mutations, or never if None.
+            autosave_interval (float | None):   Flush on the first mutation made this many seconds after the last flush, or never if None.
 
-    def __loadTaskrTaskFile(self) -> TaskManager:
-        """Loads the Taskr task file.
+        Returns:
+            TaskrSession:       The session, usable as a context manager.
+        """
+        return TaskrSession(self, autosave_every, autosave_interval);
+        
+    def compact(self) -> TaskrStatus:
+        """Folds the Taskr journal into the Taskr task file, or otherwise reorganizes the Taskr storage.
 
         Returns:
-            TaskManager:        The TaskManager object loaded from the Taskr task file.
+            TaskrStatus:        SUCCESS if the storage was compacted, FAILURE otherwise.
         """
         try:
-            with open(os.path.join(Taskr.DEFAULT_TASKR_DIRECTORY, Taskr.DEFAULT_TASKR_TASKFILE), "r") as f:
-                return TaskManager.from_dict(json.loads(f.read()));
+            self.storage.prepare();
+            self.storage.compact();
+            return TaskrStatus.SUCCESS;
         except Exception as e:
-            logging.error(f"Error loading Taskr task file: {e}");
-            return TaskManager();
+            logging.error(f"Error compacting Taskr storage: {e}");
+            return TaskrStatus.FAILURE;
+        
+    def archive_tasks(self, cutoff:datetime, include_undated:bool = False) -> TaskrStatus:
+        """Moves the completed tasks due before `cutoff` out of the Taskr storage into the Taskr archive.
 
-    def __saveTaskrTaskFile(self, task_manager:TaskManager) -> TaskrStatus:
-        """Saves the Taskr task file.
+        Tasks have no completion date, so their due date is used instead. The archive is written before the tasks are
+        removed from the storage, so a failure never loses a task.
 
         Args:
-            task_manager (TaskManager): The TaskManager object to save.
+            cutoff (datetime):          Completed tasks due before this time are archived.
+            include_undated (bool):     If True, completed tasks without a due date are archived too.
 
         Returns:
-            TaskrStatus:        SUCCESS if the file was saved, FAILURE otherwise.
+            TaskrStatus:        SUCCESS if the tasks were archived, FAILURE otherwise.
         """
         try:
-            with open(os.path.join(Taskr.DEFAULT_TASKR_DIRECTORY, Taskr.DEFAULT_TASKR_TASKFILE), "w") as f:
-                f.write(json.dumps(task_manager.to_dict()));
-            return TaskrStatus.SUCCESS;
+            if(self.client != None):
+                logging.error("Error archiving tasks: a Taskr daemon is running");
+                return TaskrStatus.FAILURE;
+            task_manager, version = self.load();
+            tasks = self.archive.archive(task_manager, cutoff, include_undated);
+            if(len(tasks) == 0):
+                return TaskrStatus.SUCCESS;
+            #   The records carry the whole task, so a task sharing the name of an archived one is never removed instead
+            return self.commit([{"op": "remove", "name": task.name, "task": encode_task(task)} for task in tasks], task_manager, version);
         except Exception as e:
-            logging.error(f"Error saving Taskr task file: {e}");
+            logging.error(f"Error archiving tasks: {e}");
             return TaskrStatus.FAILURE;
         
     def add_task(self, task:ObsidianTask) -> TaskrStatus:
@@ -106,16 +182,9 @@ class Taskr:
             TaskrStatus:        SUCCESS if the task was added, FAILURE otherwise.
         """
         try:
-            status = self.__chkFiles();
-            if(status == TaskrStatus.FAILURE):
-                status = self.__createTaskrDirectory();
-                if(status == TaskrStatus.SUCCESS):
-                    status = self.__createTaskrTaskFile();
-            if(status == TaskrStatus.SUCCESS):
-                task_manager = self.__loadTaskrTaskFile();
-                task_manager.add_task(task);
-                status = self.__saveTaskrTaskFile(task_manager);
-            return status;
+            if(self.client != None):
+                return self.__remote_status({"op": "add", "task": encode_task(task)});
+            return self.commit([{"op": "add", "task": task.to_dict()}]);
         except Exception as e:
             logging.error(f"Error adding task: {e}");
             return TaskrStatus.FAILURE;
@@ -130,16 +199,9 @@ class Taskr:
             TaskrStatus:        SUCCESS if the task was removed, FAILURE otherwise.
         """
         try:
-            status = self.__chkFiles();
-            if(status == TaskrStatus.FAILURE):
-                status = self.__createTaskrDirectory();
-                if(status == TaskrStatus.SUCCESS):
-                    status = self.__createTaskrTaskFile();
-            if(status == TaskrStatus.SUCCESS):
-                task_manager = self.__loadTaskrTaskFile();
-                task_manager.remove_task(task);
-                status = self.__saveTaskrTaskFile(task_manager);
-            return status;
+            if(self.client != None):
+                return self.__remote_status({"op": "remove", "name": task.name});
+            return self.commit([{"op": "remove", "name": task.name}]);
         except Exception as e:
             logging.error(f"Error removing task: {e}");
             return TaskrStatus.FAILURE;
@@ -154,16 +216,9 @@ class Taskr:
             TaskrStatus:        SUCCESS if the task was completed, FAILURE otherwise.
         """
         try:
-            status = self.__chkFiles();
-            if(status == TaskrStatus.FAILURE):
-                status = self.__createTaskrDirectory();
-                if(status == TaskrStatus.SUCCESS):
-                    status = self.__createTaskrTaskFile();
-            if(status == TaskrStatus.SUCCESS):
-                task_manager = self.__loadTaskrTaskFile();
-                task_manager.complete_task(task);
-                status = self.__saveTaskrTaskFile(task_manager);
-            return status;
+            if(self.client != None):
+                return self.__remote_status({"op": "complete", "name": task.name});
+            return self.commit([{"op": "complete", "name": task.name}]);
         except Exception as e:
             logging.error(f"Error completing task: {e}");
             return TaskrStatus.FAILURE;
@@ -178,20 +233,188 @@ class Taskr:
             TaskrStatus:        SUCCESS if the task was uncompleted, FAILURE otherwise.
         """
         try:
-            status = self.__chkFiles();
-            if(status == TaskrStatus.FAILURE):
-                status = self.__createTaskrDirectory();
-                if(status == TaskrStatus.SUCCESS):
-                    status = self.__createTaskrTaskFile();
-            if(status == TaskrStatus.SUCCESS):
-                task_manager = self.__loadTaskrTaskFile();
-                task_manager.uncomplete_task(task);
-                status = self.__saveTaskrTaskFile(task_manager);
-            return status;
+            if(self.client != None):
+                return self.__remote_status({"op": "uncomplete", "name": task.name});
+            return self.commit([{"op": "uncomplete", "name": task.name}]);
         except Exception as e:
             logging.error(f"Error uncompleting task: {e}");
             return TaskrStatus.FAILURE;
     
+    def __commit_each(self, records:Iterable[dict]) -> List[TaskrStatus]:
+        """Applies mutation records to a single load of the Taskr storage and persists the applied ones at once.
+
+        Args:
+            records (Iterable[dict]):   The mutation records, as understood by `TaskJournal.apply_record`, or None for invalid items.
+
+        Returns:
+            List[TaskrStatus]:  For each record, SUCCESS if it was persisted, FAILURE otherwise.
+        """
+        if(self.client != None):
+            return [TaskrStatus.FAILURE if(record == None) else self.__remote_status(record) for record in records];
+        task_manager, version = self.load();
+        applied = [];
+        statuses = [];
+        for record in records:
+            try:
+                if(record != None and apply_record(task_manager, record)):
+                    applied.append(record);
+                    statuses.append(TaskrStatus.SUCCESS);
+                    continue;
+            except Exception as e:
+                logging.error(f"Error applying Taskr record: {e}");
+            statuses.append(TaskrStatus.FAILURE);
+        if(len(applied) > 0 and self.commit(applied, task_manager, version) != TaskrStatus.SUCCESS):
+            return [TaskrStatus.FAILURE] * len(statuses);
+        return statuses;
+    
+    def __name_records(self, op:str, tasks:Iterable[ObsidianTask | str]) -> Iterator[dict | None]:
+        """Builds the mutation records of an operation that targets tasks by name."""
+        for task in tasks:
+            name = task if(isinstance(task, str)) else getattr(task, "name", None);
+            yield None if(name == None) else {"op": op, "name": name};
+    
+    def add_tasks(self, tasks:Iterable[ObsidianTask]) -> List[TaskrStatus]:
+        """Adds several tasks to the Taskr storage with a single load and save.
+
+        Args:
+            tasks (Iterable[ObsidianTask]): The tasks to add. A generator is consumed once.
+
+        Returns:
+            List[TaskrStatus]:  For each task, SUCCESS if it was added, FAILURE otherwise.
+        """
+        def records():
+            for task in tasks:
+                try:
+                    yield {"op": "add", "task": encode_task(task) if(self.client != None) else task.to_dict()};
+                except Exception as e:
+                    logging.error(f"Error adding task: {e}");
+                    yield None;
+        return self.__commit_each(records());
+    
+    def remove_tasks(self, tasks:Iterable[ObsidianTask | str]) -> List[TaskrStatus]:
+        """Removes several tasks from the Taskr storage with a single load and save.
+
+        Args:
+            tasks (Iterable[ObsidianTask | str]):   The tasks to remove, or their names. A generator is consumed once.
+
+        Returns:
+            List[TaskrStatus]:  For each task, SUCCESS if it was removed, FAILURE if it was not found or not saved.
+        """
+        return self.__commit_each(self.__name_records("remove", tasks));
+    
+    def complete_tasks(self, tasks:Iterable[ObsidianTask | str]) -> List[TaskrStatus]:
+        """Completes several tasks of the Taskr storage with a single load and save.
+
+        Args:
+            tasks (Iterable[ObsidianTask | str]):   The tasks to complete, or their names. A generator is consumed once.
+
+        Returns:
+            List[TaskrStatus]:  For each task, SUCCESS if it was completed, FAILURE if it was not found or not saved.
+        """
+        return self.__commit_each(self.__name_records("complete", tasks));
+    
+    def uncomplete_tasks(self, tasks:Iterable[ObsidianTask | str]) -> List[TaskrStatus]:
+        """Uncompletes several tasks of the Taskr storage with a single load and save.
+
+        Args:
+            tasks (Iterable[ObsidianTask | str]):   The tasks to uncomplete, or their names. A generator is consumed once.
+
+        Returns:
+            List[TaskrStatus]:  For each task, SUCCESS if it was uncompleted, FAILURE if it was not found or not saved.
+        """
+        return self.__commit_each(self.__name_records("uncomplete", tasks));
+    
+    def get_task(self, name:str, include_archive:bool = False) -> ObsidianTask | None:
+        """Gets a task from the Taskr task file by name.
+
+        Args:
+            name (str):             The name of the task.
+            include_archive (bool): If True, the archive is searched when the task is not in the task file.
+
+        Returns:
+            ObsidianTask | None:    The task, or None if there is no task with that name.
+        """
+        try:
+            if(self.client != None):
+                task = self.__remote({"op": "get", "name": name}).get("task");
+                task = None if(task == None) else task_from_command(task);
+            else:
+                self.storage.prepare();
+                task = self.storage.get_task(name);
+            if(task == None and include_archive):
+                return self.archive.get_task(name);
+            return task;
+        except Exception as e:
+            logging.error(f"Error getting task: {e}");
+            return None;
+    
+    def get_by_tag(self, tag:str, include_archive:bool = False) -> List[ObsidianTask]:
+        """Gets the tasks with the given tag from the Taskr storage.
+
+        Args:
+            tag (str):              The tag to look for.
+            include_archive (bool): If True, the archived tasks with the tag follow the others.
+
+        Returns:
+            List[ObsidianTask]:        The tasks with the tag, sorted by priority.
+        """
+        try:
+            if(self.client != None):
+                tasks = [task_from_command(task) for task in self.__remote({"op": "query", "tag": tag}).get("tasks", [])];
+            else:
+                self.storage.prepare();
+                tasks = self.storage.get_by_tag(tag);
+            if(include_archive):
+                return tasks + self.archive.get_by_tag(tag);
+            return tasks;
+        except Exception as e:
+            logging.error(f"Error getting tasks by tag: {e}");
+            return [];
+        
+    def due_between(self, start:datetime, end:datetime, include_archive:bool = False) -> List[ObsidianTask]:
+        """Gets the tasks due in `[start, end)` from the Taskr storage.
+
+        Args:
+            start (datetime):       The start of the window, inclusive.
+            end (datetime):         The end of the window, exclusive.
+            include_archive (bool): If True, the archive segments of the months of the window are searched too.
+
+        Returns:
+            List[ObsidianTask]:        The tasks due in the window, sorted by due date.
+        """
+        try:
+            if(self.client != None):
+                tasks = [task_from_command(task) for task in self.__remote({"op": "query", "due_from": start.isoformat(), "due_to": end.isoformat()}).get("tasks", [])];
+            else:
+                self.storage.prepare();
+                tasks = self.storage.due_between(start, end);
+            if(include_archive):
+                return sorted(tasks + self.archive.due_between(start, end), key=lambda task: task.due_date);
+            return tasks;
+        except Exception as e:
+            logging.error(f"Error getting tasks by due date: {e}");
+            return [];
+    
+    def iter_tasks(self, include_archive:bool = False) -> Iterator[ObsidianTask]:
+        """Lazily iterates over the tasks of the Taskr storage, without loading them all, for read-only queries.
+
+        Args:
+            include_archive (bool): If True, the archived tasks follow the others, read one segment at a time.
+
+        Yields:
+            ObsidianTask:       The next task.
+        """
+        try:
+            if(self.client != None):
+                yield from self.getAllTasks();
+            else:
+                self.storage.prepare();
+                yield from self.storage.iter_tasks();
+            if(include_archive):
+                yield from self.archive.iter_tasks();
+        except Exception as e:
+            logging.error(f"Error iterating over tasks: {e}");
+    
     def getAllTasks(self) -> List[ObsidianTask]:
         """Gets all tasks from the Taskr task file.
 
@@ -199,22 +422,169 @@ class Taskr:
             List[ObsidianTask]:        A list of all tasks.
         """
         try:
-            status = self.__chkFiles();
-            if(status == TaskrStatus.FAILURE):
-                status = self.__createTaskrDirectory();
-                if(status == TaskrStatus.SUCCESS):
-                    status = self.__createTaskrTaskFile();
-            if(status == TaskrStatus.SUCCESS):
-                task_manager = self.__loadTaskrTaskFile();
-                return task_manager.get_tasks();
-            return [];
+            if(self.client != None):
+                return [task_from_command(task) for task in self.__remote({"op": "list"}).get("tasks", [])];
+            self.storage.prepare();
+            return self.storage.load()[0].get_tasks();
         except Exception as e:
             logging.error(f"Error getting all tasks: {e}");
             return [];
         
+class TaskrSession:
+    """A `TaskrSession` keeps a single `TaskManager` loaded from the Taskr task file and persists its mutations in batches.
+
+    Mutations are applied in memory and recorded; `flush` commits every pending mutation at once to the Taskr storage.
+    Used as a context manager, the session is loaded on enter and flushed on exit.
+    """
+    def __init__(self, taskr:Taskr, autosave_every:int | None = None, autosave_interval:float | None = None) -> None:
+        """Creates a new TaskrSession. Prefer `Taskr.session`.
+
+        Args:
+            taskr (Taskr):                      The Taskr object to load the tasks from and persist them to.
+            autosave_every (int | None):        Flush after this many mutations, or never if None.
+            autosave_interval (float | None):   Flush on the first mutation made this many seconds after the last flush, or never if None.
+        """
+        self.taskr = taskr;
+        self.autosave_every = autosave_every;
+        self.autosave_interval = autosave_interval;
+        self.task_manager = None;
+        self.version = None;
+        self.pending = [];
+        self.dirty = set();
+        self.last_flush = time.monotonic();
+        
+    def open(self) -> "TaskrSession":
+        """Loads the tasks of the Taskr task file. Called on enter when used as a context manager.
+
+        Returns:
+            TaskrSession:       The session itself.
+        """
+        self.task_manager, self.version = self.taskr.load();
+        self.pending = [];
+        self.dirty = set();
+        self.last_flush = time.monotonic();
+        return self;
+    
+    def __enter__(self) -> "TaskrSession":
+        return self.open();
+    
+    def __exit__(self, exc_type, exc_value, traceback) -> None:
+        self.flush();
+        
+    def __record(self, record:dict) -> TaskrStatus:
+        """Applies a mutation record in memory and schedules it for the next flush.
+
+        Args:
+            record (dict):      The mutation record, as understood by `TaskJournal.apply_record`.
+
+        Returns:
+            TaskrStatus:        SUCCESS if the record was applied, FAILURE otherwise.
+        """
+        if(self.task_manager == None):
+            self.open();
+        if(not apply_record(self.task_manager, record)):
+            return TaskrStatus.FAILURE;
+        self.pending.append(record);
+        self.dirty.add(record["task"]["name"] if(record["op"] == "add") else record["name"]);
+        if(self.autosave_every != None and len(self.pending) >= self.autosave_every):
+            return self.flush();
+        if(self.autosave_interval != None and time.monotonic() - self.last_flush >= self.autosave_interval):
+            return self.flush();
+        return TaskrStatus.SUCCESS;
+    
+    def flush(self) -> TaskrStatus:
+        """Persists every pending mutation.
+
+        Returns:
+            TaskrStatus:        SUCCESS if the mutations were persisted (or there were none), FAILURE otherwise.
+        """
+        if(len(self.pending) == 0):
+            return TaskrStatus.SUCCESS;
+        try:
+            self.taskr.storage.prepare();
+            version = self.taskr.storage.commit(self.pending, self.task_manager, self.version);
+            if(version == None):
+                return TaskrStatus.FAILURE;
+            #   The next flush commits on top of this one instead of loading the storage again
+            self.version = version;
+            self.pending = [];
+            self.dirty = set();
+            self.last_flush = time.monotonic();
+            return TaskrStatus.SUCCESS;
+        except Exception as e:
+            logging.error(f"Error flushing Taskr session: {e}");
+            return TaskrStatus.FAILURE;
+        
+    def add_task(self, task:ObsidianTask) -> TaskrStatus:
+        """Adds a task to the session.
+
+        Args:
+            task (ObsidianTask): The task to add.
+
+        Returns:
+            TaskrStatus:        SUCCESS if the task was added, FAILURE otherwise.
+        """
+        return self.__record({"op": "add", "task": task.to_dict()});
+    
+    def remove_task(self, task:ObsidianTask) -> TaskrStatus:
+        """Removes a task from the session.
+
+        Args:
+            task (ObsidianTask): The task to remove.
+
+        Returns:
+            TaskrStatus:        SUCCESS if the task was removed, FAILURE otherwise.
+        """
+        return self.__record({"op": "remove", "name": task.name});
+    
+    def complete_task(self, task:ObsidianTask) -> TaskrStatus:
+        """Completes a task of the session.
+
+        Args:
+            task (ObsidianTask): The task to complete.
+
+        Returns:
+            TaskrStatus:        SUCCESS if the task was completed, FAILURE otherwise.
+        """
+        return self.__record({"op": "complete", "name": task.name});
+    
+    def uncomplete_task(self, task:ObsidianTask) -> TaskrStatus:
+        """Uncompletes a task of the session.
+
+        Args:
+            task (ObsidianTask): The task to uncomplete.
+
+        Returns:
+            TaskrStatus:        SUCCESS if the task was uncompleted, FAILURE otherwise.
+        """
+        return self.__record({"op": "uncomplete", "name": task.name});
+    
+    def get_task(self, name:str) -> ObsidianTask | None:
+        """Gets a task of the session by name.
+
+        Args:
+            name (str):         The name of the task.
+
+        Returns:
+            ObsidianTask | None:    The task, or None if there is no task with that name.
+        """
+        if(self.task_manager == None):
+            self.open();
+        return self.task_manager.get_task(name);
+    
+    def getAllTasks(self) -> List[ObsidianTask]:
+        """Gets all tasks of the session, including the ones not flushed yet.
+
+        Returns:
+            List[ObsidianTask]:        A list of all tasks.
+        """
+        if(self.task_manager == None):
+            self.open();
+        return self.task_manager.get_tasks();
+        
 class App:
     def __init__(self):
-        self.interface = Taskr();
+        self.interface = Taskr(socket_path=join(Taskr.DEFAULT_TASKR_DIRECTORY, DEFAULT_SOCKET_FILE));
 
     def present(self):
         print("Welcome to Taskr! Please choose an option:");
@@ -301,12 +671,16 @@ class App:
             elif(option == "5"):
                 self.get_all_tasks();
             elif(option == "6"):
+                self.interface.close();
                 break;
             else:
                 print("Invalid option!");
     
         
 if __name__ == '__main__':
+    if(len(sys.argv) > 1):
+        from TaskrCLI import main;
+        sys.exit(main());
     App().run();
     
     a = TaskManager();
\ No newline at end of file
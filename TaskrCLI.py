@@ -0,0 +1,280 @@
+"""TaskrCLI is the non-interactive command line of Taskr.
+
+Every subcommand runs against a single `TaskrSession`, or against the Taskr daemon if one is running in the Taskr
+directory. The read-only subcommands (`get`, `list` and `query`) read the `TaskSnapshot` of the task file instead when it
+is current, so they start without parsing the task file. The `batch` subcommand reads newline-delimited JSON commands
+from stdin and writes one JSON result per command to stdout, so a whole stream of operations is executed against one
+loaded `TaskManager` and persisted with a single flush:
+
+    {"op": "add", "task": {"name": "a", "priority": 4, "due_date": "2024-10-30", "tags": ["#work"]}}
+    {"op": "complete", "name": "a"}
+    {"op": "query", "tags": ["#work"], "completed": false}
+
+Usage:
+    python Taskr.py add "Buy milk" --priority 4 --due 2024-10-30 --tags "#home"
+    python Taskr.py list --json
+    python Taskr.py batch < commands.ndjson > results.ndjson
+"""
+
+from primitives.Task import Task, ObsidianTask;
+from Taskr import Taskr, TaskrSession, TaskrStatus;
+from TaskManager import TaskManager;
+from TaskSnapshot import TaskSnapshot;
+from TaskStorage import JSONTaskStorage;
+from TaskStream import encode_task;
+from TaskrClient import DEFAULT_PRIORITY, DEFAULT_SOCKET_FILE, TaskrClient, task_from_command;
+from datetime import datetime;
+from typing import Callable, Iterable, TextIO;
+import argparse;
+import json;
+import os;
+import sys;
+
+COMMANDS:tuple = ("add", "remove", "complete", "uncomplete", "get", "list", "query", "flush");
+"""`COMMANDS` are the operations understood by `execute_command`."""
+
+READ_COMMANDS:tuple = ("get", "list", "query");
+"""`READ_COMMANDS` are the operations understood by `execute_snapshot`."""
+
+def parse_date(value:str | None) -> datetime | None:
+    """Parses a date of a query, `YYYY-MM-DD` or an ISO 8601 date and time, with or without the due marker."""
+    if(value == None):
+        return None;
+    return datetime.fromisoformat(value.replace(ObsidianTask.DUE, "").strip());
+
+def query(task_manager:TaskManager, command:dict) -> list[Task]:
+    """Selects the tasks matching the filters of a `query` command, using the `TaskManager` indexes.
+
+    Args:
+        task_manager (TaskManager): The tasks, e.g. those of a session.
+        command (dict):         The command, with any of `tag`, `tags`, `match` (`all` or `any`), `due_from`, `due_to`,
+                                `completed` and `priority`.
+
+    Returns:
+        list[Task]:             The matching tasks, by due date if a due window is given, by priority otherwise.
+    """
+    tags = list(command.get("tags", []));
+    if(command.get("tag") != None):
+        tags.append(command["tag"]);
+    due_from = parse_date(command.get("due_from"));
+    due_to = parse_date(command.get("due_to"));
+    if(due_from != None or due_to != None):
+        tasks = task_manager.due_between(due_from or datetime.min, due_to or datetime.max);
+        if(len(tags) > 0):
+            tagged = {id(task) for task in task_manager.get_by_tags(tags, command.get("match", "all"))};
+            tasks = [task for task in tasks if id(task) in tagged];
+    elif(len(tags) > 0):
+        tasks = task_manager.get_by_tags(tags, command.get("match", "all"));
+    else:
+        tasks = list(task_manager.get_tasks());
+    if(command.get("completed") != None):
+        tasks = [task for task in tasks if task.completed == bool(command["completed"])];
+    if(command.get("priority") != None):
+        tasks = [task for task in tasks if task.priority == int(command["priority"])];
+    return tasks;
+
+def execute_command(session:TaskrSession, command:dict) -> dict:
+    """Executes a command against a session.
+
+    Mutations are applied to the session and persisted when it is flushed. Every result has `ok` and, if the command
+    has one, the command's `id`; failed commands have an `error`.
+
+    Args:
+        session (TaskrSession): The session to execute the command against.
+        command (dict):         The command: `op` is one of `COMMANDS`, plus the arguments of the operation.
+
+    Returns:
+        dict:                   The result of the command.
+    """
+    result = {} if(command.get("id") == None) else {"id": command["id"]};
+    try:
+        op = command.get("op");
+        if(session.task_manager == None):
+            session.open();
+        if(op == "add"):
+            status = session.add_task(task_from_command(command["task"]));
+        elif(op in ("remove", "complete", "uncomplete")):
+            task = session.get_task(command["name"]);
+            if(task == None):
+                result.update({"ok": False, "error": f"Task not found: {command['name']}"});
+                return result;
+            status = getattr(session, op + "_task")(task);
+        elif(op == "get"):
+            task = session.get_task(command["name"]);
+            result.update({"ok": task != None, "task": None if(task == None) else encode_task(task)});
+            return result;
+        elif(op in ("list", "query")):
+            result.update({"ok": True, "tasks": [encode_task(task) for task in query(session.task_manager, command)]});
+            return result;
+        elif(op == "flush"):
+            status = session.flush();
+        else:
+            result.update({"ok": False, "error": f"Invalid command: {op}"});
+            return result;
+        result.update({"ok": status == TaskrStatus.SUCCESS, "status": status.name});
+    except Exception as e:
+        result.update({"ok": False, "error": f"{type(e).__name__}: {e}"});
+    return result;
+
+def execute_snapshot(snapshot:TaskSnapshot, command:dict) -> dict:
+    """Executes a read-only command against a snapshot, giving the result `execute_command` gives against a session.
+
+    `get` binary-searches the snapshot and `list` decodes it in order; only `query` builds a `TaskManager` of it, to use its indexes.
+
+    Args:
+        snapshot (TaskSnapshot):    The snapshot of the task file.
+        command (dict):         The command: `op` is one of `READ_COMMANDS`, plus the arguments of the operation.
+
+    Returns:
+        dict:                   The result of the command.
+    """
+    result = {} if(command.get("id") == None) else {"id": command["id"]};
+    try:
+        op = command.get("op");
+        if(op == "get"):
+            task = snapshot.get(command["name"]);
+            result.update({"ok": task != None, "task": None if(task == None) else encode_task(task)});
+        elif(op == "list"):
+            result.update({"ok": True, "tasks": [encode_task(task) for task in snapshot]});
+        elif(op == "query"):
+            result.update({"ok": True, "tasks": [encode_task(task) for task in query(snapshot.to_task_manager(), command)]});
+        else:
+            result.update({"ok": False, "error": f"Invalid command: {op}"});
+    except Exception as e:
+        result.update({"ok": False, "error": f"{type(e).__name__}: {e}"});
+    return result;
+
+def run_batch(execute:Callable[[dict], dict], lines:Iterable[str], output:TextIO) -> bool:
+    """Executes newline-delimited JSON commands, writing one JSON result per non-empty line.
+
+    A command that fails, whatever the error, gets a result with `ok` false and an `error`, and the next commands still run.
+
+    Args:
+        execute (Callable[[dict], dict]):   Executes a command and returns its result, e.g. `execute_command` bound to a session.
+        lines (Iterable[str]):  The commands, one JSON object per line, e.g. `sys.stdin`.
+        output (TextIO):        Where the results are written.
+
+    Returns:
+        bool:                   True if every command succeeded.
+    """
+    ok = True;
+    for line in lines:
+        if(line.strip() == ""):
+            continue;
+        command = None;
+        try:
+            command = json.loads(line);
+            if(not isinstance(command, dict)):
+                command = None;
+                raise ValueError("A command must be a JSON object");
+            result = execute(command);
+        except ValueError as e:
+            result = {"ok": False, "error": f"Invalid command line: {e}"};
+        except OSError as e:
+            #   The daemon went away or timed out: this command failed, the next ones are still answered
+            result = {"ok": False, "status": TaskrStatus.FAILURE.name, "error": f"Error contacting Taskr daemon: {e}"};
+        except Exception as e:
+            result = {"ok": False, "error": f"{type(e).__name__}: {e}"};
+        if(command != None and command.get("id") != None and "id" not in result):
+            result = {"id": command["id"], **result};
+        ok = ok and result["ok"];
+        output.write(json.dumps(result, ensure_ascii=False) + "\n");
+    return ok;
+
+def build_parser() -> argparse.ArgumentParser:
+    parser = argparse.ArgumentParser(prog="taskr", description="Manages the tasks of a Taskr directory.");
+    parser.add_argument("--directory", default=Taskr.DEFAULT_TASKR_DIRECTORY, help="the Taskr directory");
+    parser.add_argument("--journal", action="store_true", help="append mutations to the journal instead of rewriting the task file");
+    commands = parser.add_subparsers(dest="command", required=True);
+
+    add = commands.add_parser("add", help="add a task");
+    add.add_argument("name");
+    add.add_argument("--description", default="");
+    add.add_argument("--priority", type=int, default=DEFAULT_PRIORITY, choices=sorted(ObsidianTask.PRIORITIES));
+    add.add_argument("--due", help="due date, YYYY-MM-DD");
+    add.add_argument("--tags", nargs="*", default=[]);
+    for name in ("remove", "complete", "uncomplete", "get"):
+        command = commands.add_parser(name, help=f"{name} a task by name");
+        command.add_argument("name");
+    for name in ("list", "query"):
+        command = commands.add_parser(name, help="list the tasks" if(name == "list") else "list the tasks matching filters");
+        command.add_argument("--json", action="store_true", help="print one JSON task per line");
+        if(name == "query"):
+            command.add_argument("--tags", nargs="+", default=[]);
+            command.add_argument("--any", action="store_true", help="match any of the tags instead of all of them");
+            command.add_argument("--due-from", help="due at or after this date, YYYY-MM-DD");
+            command.add_argument("--due-to", help="due before this date, YYYY-MM-DD");
+            command.add_argument("--priority", type=int);
+            state = command.add_mutually_exclusive_group();
+            state.add_argument("--completed", dest="completed", action="store_const", const=True);
+            state.add_argument("--open", dest="completed", action="store_const", const=False);
+    batch = commands.add_parser("batch", help="execute newline-delimited JSON commands from stdin");
+    batch.add_argument("--autosave", type=int, help="flush after this many mutations");
+    return parser;
+
+def command_of(args:argparse.Namespace) -> dict:
+    """Translates the arguments of a subcommand into a command for `execute_command`."""
+    if(args.command == "add"):
+        return {"op": "add", "task": {"name": args.name, "description": args.description, "priority": args.priority, "due_date": args.due, "tags": args.tags}};
+    if(args.command in ("remove", "complete", "uncomplete", "get")):
+        return {"op": args.command, "name": args.name};
+    if(args.command == "query"):
+        return {"op": "query", "tags": args.tags, "match": "any" if(args.any) else "all", "due_from": args.due_from, "due_to": args.due_to, "completed": args.completed, "priority": args.priority};
+    return {"op": "list"};
+
+def run(args:argparse.Namespace, execute:Callable[[dict], dict]) -> bool:
+    """Executes the subcommand of the arguments, printing its output.
+
+    Args:
+        args (argparse.Namespace):          The parsed arguments.
+        execute (Callable[[dict], dict]):   Executes a command and returns its result.
+
+    Returns:
+        bool:                   True if the subcommand succeeded.
+    """
+    if(args.command == "batch"):
+        return run_batch(execute, sys.stdin, sys.stdout);
+    try:
+        result = execute(command_of(args));
+    except OSError as e:
+        result = {"ok": False, "status": TaskrStatus.FAILURE.name, "error": f"Error contacting Taskr daemon: {e}"};
+    if("tasks" in result):
+        for task in result["tasks"]:
+            print(json.dumps(task, ensure_ascii=False) if(args.json) else str(task_from_command(task)));
+    elif("task" in result and result["task"] != None):
+        print(str(task_from_command(result["task"])));
+    elif(not result["ok"]):
+        print(result.get("error", "Command failed"), file=sys.stderr);
+    return result["ok"];
+
+def main(argv:list[str] | None = None) -> int:
+    """Runs the command line.
+
+    Args:
+        argv (list[str] | None):    The arguments, or None to use `sys.argv`.
+
+    Returns:
+        int:                    The exit code: 0 if every command succeeded, 1 otherwise.
+    """
+    args = build_parser().parse_args(argv);
+    #   A running daemon already has the tasks loaded, so the commands are sent to it instead
+    client = TaskrClient.connect(os.path.join(args.directory, DEFAULT_SOCKET_FILE));
+    if(client != None):
+        with client:
+            return 0 if(run(args, client.request)) else 1;
+    storage = JSONTaskStorage(args.directory, Taskr.DEFAULT_TASKR_TASKFILE, Taskr.DEFAULT_TASKR_JOURNALFILE, args.journal);
+    snapshot = storage.snapshot() if(args.command in READ_COMMANDS) else None;
+    if(snapshot != None):
+        with snapshot:
+            return 0 if(run(args, lambda command: execute_snapshot(snapshot, command))) else 1;
+    taskr = Taskr(storage=storage);
+    with taskr.session(autosave_every=getattr(args, "autosave", None)) as session:
+        try:
+            ok = run(args, lambda command: execute_command(session, command));
+        finally:
+            #   The mutations already answered are persisted even if the stream breaks off
+            flushed = session.flush() == TaskrStatus.SUCCESS;
+    return 0 if(ok and flushed) else 1;
+
+if __name__ == "__main__":
+    sys.exit(main());
@@ -0,0 +1,125 @@
+"""TaskrClient speaks the JSON-lines protocol of the Taskr daemon.
+
+Requests and responses are JSON objects, one per line. A request is a command as understood by
+`TaskrCLI.execute_command`; the response is its result, with tasks in the JSON form of `TaskStream.encode_task`.
+This module only depends on the task primitives and their encoding, so `Taskr` can use it as a thin client without
+importing the daemon.
+"""
+
+from primitives.Task import ObsidianTask;
+from TaskStream import decode_task;
+import json;
+import os;
+import socket;
+
+DEFAULT_PRIORITY:int = 3;
+"""`DEFAULT_PRIORITY` is the priority of tasks added without one."""
+
+DEFAULT_SOCKET_FILE:str = "taskr.sock";
+"""`DEFAULT_SOCKET_FILE` is the name of the daemon socket in the Taskr directory."""
+
+DEFAULT_TIMEOUT:float = 5.0;
+
+def task_from_command(data:dict) -> ObsidianTask:
+    """Builds a task from the JSON form of a command, where only `name` is required.
+
+    Args:
+        data (dict):        The task, with the keys of `TaskStream.encode_task`; the others default to an open task of `DEFAULT_PRIORITY` with no due date and no tags.
+
+    Returns:
+        ObsidianTask:       The task.
+    """
+    return decode_task({
+        "name": data["name"],
+        "description": data.get("description", ""),
+        "priority": int(data.get("priority", DEFAULT_PRIORITY)),
+        "due_date": data.get("due_date"),
+        "completed": bool(data.get("completed", False)),
+        "tags": list(data.get("tags", []))
+    });
+
+class TaskrClient:
+    """A `TaskrClient` is a connection to a running Taskr daemon. Requests are answered in order."""
+    def __init__(self, path:str, timeout:float = DEFAULT_TIMEOUT) -> None:
+        """Connects to a daemon.
+
+        Args:
+            path (str):         The path of the daemon socket.
+            timeout (float):    The number of seconds to wait for a response.
+
+        Raises:
+            OSError:            If no daemon accepts connections at `path`.
+        """
+        self.path = path;
+        self.socket = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM);
+        try:
+            self.socket.settimeout(timeout);
+            self.socket.connect(path);
+        except OSError:
+            self.socket.close();
+            raise;
+        self.file = self.socket.makefile("rwb");
+
+    @staticmethod
+    def connect(path:str, timeout:float = DEFAULT_TIMEOUT) -> "TaskrClient | None":
+        """Connects to a daemon if one is running.
+
+        Args:
+            path (str):         The path of the daemon socket.
+            timeout (float):    The number of seconds to wait for a response.
+
+        Returns:
+            TaskrClient | None: The connection, or None if there is no daemon at `path`.
+        """
+        if(not hasattr(socket, "AF_UNIX") or not os.path.exists(path)):
+            return None;
+        try:
+            return TaskrClient(path, timeout);
+        except OSError:
+            return None;
+
+    def request(self, command:dict) -> dict:
+        """Sends a command and waits for its result.
+
+        Args:
+            command (dict):     The command.
+
+        Returns:
+            dict:               The result.
+
+        Raises:
+            ConnectionError:    If the daemon closed the connection, or it was closed after an earlier error.
+            OSError:            If the daemon could not be reached or did not answer in time.
+        """
+        if(self.file == None):
+            raise ConnectionError(f"Taskr daemon connection is closed: {self.path}");
+        try:
+            self.file.write(json.dumps(command, ensure_ascii=False).encode("utf-8") + b"\n");
+            self.file.flush();
+            line = self.file.readline();
+        except OSError:
+            #   A late response would be taken as the result of the next request, so the connection is not reused
+            self.close();
+            raise;
+        if(line == b""):
+            self.close();
+            raise ConnectionError(f"Taskr daemon closed the connection: {self.path}");
+        return json.loads(line);
+
+    def close(self) -> None:
+        if(self.file == None):
+            return;
+        file, self.file = (self.file, None);
+        try:
+            file.close();
+        except OSError:
+            #   Closing flushes what is left of a request the daemon can no longer read
+            pass;
+        finally:
+            self.socket.close();
+
+    def __enter__(self) -> "TaskrClient":
+        return self;
+
+    def __exit__(self, exc_type, exc_value, traceback) -> None:
+        self.close();
@@ -0,0 +1,223 @@
+"""TaskrDaemon keeps the tasks of a Taskr directory loaded and serves them over a Unix domain socket.
+
+Clients send JSON commands, one per line, and receive one JSON result per line, as with `TaskrCLI batch`. Reads are
+answered from the resident `TaskManager` without touching the disk. Mutations are serialized by a lock and persisted
+in the background every `flush_interval` seconds, and on shutdown: once it starts, mutations are refused and every
+client connection is closed before the final flush, so no accepted mutation is lost.
+
+The daemon must be the only writer of its Taskr directory while it runs: the CLI, and `Taskr` objects given its
+`socket_path`, detect the socket and send their commands to it.
+
+Usage:
+    python TaskrDaemon.py --directory .taskr
+"""
+
+from Taskr import Taskr, TaskrStatus;
+from TaskStorage import JSONTaskStorage;
+from TaskrCLI import execute_command;
+from TaskrClient import DEFAULT_SOCKET_FILE;
+import argparse;
+import asyncio;
+import json;
+import logging;
+import os;
+import signal;
+import socket;
+import sys;
+
+DEFAULT_FLUSH_INTERVAL:float = 1.0;
+"""`DEFAULT_FLUSH_INTERVAL` is the number of seconds between background flushes of pending mutations."""
+
+MUTATIONS:tuple = ("add", "remove", "complete", "uncomplete");
+"""`MUTATIONS` are the commands that must wait for the mutation lock."""
+
+class TaskrDaemon:
+    """A `TaskrDaemon` serves one `TaskrSession` to many clients.
+
+    Commands run on the event loop one at a time, so reads always see a consistent `TaskManager`. Flushes run in a
+    worker thread while holding the mutation lock: reads are still answered during a flush, mutations wait for it.
+    `writers` holds the connection of every client, to close them on shutdown.
+    """
+    def __init__(self, taskr:Taskr, socket_path:str, flush_interval:float = DEFAULT_FLUSH_INTERVAL) -> None:
+        """Creates a new TaskrDaemon.
+
+        Args:
+            taskr (Taskr):          The Taskr object whose storage is served.
+            socket_path (str):      The path of the Unix domain socket to listen on.
+            flush_interval (float): The number of seconds between background flushes.
+        """
+        self.taskr = taskr;
+        self.socket_path = socket_path;
+        self.flush_interval = flush_interval;
+        self.session = taskr.session();
+        self.lock = None;
+        self.stopped = None;
+        self.writers = set();
+
+    async def handle(self, reader:asyncio.StreamReader, writer:asyncio.StreamWriter) -> None:
+        """Answers the commands of a client until it disconnects or the daemon shuts down."""
+        self.writers.add(writer);
+        try:
+            while not self.stopped.is_set():
+                line = await self.read_line(reader);
+                if(line == b""):
+                    break;
+                if(line == None):
+                    result = {"ok": False, "status": TaskrStatus.FAILURE.name, "error": "Invalid command line: longer than the stream limit"};
+                elif(line.strip() == b""):
+                    continue;
+                else:
+                    result = await self.execute(line);
+                writer.write(json.dumps(result, ensure_ascii=False).encode("utf-8") + b"\n");
+                await writer.drain();
+        except (ConnectionError, asyncio.IncompleteReadError):
+            pass;
+        finally:
+            self.writers.discard(writer);
+            writer.close();
+
+    async def read_line(self, reader:asyncio.StreamReader) -> bytes | None:
+        """Reads the next command line of a client.
+
+        Args:
+            reader (asyncio.StreamReader):  The stream of the client.
+
+        Returns:
+            bytes | None:       The line, an empty string at the end of the stream, or None if the line was longer than
+                                the limit of the stream, in which case it is skipped up to its line break.
+        """
+        try:
+            return await reader.readuntil(b"\n");
+        except asyncio.IncompleteReadError as e:
+            return e.partial;
+        except asyncio.LimitOverrunError as e:
+            consumed = e.consumed;
+        #   Drop the line in pieces no longer than the limit, so the next command starts where it should
+        while True:
+            try:
+                await reader.readexactly(consumed);
+                await reader.readuntil(b"\n");
+                return None;
+            except asyncio.LimitOverrunError as e:
+                consumed = e.consumed;
+            except asyncio.IncompleteReadError:
+                return None;
+
+    async def execute(self, line:bytes) -> dict:
+        """Executes a command line.
+
+        Args:
+            line (bytes):       The command, a JSON object.
+
+        Returns:
+            dict:               The result of the command.
+        """
+        try:
+            command = json.loads(line);
+            if(not isinstance(command, dict)):
+                raise ValueError("A command must be a JSON object");
+        except ValueError as e:
+            return {"ok": False, "error": f"Invalid command line: {e}"};
+        op = command.get("op");
+        if(op == "ping"):
+            return {"ok": True, "pending": len(self.session.pending)};
+        if(op == "shutdown"):
+            self.stopped.set();
+            return {"ok": True};
+        if(op == "flush"):
+            status = await self.flush();
+            return {"ok": status == TaskrStatus.SUCCESS, "status": status.name};
+        if(op in MUTATIONS):
+            async with self.lock:
+                #   A mutation that waited for the final flush would never be persisted
+                if(self.stopped.is_set()):
+                    return {"ok": False, "status": TaskrStatus.FAILURE.name, "error": "Taskr daemon is shutting down"};
+                return execute_command(self.session, command);
+        return execute_command(self.session, command);
+
+    async def flush(self) -> TaskrStatus:
+        """Persists the pending mutations in a worker thread, holding the mutation lock."""
+        async with self.lock:
+            if(len(self.session.pending) == 0):
+                return TaskrStatus.SUCCESS;
+            return await asyncio.to_thread(self.session.flush);
+
+    async def flush_periodically(self) -> None:
+        while not self.stopped.is_set():
+            try:
+                await asyncio.wait_for(self.stopped.wait(), self.flush_interval);
+            except asyncio.TimeoutError:
+                if(await self.flush() != TaskrStatus.SUCCESS):
+                    logging.error("Error flushing Taskr daemon, will retry");
+
+    def __claim_socket(self) -> None:
+        """Removes a socket left behind by a daemon that is not running anymore.
+
+        Raises:
+            RuntimeError:       If a daemon is already listening on the socket.
+        """
+        if(not os.path.exists(self.socket_path)):
+            return;
+        probe = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM);
+        try:
+            probe.connect(self.socket_path);
+        except OSError:
+            os.unlink(self.socket_path);
+            return;
+        finally:
+            probe.close();
+        raise RuntimeError(f"A Taskr daemon is already running: {self.socket_path}");
+
+    async def serve(self) -> None:
+        """Loads the tasks and serves them until a client sends `shutdown` or the process is interrupted."""
+        self.lock = asyncio.Lock();
+        self.stopped = asyncio.Event();
+        await asyncio.to_thread(self.session.open);
+        self.__claim_socket();
+        server = await asyncio.start_unix_server(self.handle, path=self.socket_path);
+        loop = asyncio.get_running_loop();
+        for signum in (signal.SIGINT, signal.SIGTERM):
+            try:
+                loop.add_signal_handler(signum, self.stopped.set);
+            except (NotImplementedError, RuntimeError):
+                pass;
+        flusher = asyncio.create_task(self.flush_periodically());
+        try:
+            await self.stopped.wait();
+        finally:
+            self.stopped.set();
+            #   Refuse new clients, then close the connected ones, idle or not, so no command is accepted after the final flush
+            server.close();
+            if(os.path.exists(self.socket_path)):
+                os.unlink(self.socket_path);
+            writers = list(self.writers);
+            for writer in writers:
+                writer.close();
+            await asyncio.gather(*(writer.wait_closed() for writer in writers), return_exceptions=True);
+            await server.wait_closed();
+            await flusher;
+            if(await self.flush() != TaskrStatus.SUCCESS):
+                logging.error("Error flushing Taskr daemon on shutdown");
+
+    def run(self) -> None:
+        asyncio.run(self.serve());
+
+def main(argv:list[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(description="Serves the tasks of a Taskr directory over a Unix domain socket.");
+    parser.add_argument("--directory", default=Taskr.DEFAULT_TASKR_DIRECTORY, help="the Taskr directory");
+    parser.add_argument("--socket", help="the socket path, by default in the Taskr directory");
+    parser.add_argument("--journal", action="store_true", help="append mutations to the journal instead of rewriting the task file");
+    parser.add_argument("--flush-interval", type=float, default=DEFAULT_FLUSH_INTERVAL, help="seconds between background flushes");
+    args = parser.parse_args(argv);
+    storage = JSONTaskStorage(args.directory, Taskr.DEFAULT_TASKR_TASKFILE, Taskr.DEFAULT_TASKR_JOURNALFILE, args.journal);
+    storage.prepare();
+    socket_path = args.socket or os.path.join(args.directory, DEFAULT_SOCKET_FILE);
+    try:
+        TaskrDaemon(Taskr(storage=storage), socket_path, args.flush_interval).run();
+    except RuntimeError as e:
+        logging.error(f"{e}");
+        return 1;
+    return 0;
+
+if __name__ == "__main__":
+    sys.exit(main());
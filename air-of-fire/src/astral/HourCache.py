@@ -0,0 +1,183 @@
+"""The `HourCache` module caches the sunrise, sunset and planetary hours of locations by day.
+
+Locations are keyed by their coordinates rounded to `precision` decimal places (two places are about a kilometer,
+which moves sunrise by a few seconds) and their timezone, and the values are computed for the rounded coordinates, so
+every location sharing a key gets the same hours. The most recently used days are kept in memory; with a `path`, the
+solar times of every computed day are also kept in a SQLite file, so a restarted process does not compute them again.
+
+Hours are on the wall clock of the location, as those of `getPlanetaryHours`, `planetary_hour_at` and `HourTable`.
+
+@author nrosenthal
+@version 1.0
+@since 2024-10-30
+"""
+
+from collections import OrderedDict;
+from datetime import date, datetime, timedelta;
+from types import SimpleNamespace;
+from Planets import PlanetaryHour, PlanetaryHours, getPlanetaryHoursTable, planetary_hour_at;
+from Solar import OFFICIAL_ZENITH, sunrise_sunset, zone_of;
+import sqlite3;
+import threading;
+
+
+#   Useful constants
+DEFAULT_MAXSIZE:int     = 1024;
+"""`DEFAULT_MAXSIZE` is the default number of days kept in memory."""
+
+DEFAULT_PRECISION:int   = 2;
+"""`DEFAULT_PRECISION` is the default number of decimal places of the coordinates of a key."""
+
+SCHEMA:str = "CREATE TABLE IF NOT EXISTS solar (key TEXT PRIMARY KEY, sunrise TEXT NOT NULL, sunset TEXT NOT NULL, next_sunrise TEXT NOT NULL)";
+
+
+class HourCache:
+    """A `HourCache` keeps the solar times and the planetary hours of (location, day) pairs, evicting the least recently used.
+
+    Each day costs two sunrise computations, for the day and the next one, which are cached as a whole; its planetary
+    hours are only built the first time they are asked for. The cache is safe to share between threads.
+
+    @author nrosenthal
+    @version 1.0
+    @since 2024-10-30
+    """
+    __slots__ = ['maxsize', 'precision', 'zenith', 'entries', 'hits', 'misses', 'disk_hits', 'connection', 'lock'];
+
+    def __init__(self, maxsize:int = DEFAULT_MAXSIZE, precision:int = DEFAULT_PRECISION, path:str | None = None, zenith:float = OFFICIAL_ZENITH):
+        """Initializes a `HourCache`.
+
+        @param maxsize: The number of days kept in memory.
+        @param precision: The number of decimal places the coordinates of a location are rounded to.
+        @param path: The path of the SQLite file of the persistent tier, or None to only cache in memory.
+        @param zenith: The zenith angle of the Sun at sunrise and sunset, in degrees.
+        """
+        if(maxsize < 1):
+            raise ValueError("The cache must hold at least one day");
+        self.maxsize = maxsize;
+        self.precision = precision;
+        self.zenith = zenith;
+        self.entries = OrderedDict();
+        self.hits = 0;
+        self.misses = 0;
+        self.disk_hits = 0;
+        self.lock = threading.Lock();
+        self.connection = None;
+        if(path != None):
+            self.connection = sqlite3.connect(path, check_same_thread=False);
+            self.connection.execute(SCHEMA);
+            self.connection.commit();
+
+    def __len__(self) -> int:
+        """Returns the number of days kept in memory."""
+        return len(self.entries);
+
+    def __enter__(self) -> "HourCache":
+        return self;
+
+    def __exit__(self, exc_type, exc_value, traceback) -> None:
+        self.close();
+
+    def close(self) -> None:
+        """Closes the persistent tier, if any. The memory tier keeps working."""
+        with self.lock:
+            if(self.connection != None):
+                self.connection.close();
+                self.connection = None;
+
+    def key(self, location, day:date) -> str:
+        """Returns the key of a location and a local date, e.g. `-23.55,-46.63,America/Sao_Paulo,2024-10-30`."""
+        return f"{round(location.latitude, self.precision):.{self.precision}f},{round(location.longitude, self.precision):.{self.precision}f},{zone_of(location)},{day.isoformat()}";
+
+    def stats(self) -> dict:
+        """Returns the counters of the cache: `hits` in memory, `disk_hits` in the persistent tier, and `misses` computed."""
+        return {"hits": self.hits, "disk_hits": self.disk_hits, "misses": self.misses, "size": len(self.entries), "maxsize": self.maxsize};
+
+    def clear(self) -> None:
+        """Empties the memory tier and resets the counters. The persistent tier is kept."""
+        with self.lock:
+            self.entries.clear();
+            self.hits = 0;
+            self.misses = 0;
+            self.disk_hits = 0;
+
+    def __compute(self, location, day:date) -> tuple[datetime, datetime, datetime]:
+        rounded = SimpleNamespace(latitude=round(location.latitude, self.precision), longitude=round(location.longitude, self.precision), timezone=zone_of(location));
+        sunrise, sunset = sunrise_sunset(rounded, day, self.zenith);
+        return (sunrise, sunset, sunrise_sunset(rounded, day + timedelta(days=1), self.zenith)[0]);
+
+    def __load(self, key:str, location) -> tuple[datetime, datetime, datetime] | None:
+        if(self.connection == None):
+            return None;
+        row = self.connection.execute("SELECT sunrise, sunset, next_sunrise FROM solar WHERE key = ?", (key,)).fetchone();
+        if(row == None):
+            return None;
+        zone = zone_of(location);
+        return tuple(datetime.fromisoformat(value).astimezone(zone) for value in row);
+
+    def __store(self, key:str, times:tuple[datetime, datetime, datetime]) -> None:
+        if(self.connection == None):
+            return;
+        self.connection.execute("INSERT OR REPLACE INTO solar VALUES (?, ?, ?, ?)", (key, *(value.isoformat() for value in times)));
+        self.connection.commit();
+
+    def __entry(self, location, day:date) -> list:
+        """Returns the entry of a location and a day, `[times, hours]`, computing it if needed. Called holding the lock."""
+        key = self.key(location, day);
+        entry = self.entries.get(key);
+        if(entry != None):
+            self.hits += 1;
+            self.entries.move_to_end(key);
+            return entry;
+        times = self.__load(key, location);
+        if(times != None):
+            self.disk_hits += 1;
+        else:
+            self.misses += 1;
+            times = self.__compute(location, day);
+            self.__store(key, times);
+        entry = [times, None];
+        self.entries[key] = entry;
+        if(len(self.entries) > self.maxsize):
+            self.entries.popitem(last=False);
+        return entry;
+
+    def sunrise_sunset(self, location, day:date) -> tuple[datetime, datetime]:
+        """Returns the sunrise and the sunset of a location on a local date, as `Solar.sunrise_sunset` does.
+
+        Raises:
+            SolarError: If the Sun does not rise or does not set on that day or the next.
+        """
+        with self.lock:
+            times = self.__entry(location, day)[0];
+        return (times[0], times[1]);
+
+    def planetary_hours(self, location, day:date) -> PlanetaryHours:
+        """Returns the planetary hours of a location on a local date, from its sunrise to the sunrise of the next day.
+
+        The same `PlanetaryHours` object is returned while the day is cached, so it must not be modified.
+
+        Raises:
+            SolarError: If the Sun does not rise or does not set on that day or the next.
+        """
+        with self.lock:
+            entry = self.__entry(location, day);
+            if(entry[1] == None):
+                sunrise, sunset, next_sunrise = entry[0];
+                entry[1] = getPlanetaryHoursTable([sunrise], [sunset], [next_sunrise]).day(0);
+            return entry[1];
+
+    def planetary_hour_at(self, location, instant:datetime) -> PlanetaryHour:
+        """Returns the planetary hour of a location at an instant, from the cached solar times of its day.
+
+        The hours before the sunrise of a local date belong to the night of the day before.
+
+        Raises:
+            SolarError: If the Sun does not rise or does not set on the days around the instant.
+        """
+        zone = zone_of(location);
+        local = instant.astimezone(zone) if(instant.tzinfo != None) else instant.replace(tzinfo=zone);
+        with self.lock:
+            times = self.__entry(location, local.date())[0];
+            if(local < times[0]):
+                times = self.__entry(location, local.date() - timedelta(days=1))[0];
+        return planetary_hour_at(times[0], times[1], times[2], local);
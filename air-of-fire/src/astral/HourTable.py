@@ -0,0 +1,299 @@
+"""The `HourTable` module precomputes the planetary hours of cities over a date range into a binary file, and reads it through a memory map.
+
+Layout, little-endian:
+
+    header      magic, version, city count, day count, first day, and the offsets of the sections
+    starts      the start of every hour, as signed 64-bit wall-clock microseconds since 1970-01-01 in the city's timezone
+    ends        the end of every hour, in the same unit
+    planets     the `Planets` value of every hour, one byte each
+    cities      the cities as a UTF-8 JSON list, each with the first row of its hours and the number of rows
+
+The hours of a city are contiguous rows ordered by time, so the hour of a city at a time is found with a binary search
+over the memory-mapped `starts` column, without reading or building any of the other hours.
+
+Times are on the wall clock of each city, counted from `Planets.LOCAL_EPOCH`, as `getPlanetaryHours`,
+`planetary_hour_at` and `HourCache` count them, and the solar times are those of `Solar.sunrise_sunset`, so the table
+gives the same hour as they do for every instant. On the nights the UTC offset changes, the hours follow the clock:
+the night of a change to summer time is an hour shorter than the Sun would have it, and the repeated hour of a change
+back to standard time falls in the same planetary hour twice.
+
+Usage:
+    python HourTable.py cities.json hours.bin --first 2025-01-01 --last 2025-12-31
+
+@author nrosenthal
+@version 1.0
+@since 2024-10-30
+"""
+
+from array import array;
+from bisect import bisect_right;
+from datetime import date, datetime, timedelta;
+from types import SimpleNamespace;
+from typing import Iterable;
+from Planets import PLANETS_BY_CODE, Planets, PlanetaryHour, from_microseconds, getPlanetaryHoursTable, to_microseconds;
+from Solar import sunrise_sunset, zone_of;
+import argparse;
+import json;
+import mmap;
+import os;
+import struct;
+import sys;
+
+
+#   Useful constants
+MAGIC:bytes = b"PHRT";
+
+VERSION:int = 2;
+"""`VERSION` is the version of the table layout. Readers reject tables of any other version."""
+
+HEADER = struct.Struct("<4sHxxIIIxxxxQQQQ");
+"""`HEADER` packs the magic, version, city and day counts, the first day as an ordinal, and the offsets of the starts, ends, planets and cities sections."""
+
+
+#   Error handling
+class HourTableError(Exception):
+    """`HourTableError` is raised when a file is not an hour table of a supported version.
+
+    @author nrosenthal
+    @version 1.0
+    @since 2024-10-30
+    """
+    def __init__(self, message:str):
+        super().__init__(message);
+        self.message = message;
+
+    def __str__(self):
+        return self.message;
+
+    def __repr__(self):
+        return self.message;
+
+
+#   Writing
+def city_to_dict(city) -> dict:
+    """Returns the JSON form of a `CityData`, with the coordinates and the timezone of its location."""
+    if(city.location == None):
+        raise ValueError(f"City without a location: {city.city}");
+    zone = getattr(city.location, "timezone", None);
+    return {
+        "city": city.city,
+        "region": city.region,
+        "country": city.country,
+        "latitude": city.location.latitude,
+        "longitude": city.location.longitude,
+        "timezone": None if(zone == None) else str(zone)
+    };
+
+def write_hour_table(path:str, cities:Iterable, first:date, last:date) -> int:
+    """Computes the planetary hours of cities on every day from `first` to `last`, and atomically writes them to a table.
+
+    The hours are computed on the wall clock of each city, from the solar times of `Solar.sunrise_sunset`.
+
+    Args:
+        path (str): The path of the table.
+        cities (Iterable): The cities, `CityData` objects whose `location` has `latitude`, `longitude` and `timezone`.
+        first (date): The first local date.
+        last (date): The last local date.
+
+    Returns:
+        int: The number of hours written.
+
+    Raises:
+        SolarError: If the Sun does not rise or does not set on one of the days in one of the cities.
+    """
+    days = (last - first).days + 1;
+    starts = array("q");
+    ends = array("q");
+    planets = array("B");
+    entries = [];
+    for city in cities:
+        entry = city_to_dict(city);
+        zone = zone_of(SimpleNamespace(timezone=entry["timezone"]));
+        location = SimpleNamespace(latitude=entry["latitude"], longitude=entry["longitude"], timezone=zone);
+        #   The sunrise of the day after `last` ends its night
+        solar = [sunrise_sunset(location, first + timedelta(days=i)) for i in range(days + 1)];
+        sunrises = [sunrise for sunrise, sunset in solar];
+        table = getPlanetaryHoursTable(sunrises[:-1], [sunset for sunrise, sunset in solar[:-1]], sunrises[1:]);
+        entry["first_row"] = len(planets);
+        entry["rows"] = len(table.planets);
+        starts.extend(table.starts);
+        ends.extend(table.ends);
+        planets.extend(table.planets);
+        entries.append(entry);
+    if(sys.byteorder != "little"):
+        starts.byteswap();
+        ends.byteswap();
+    cities_data = json.dumps(entries, ensure_ascii=False).encode("utf-8");
+    starts_offset = HEADER.size;
+    ends_offset = starts_offset + len(starts) * 8;
+    planets_offset = ends_offset + len(ends) * 8;
+    cities_offset = planets_offset + len(planets);
+    header = HEADER.pack(MAGIC, VERSION, len(entries), days, first.toordinal(), starts_offset, ends_offset, planets_offset, cities_offset);
+    temporary = path + ".tmp";
+    try:
+        with open(temporary, "wb") as f:
+            f.write(header);
+            f.write(starts.tobytes());
+            f.write(ends.tobytes());
+            f.write(planets.tobytes());
+            f.write(cities_data);
+            f.flush();
+            os.fsync(f.fileno());
+        os.replace(temporary, path);
+    except BaseException:
+        #   A failed write leaves the previous table, and no temporary file, behind
+        if(os.path.exists(temporary)):
+            os.unlink(temporary);
+        raise;
+    return len(planets);
+
+
+#   Reading
+class HourTable:
+    """A `HourTable` reads a table written by `write_hour_table` through a memory map.
+
+    Opening a table only reads its header and its cities; `planet_at` and `hour_at` cost a binary search over the hours
+    of a city, and only `hour_at` builds an object.
+
+    @author nrosenthal
+    @version 1.0
+    @since 2024-10-30
+    """
+    __slots__ = ['path', 'file', 'map', 'starts', 'ends', 'planets', 'cities', 'zones', 'days', 'first'];
+
+    def __init__(self, path:str):
+        """Opens a `HourTable`.
+
+        @param path: The path of the table.
+
+        @raise HourTableError: If the file is not an hour table of a supported version.
+        """
+        self.path = path;
+        self.file = open(path, "rb");
+        try:
+            self.map = mmap.mmap(self.file.fileno(), 0, access=mmap.ACCESS_READ);
+        except ValueError:
+            self.file.close();
+            raise HourTableError(f"Not an hour table: {path}");
+        if(len(self.map) < HEADER.size):
+            self.close();
+            raise HourTableError(f"Not an hour table: {path}");
+        magic, version, city_count, self.days, first, starts_offset, ends_offset, planets_offset, cities_offset = HEADER.unpack_from(self.map, 0);
+        if(magic != MAGIC or version != VERSION):
+            self.close();
+            raise HourTableError(f"Not an hour table of version {VERSION}: {path}");
+        self.first = date.fromordinal(first);
+        view = memoryview(self.map);
+        if(sys.byteorder == "little"):
+            self.starts = view[starts_offset:ends_offset].cast("q");
+            self.ends = view[ends_offset:planets_offset].cast("q");
+        else:
+            #   The columns are little-endian, so they are copied into arrays of native integers
+            self.starts = array("q");
+            self.starts.frombytes(view[starts_offset:ends_offset]);
+            self.starts.byteswap();
+            self.ends = array("q");
+            self.ends.frombytes(view[ends_offset:planets_offset]);
+            self.ends.byteswap();
+        self.planets = view[planets_offset:cities_offset];
+        self.cities = json.loads(bytes(view[cities_offset:]).decode("utf-8"));
+        self.zones = [zone_of(SimpleNamespace(timezone=city["timezone"])) for city in self.cities];
+        view.release();
+
+    def __enter__(self) -> "HourTable":
+        return self;
+
+    def __exit__(self, exc_type, exc_value, traceback) -> None:
+        self.close();
+
+    def close(self) -> None:
+        """Closes the table. Views of the columns must not be used afterwards."""
+        for column in ("starts", "ends", "planets"):
+            view = getattr(self, column, None);
+            if(isinstance(view, memoryview)):
+                view.release();
+        if(getattr(self, "map", None) != None):
+            self.map.close();
+        self.file.close();
+
+    def __len__(self) -> int:
+        """Returns the number of cities of the table."""
+        return len(self.cities);
+
+    def index(self, city) -> int:
+        """Returns the index of a city in the table.
+
+        @param city: The name of the city, or a `CityData`, which must also match in region and country.
+
+        @return: The index of the city.
+        @raise KeyError: If the city is not in the table.
+        """
+        for i, entry in enumerate(self.cities):
+            if(isinstance(city, str)):
+                if(entry["city"] == city):
+                    return i;
+            elif((entry["city"], entry["region"], entry["country"]) == (city.city, city.region, city.country)):
+                return i;
+        raise KeyError(f"City not in the hour table: {city}");
+
+    def row_at(self, city:int, wall:int) -> int:
+        """Returns the row of the hour of a city at a time, or -1 if the time is outside the range of the table.
+
+        The end of an hour can be a few microseconds before the start of the next one, as hours are rounded to the
+        microsecond; such times belong to the earlier hour.
+
+        @param city: The index of the city.
+        @param wall: The time, in wall-clock microseconds of the city since `LOCAL_EPOCH`.
+        """
+        entry = self.cities[city];
+        low = entry["first_row"];
+        high = low + entry["rows"];
+        row = bisect_right(self.starts, wall, low, high) - 1;
+        if(row < low or (row == high - 1 and wall >= self.ends[row])):
+            return -1;
+        return row;
+
+    def wall_clock(self, city:int, moment:datetime) -> int:
+        """Returns a time in wall-clock microseconds of a city. Naive times are taken as wall-clock times of the city."""
+        if(moment.tzinfo != None):
+            moment = moment.astimezone(self.zones[city]);
+        return to_microseconds(moment);
+
+    def planet_at(self, city:int, moment:datetime) -> Planets | None:
+        """Returns the planet ruling the hour of a city at a time, or None if it is outside the range of the table."""
+        row = self.row_at(city, self.wall_clock(city, moment));
+        return None if(row < 0) else PLANETS_BY_CODE[self.planets[row]];
+
+    def hour_at(self, city:int, moment:datetime) -> PlanetaryHour | None:
+        """Returns the planetary hour of a city at a time, in its timezone, or None if it is outside the range of the table.
+
+        The hour is equal to the one `HourCache.planetary_hour_at` and `Planets.planetary_hour_at` give.
+        """
+        row = self.row_at(city, self.wall_clock(city, moment));
+        if(row < 0):
+            return None;
+        zone = self.zones[city];
+        return PlanetaryHour.trusted(PLANETS_BY_CODE[self.planets[row]], from_microseconds(self.starts[row], zone), from_microseconds(self.ends[row], zone));
+
+
+def read_cities(path:str) -> list:
+    """Reads cities from a JSON list of objects with `city`, `region`, `country`, `latitude`, `longitude` and `timezone`."""
+    with open(path, encoding="utf-8") as f:
+        data = json.load(f);
+    return [SimpleNamespace(city=entry["city"], region=entry.get("region", ""), country=entry.get("country", ""),
+                            location=SimpleNamespace(latitude=float(entry["latitude"]), longitude=float(entry["longitude"]), timezone=entry.get("timezone")))
+            for entry in data];
+
+def main(argv:list[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(description="Precomputes the planetary hours of cities into an hour table.");
+    parser.add_argument("cities", help="a JSON list of cities with city, region, country, latitude, longitude and timezone");
+    parser.add_argument("output", help="the path of the hour table");
+    parser.add_argument("--first", type=date.fromisoformat, required=True, help="the first day, YYYY-MM-DD");
+    parser.add_argument("--last", type=date.fromisoformat, required=True, help="the last day, YYYY-MM-DD");
+    args = parser.parse_args(argv);
+    count = write_hour_table(args.output, read_cities(args.cities), args.first, args.last);
+    print(f"{count} hours written to {args.output}");
+    return 0;
+
+if __name__ == "__main__":
+    sys.exit(main());
@@ -194,7 +194,10 @@ def planet_to_en(planet_name: str) -> str:
 
 #   Planetary hours
 from Timing import Timing, Duration, HOUR_LENGTH, TimingError;
-from datetime import datetime, timedelta;
+from array import array;
+from datetime import date, datetime, timedelta, tzinfo;
+from collections.abc import Sequence;
+from typing import Callable, Iterator;
 
 class PlanetaryHour(Duration):
     """A `PlanetaryHour` is a subclass of `Duration` that represents a time interval in planetary hours.
@@ -206,11 +209,31 @@ class PlanetaryHour(Duration):
     @version 1.0
     @since 2024-10-29
     """
+    __slots__ = ['planet'];
+    
     def __init__(self, planet:Planets, start:datetime, end:datetime):
-        self._chk(start, end);
+        #   `Timing.__init__` runs the `_chk` of this class
         super().__init__(start, end);
         self.planet = planet;
     
+    @classmethod
+    def trusted(cls, planet:Planets, start:datetime, end:datetime) -> "PlanetaryHour":
+        """Creates a `PlanetaryHour` without checking its times, for hours already known to be valid, such as those computed by this module.
+        
+        Args:
+            planet (Planets): The planet ruling the hour.
+            start (datetime): The start time of the hour.
+            end (datetime): The end time of the hour.
+        
+        Returns:
+            PlanetaryHour: The planetary hour.
+        """
+        hour = cls.__new__(cls);
+        hour.planet = planet;
+        hour.start = start;
+        hour.end = end;
+        return hour;
+    
     def _chk(self, start:datetime, end:datetime):
         super()._chk(start, end);
         duration = end - start;
@@ -316,16 +339,287 @@ def getPlanetaryHours(sunrise: datetime, sunset: datetime) -> PlanetaryHours:
         planetary_hours.append(PlanetaryHour(Planets.from_index(planet_index), start, end));
         planet_index += 1;
         if planet_index == 7:
-            planet_index = 1;
+            planet_index = 0;
     for i in range(12):
         start = sunset + (night_hour_length * i);
         end = start + night_hour_length;
         planetary_hours.append(PlanetaryHour(Planets.from_index(planet_index), start, end));
         planet_index += 1;
         if planet_index == 7:
-            planet_index = 1;
+            planet_index = 0;
     return PlanetaryHours(*planetary_hours);
 
+
+#   Batch planetary hours
+LOCAL_EPOCH:datetime = datetime(1970, 1, 1);
+"""`LOCAL_EPOCH` is the origin of the times of a `PlanetaryHoursTable`: they count wall-clock microseconds, so they match the `datetime` arithmetic of `getPlanetaryHours`."""
+
+DAY_MICROSECONDS:int = 86400 * 1000000;
+MAX_HOUR_MICROSECONDS:int = int(HOUR_LENGTH * 2) * 1000000;
+HOURS_PER_DAY:int = 24;
+
+PLANETS_BY_CODE:tuple[Planets, ...] = tuple(sorted(Planets, key=lambda planet: planet.value));
+"""`PLANETS_BY_CODE` maps the code of a planet in a `PlanetaryHoursTable`, its `Planets` value, back to the planet."""
+
+PLANET_SEQUENCES:tuple[bytes, ...] = tuple(bytes((ruler + k) % 7 for k in range(HOURS_PER_DAY)) for ruler in range(7));
+"""`PLANET_SEQUENCES` holds, for the ruler of each day, the planet codes of its 24 hours in the Chaldean Order."""
+
+WEEKDAY_RULERS:tuple[int, ...] = tuple(WEEKDAY_TO_PLANET[weekday].value for weekday in range(7));
+
+def to_microseconds(moment:datetime) -> int:
+    """Returns the wall-clock microseconds of a time since `LOCAL_EPOCH`, ignoring its time zone."""
+    delta = moment.replace(tzinfo=None) - LOCAL_EPOCH;
+    return (delta.days * 86400 + delta.seconds) * 1000000 + delta.microseconds;
+
+def from_microseconds(microseconds:int, zone:tzinfo | None = None) -> datetime:
+    """Returns the time `microseconds` after `LOCAL_EPOCH`, in the time zone `zone`. The inverse of `to_microseconds`."""
+    return (LOCAL_EPOCH + timedelta(microseconds=microseconds)).replace(tzinfo=zone);
+
+def divide_hours(length:int) -> int:
+    """Divides a length of daylight or night in microseconds into 12 hours, rounding half to even as `timedelta / 12` does."""
+    hour, remainder = divmod(length, 12);
+    if(remainder * 2 > 12 or (remainder * 2 == 12 and hour % 2 == 1)):
+        hour += 1;
+    return hour;
+
+class PlanetaryHoursTable:
+    """A `PlanetaryHoursTable` holds the planetary hours of many days in columns rather than in `PlanetaryHour` objects.
+
+    The hours of day `i` are the rows `24 * i` to `24 * i + 23`: `starts` and `ends` are signed 64-bit arrays of
+    microseconds since `LOCAL_EPOCH`, in the time zone `tzinfo`, and `planets` is an array of bytes holding the
+    `Planets` value of each hour. `day` builds the `PlanetaryHours` of a single day only when it is asked for.
+
+    The columns are stdlib arrays rather than NumPy arrays, which this project does not depend on, and the times count
+    the wall clock rather than UTC, so that every day has the same hours as `getPlanetaryHours` gives it, even when its
+    UTC offset changes.
+
+    @author nrosenthal
+    @version 1.0
+    @since 2024-10-29
+    """
+    __slots__ = ['starts', 'ends', 'planets', 'tzinfo', 'epoch'];
+
+    def __init__(self, starts:array, ends:array, planets:array, tzinfo:tzinfo | None = None):
+        """Initializes a `PlanetaryHoursTable` with the given columns.
+
+        @param starts: The start times of the hours, an `array("q")` of microseconds since `LOCAL_EPOCH`.
+        @param ends: The end times of the hours, an `array("q")` of microseconds since `LOCAL_EPOCH`.
+        @param planets: The planets of the hours, an `array("B")` of `Planets` values.
+        @param tzinfo: The time zone of the times, or None for naive times.
+        """
+        self.starts = starts;
+        self.ends = ends;
+        self.planets = planets;
+        self.tzinfo = tzinfo;
+        #   Adding to an aware time keeps its time zone, so building a time costs a single addition
+        self.epoch = LOCAL_EPOCH.replace(tzinfo=tzinfo);
+
+    def __len__(self) -> int:
+        """Returns the number of days of the table."""
+        return len(self.planets) // HOURS_PER_DAY;
+
+    def hour(self, row:int) -> PlanetaryHour:
+        """Returns the `PlanetaryHour` of a row of the table."""
+        return PlanetaryHour.trusted(PLANETS_BY_CODE[self.planets[row]], self.epoch + timedelta(microseconds=self.starts[row]), self.epoch + timedelta(microseconds=self.ends[row]));
+
+    def view(self, index:int) -> "PlanetaryHoursView":
+        """Returns a view of the hours of the day at the given index, which builds them only when they are accessed."""
+        if(index < 0):
+            index += len(self);
+        if(index < 0 or index >= len(self)):
+            raise IndexError(f"Invalid day: {index}");
+        return PlanetaryHoursView(self, index * HOURS_PER_DAY);
+
+    def day(self, index:int) -> PlanetaryHours:
+        """Returns the `PlanetaryHours` of the day at the given index, as `getPlanetaryHours` would."""
+        return self.view(index).materialize();
+
+    def __getitem__(self, index:int) -> "PlanetaryHoursView":
+        return self.view(index);
+
+    def __iter__(self) -> Iterator["PlanetaryHoursView"]:
+        for index in range(len(self)):
+            yield self.view(index);
+
+class PlanetaryHoursView(Sequence):
+    """A `PlanetaryHoursView` is a read-only sequence of the 24 hours of one day of a `PlanetaryHoursTable`.
+
+    It holds no `PlanetaryHour` objects: each one is built from the columns of the table when it is accessed. It
+    formats like a `PlanetaryHours`, and `materialize` turns it into one.
+
+    @author nrosenthal
+    @version 1.0
+    @since 2024-10-30
+    """
+    __slots__ = ['table', 'first'];
+
+    def __init__(self, table:PlanetaryHoursTable, first:int):
+        """Initializes a `PlanetaryHoursView` of the 24 rows of `table` starting at `first`.
+
+        @param table: The table holding the hours.
+        @param first: The row of the first hour of the day.
+        """
+        self.table = table;
+        self.first = first;
+
+    def __len__(self) -> int:
+        return HOURS_PER_DAY;
+
+    def __getitem__(self, index:int | slice) -> PlanetaryHour | PlanetaryHours:
+        if(isinstance(index, slice)):
+            return PlanetaryHours(*(self.table.hour(self.first + i) for i in range(*index.indices(HOURS_PER_DAY))));
+        if(index < 0):
+            index += HOURS_PER_DAY;
+        if(index < 0 or index >= HOURS_PER_DAY):
+            raise IndexError(f"Invalid hour: {index}");
+        return self.table.hour(self.first + index);
+
+    def planet(self, index:int) -> Planets:
+        """Returns the planet ruling an hour of the day, without building the hour."""
+        if(index < 0 or index >= HOURS_PER_DAY):
+            raise IndexError(f"Invalid hour: {index}");
+        return PLANETS_BY_CODE[self.table.planets[self.first + index]];
+
+    def materialize(self) -> PlanetaryHours:
+        """Returns the hours of the day as a `PlanetaryHours`."""
+        return self[:];
+
+    __str__ = PlanetaryHours.__str__;
+    __repr__ = PlanetaryHours.__repr__;
+    csv = PlanetaryHours.csv;
+    json = PlanetaryHours.json;
+    xml = PlanetaryHours.xml;
+
+def getPlanetaryHoursTable(sunrises:Sequence[datetime], sunsets:Sequence[datetime], next_sunrises:Sequence[datetime] | None = None) -> PlanetaryHoursTable:
+    """Computes the planetary hours of many days at once, without creating a `PlanetaryHour` per hour.
+
+    Day `i` gives the same hours as `getPlanetaryHours(sunrises[i], sunsets[i])`: the night ends 24 hours after the
+    sunrise, unless the real sunrise of the next day is given in `next_sunrises`.
+
+    Args:
+        sunrises (Sequence[datetime]): The sunrise of each day, all naive or all in the same time zone.
+        sunsets (Sequence[datetime]): The sunset of each day.
+        next_sunrises (Sequence[datetime] | None): The sunrise of the day after each day, or None.
+
+    Returns:
+        PlanetaryHoursTable: The planetary hours of the days, in the time zone of the sunrises.
+
+    Raises:
+        TimingError: If the sequences differ in length, or a day or night is negative or has hours longer than 2 hours.
+    """
+    if(len(sunrises) != len(sunsets) or (next_sunrises != None and len(next_sunrises) != len(sunrises))):
+        raise TimingError("Every day must have a sunrise and a sunset");
+    starts:list[int] = [];
+    ends:list[int] = [];
+    planets = array("B");
+    for i in range(len(sunrises)):
+        sunrise = to_microseconds(sunrises[i]);
+        sunset = to_microseconds(sunsets[i]);
+        next_sunrise = sunrise + DAY_MICROSECONDS if(next_sunrises == None) else to_microseconds(next_sunrises[i]);
+        day_hour = divide_hours(sunset - sunrise);
+        night_hour = divide_hours(next_sunrise - sunset);
+        if(day_hour < 0 or night_hour < 0):
+            raise TimingError(f"Start time must be before end time: {sunrises[i]}");
+        if(day_hour > MAX_HOUR_MICROSECONDS or night_hour > MAX_HOUR_MICROSECONDS):
+            raise TimingError(f"Duration exceeds 2 hours: {sunrises[i]}");
+        day_starts = range(sunrise, sunrise + 12 * day_hour, day_hour) if(day_hour > 0) else [sunrise] * 12;
+        night_starts = range(sunset, sunset + 12 * night_hour, night_hour) if(night_hour > 0) else [sunset] * 12;
+        starts.extend(day_starts);
+        starts.extend(night_starts);
+        ends.extend(start + day_hour for start in day_starts);
+        ends.extend(start + night_hour for start in night_starts);
+        planets.frombytes(PLANET_SEQUENCES[WEEKDAY_RULERS[(sunrise // DAY_MICROSECONDS + 3) % 7]]);
+    return PlanetaryHoursTable(array("q", starts), array("q", ends), planets, sunrises[0].tzinfo if(len(sunrises) > 0) else None);
+
+def getPlanetaryHoursBetween(first:date, last:date, provider:Callable[[date], tuple[datetime, datetime]]) -> PlanetaryHoursTable:
+    """Computes the planetary hours of every day from `first` to `last`, inclusive.
+
+    Each night ends at the sunrise the provider gives for the next day, so the provider is also asked for the day after `last`.
+
+    Args:
+        first (date): The first day.
+        last (date): The last day.
+        provider (Callable[[date], tuple[datetime, datetime]]): Returns the sunrise and the sunset of a day.
+
+    Returns:
+        PlanetaryHoursTable: The planetary hours of the days, the first day at index 0.
+    """
+    days = [provider(first + timedelta(days=i)) for i in range((last - first).days + 2)];
+    sunrises = [sunrise for sunrise, sunset in days];
+    return getPlanetaryHoursTable(sunrises[:-1], [sunset for sunrise, sunset in days[:-1]], sunrises[1:]);
+
+def hour_index(sunrise:int, sunset:int, next_sunrise:int, instant:int) -> int:
+    """Returns the index of the planetary hour containing an instant, with every time in microseconds since `LOCAL_EPOCH`.
+
+    The hours are those of `getPlanetaryHoursTable`: an instant in the few microseconds rounding leaves between the last
+    hour of the day or the night and the next one belongs to that last hour.
+
+    Returns:
+        int: The index of the hour, 0 to 11 for the day and 12 to 23 for the night, or -1 if the instant is before the sunrise or at or after the next sunrise.
+    """
+    if(instant < sunrise or instant >= next_sunrise):
+        return -1;
+    if(instant < sunset):
+        day_hour = divide_hours(sunset - sunrise);
+        return 11 if(day_hour == 0) else min((instant - sunrise) // day_hour, 11);
+    night_hour = divide_hours(next_sunrise - sunset);
+    return 23 if(night_hour == 0) else min((instant - sunset) // night_hour, 11) + 12;
+
+def planetary_hour_at(sunrise:datetime, sunset:datetime, next_sunrise:datetime, instant:datetime) -> PlanetaryHour | None:
+    """Returns the planetary hour containing an instant, without building the other hours of the day.
+
+    The hour is the one `getPlanetaryHoursTable([sunrise], [sunset], [next_sunrise]).day(0)` has at the same index.
+
+    Args:
+        sunrise (datetime): The sunrise of the day.
+        sunset (datetime): The sunset of the day.
+        next_sunrise (datetime): The sunrise of the next day, which ends the night.
+        instant (datetime): The instant, converted to the time zone of `sunrise` if it is aware.
+
+    Returns:
+        PlanetaryHour | None: The planetary hour, or None if the instant is not between `sunrise` and `next_sunrise`.
+    """
+    zone = sunrise.tzinfo;
+    if(instant.tzinfo != None and zone != None):
+        instant = instant.astimezone(zone);
+    start = to_microseconds(sunrise);
+    middle = to_microseconds(sunset);
+    end = to_microseconds(next_sunrise);
+    index = hour_index(start, middle, end, to_microseconds(instant));
+    if(index < 0):
+        return None;
+    if(index < 12):
+        length = divide_hours(middle - start);
+        hour_start = start + length * index;
+    else:
+        length = divide_hours(end - middle);
+        hour_start = middle + length * (index - 12);
+    planet = PLANETS_BY_CODE[PLANET_SEQUENCES[WEEKDAY_RULERS[sunrise.weekday()]][index]];
+    return PlanetaryHour.trusted(planet, from_microseconds(hour_start, zone), from_microseconds(hour_start + length, zone));
+
+def planetary_hours_at(sunrise:datetime, sunset:datetime, next_sunrise:datetime, instants:Sequence[datetime] | array) -> tuple[array, array]:
+    """Returns the index and the planet of the planetary hour containing each of many instants of the same day.
+
+    Args:
+        sunrise (datetime): The sunrise of the day.
+        sunset (datetime): The sunset of the day.
+        next_sunrise (datetime): The sunrise of the next day, which ends the night.
+        instants (Sequence[datetime] | array): The instants, as times or as an `array("q")` of microseconds since `LOCAL_EPOCH` in the time zone of `sunrise`.
+
+    Returns:
+        tuple[array, array]: The hour indices and the `Planets` values, both `array("b")`, with -1 for the instants outside the day.
+    """
+    if(not isinstance(instants, array)):
+        zone = sunrise.tzinfo;
+        instants = array("q", (to_microseconds(instant.astimezone(zone) if(instant.tzinfo != None and zone != None) else instant) for instant in instants));
+    start = to_microseconds(sunrise);
+    middle = to_microseconds(sunset);
+    end = to_microseconds(next_sunrise);
+    sequence = PLANET_SEQUENCES[WEEKDAY_RULERS[sunrise.weekday()]];
+    indices = array("b", (hour_index(start, middle, end, instant) for instant in instants));
+    planets = array("b", (-1 if(index < 0) else sequence[index] for index in indices));
+    return (indices, planets);
+
 if __name__ == "__main__":
     import datetime;
     import json;
@@ -106,7 +106,7 @@ class PlanetaryDayReport(ReportBuilder):
     It provides the `generate_report` method that generates a report about the planetary hours of the given day.
     
     It accepts as constructor parameters
-        -   a `PlanetaryHours` list object of `PlanetaryHour` objects
+        -   a `PlanetaryHours` list object of `PlanetaryHour` objects, or a `PlanetaryHoursView` of a `PlanetaryHoursTable`
         -   a tuple of datetime or str objects representing the sun rise and sun set times
     
     @author nrosenthal
@@ -115,7 +115,7 @@ class PlanetaryDayReport(ReportBuilder):
     """
     def generate_report(self, *args) -> str:
         #   Check if a `PlanetaryHours` list object was provided
-        if len(args) == 1 and isinstance(args[0], list):
+        if len(args) == 1 and isinstance(args[0], (list, planets.PlanetaryHoursView)):
             planetary_hours = args[0];
         elif len(args) == 1 and isinstance(args[0], tuple):
             #   Check if a tuple of datetime or str objects was provided
@@ -0,0 +1,296 @@
+"""The `Solar` module computes the sunrise and the sunset of a location offline, with the NOAA solar equations.
+
+Locations are duck-typed: anything with `latitude`, `longitude` and `timezone` attributes works, such as the
+`Location` and `GeoLocation` of the `primitives` package. The times are accurate to about a minute between the polar
+circles, and are given in the timezone of the location, or in UTC if it has none.
+
+A `SolarCalendar` computes the position of the Sun once per day of a date range, and then shares it among every
+location, which is much faster when computing a range of days for many locations.
+
+@author nrosenthal
+@version 1.0
+@since 2024-10-30
+"""
+
+from array import array;
+from datetime import date, datetime, timedelta, timezone, tzinfo;
+from math import acos, asin, cos, degrees, radians, sin, tan;
+from typing import Callable, Iterable;
+from zoneinfo import ZoneInfo;
+from Planets import PlanetaryHours, PlanetaryHoursTable, getPlanetaryHoursTable;
+
+
+#   Useful constants
+OFFICIAL_ZENITH:float   = 90.833;
+"""`OFFICIAL_ZENITH` is the zenith angle of the center of the Sun at sunrise and sunset, in degrees: 90 degrees plus the atmospheric refraction and the radius of the Sun."""
+
+CIVIL_ZENITH:float      = 96.0;
+"""`CIVIL_ZENITH` is the zenith angle of the center of the Sun at civil dawn and dusk, in degrees."""
+
+J2000:float             = 2451545.0;
+"""`J2000` is the Julian day of 2000-01-01 at 12:00 UTC, the origin of the Julian centuries of the NOAA equations."""
+
+UNIX_EPOCH_JULIAN_DAY:float = 2440587.5;
+"""`UNIX_EPOCH_JULIAN_DAY` is the Julian day of 1970-01-01 at 00:00 UTC."""
+
+MINUTES_PER_DAY:float   = 1440.0;
+UNIX_EPOCH:date         = date(1970, 1, 1);
+
+
+#   Error handling
+class SolarError(Exception):
+    """`SolarError` is raised when the Sun does not rise or does not set on a day, as in the polar day and the polar night.
+
+    @author nrosenthal
+    @version 1.0
+    @since 2024-10-30
+    """
+    def __init__(self, message:str):
+        super().__init__(message);
+        self.message = message;
+
+    def __str__(self):
+        return self.message;
+
+    def __repr__(self):
+        return self.message;
+
+
+#   Position of the Sun
+def solar_terms(day:float) -> tuple[float, float]:
+    """Returns the declination of the Sun and the equation of time at the given time.
+
+    Args:
+        day (float): The time, in days since 1970-01-01 at 00:00 UTC.
+
+    Returns:
+        tuple[float, float]: The declination of the Sun, in degrees, and the equation of time, in minutes.
+    """
+    t = (day + UNIX_EPOCH_JULIAN_DAY - J2000) / 36525.0;
+    mean_longitude = radians((280.46646 + t * (36000.76983 + t * 0.0003032)) % 360.0);
+    mean_anomaly = radians(357.52911 + t * (35999.05029 - 0.0001537 * t));
+    eccentricity = 0.016708634 - t * (0.000042037 + 0.0000001267 * t);
+    center = (sin(mean_anomaly) * (1.914602 - t * (0.004817 + 0.000014 * t))
+              + sin(2 * mean_anomaly) * (0.019993 - 0.000101 * t)
+              + sin(3 * mean_anomaly) * 0.000289);
+    omega = radians(125.04 - 1934.136 * t);
+    apparent_longitude = radians(degrees(mean_longitude) + center - 0.00569 - 0.00478 * sin(omega));
+    mean_obliquity = 23.0 + (26.0 + (21.448 - t * (46.815 + t * (0.00059 - t * 0.001813))) / 60.0) / 60.0;
+    obliquity = radians(mean_obliquity + 0.00256 * cos(omega));
+    declination = degrees(asin(sin(obliquity) * sin(apparent_longitude)));
+    y = tan(obliquity / 2) ** 2;
+    equation_of_time = 4 * degrees(y * sin(2 * mean_longitude)
+                                   - 2 * eccentricity * sin(mean_anomaly)
+                                   + 4 * eccentricity * y * sin(mean_anomaly) * cos(2 * mean_longitude)
+                                   - 0.5 * y * y * sin(4 * mean_longitude)
+                                   - 1.25 * eccentricity * eccentricity * sin(2 * mean_anomaly));
+    return (declination, equation_of_time);
+
+def hour_angle(latitude:float, declination:float, zenith:float = OFFICIAL_ZENITH) -> float:
+    """Returns the hour angle of the Sun when its center is at the given zenith angle.
+
+    Args:
+        latitude (float): The latitude of the observer, in degrees.
+        declination (float): The declination of the Sun, in degrees.
+        zenith (float): The zenith angle of the Sun, in degrees.
+
+    Returns:
+        float: The hour angle, in degrees.
+
+    Raises:
+        SolarError: If the Sun never reaches the zenith angle on that day.
+    """
+    latitude = radians(latitude);
+    declination = radians(declination);
+    cosine = cos(radians(zenith)) / (cos(latitude) * cos(declination)) - tan(latitude) * tan(declination);
+    if(cosine > 1.0):
+        raise SolarError("The Sun does not rise on this day");
+    if(cosine < -1.0):
+        raise SolarError("The Sun does not set on this day");
+    return degrees(acos(cosine));
+
+
+#   Locations
+def zone_of(location) -> tzinfo:
+    """Returns the timezone of a location: its `timezone` as a `tzinfo`, or UTC if it has none."""
+    zone = getattr(location, "timezone", None);
+    if(zone == None):
+        return timezone.utc;
+    if(isinstance(zone, str)):
+        return ZoneInfo(zone);
+    return zone;
+
+def utc_day_of(location, day:date, zone:tzinfo) -> int:
+    """Returns the UTC day, in days since 1970-01-01, whose solar noon at the location falls on the local date `day`.
+
+    The UTC date and the local date of the solar noon only differ where the timezone is far from the longitude.
+    """
+    offset = datetime(day.year, day.month, day.day, 12).replace(tzinfo=zone).utcoffset() or timedelta(0);
+    shift = round((4.0 * location.longitude - offset.total_seconds() / 60.0) / MINUTES_PER_DAY);
+    return (day - UNIX_EPOCH).days + shift;
+
+def to_datetime(day:float, zone:tzinfo) -> datetime:
+    """Returns the time `day` days after 1970-01-01 at 00:00 UTC, in the given timezone."""
+    return (datetime(1970, 1, 1, tzinfo=timezone.utc) + timedelta(days=day)).astimezone(zone);
+
+def solar_events(terms:Callable[[float], tuple[float, float]], latitude:float, longitude:float, utc_day:int, zenith:float = OFFICIAL_ZENITH) -> tuple[float, float]:
+    """Returns the times of sunrise and sunset on a UTC day.
+
+    The position of the Sun is taken at the solar noon, and then once more at the time of each event.
+
+    Args:
+        terms (Callable[[float], tuple[float, float]]): Returns the declination and the equation of time at a time, as `solar_terms` does.
+        latitude (float): The latitude of the observer, in degrees.
+        longitude (float): The longitude of the observer, in degrees, east positive.
+        utc_day (int): The UTC day, in days since 1970-01-01.
+        zenith (float): The zenith angle of the Sun at sunrise and sunset, in degrees.
+
+    Returns:
+        tuple[float, float]: The sunrise and the sunset, in days since 1970-01-01 at 00:00 UTC.
+
+    Raises:
+        SolarError: If the Sun does not rise or does not set on that day.
+    """
+    declination, equation_of_time = terms(utc_day + (720.0 - 4.0 * longitude) / MINUTES_PER_DAY);
+    angle = hour_angle(latitude, declination, zenith);
+    events = [];
+    for sign in (1.0, -1.0):
+        estimate = utc_day + (720.0 - 4.0 * (longitude + sign * angle) - equation_of_time) / MINUTES_PER_DAY;
+        declination, equation_of_time = terms(estimate);
+        events.append(utc_day + (720.0 - 4.0 * (longitude + sign * hour_angle(latitude, declination, zenith)) - equation_of_time) / MINUTES_PER_DAY);
+    return (events[0], events[1]);
+
+def sunrise_sunset(location, day:date, zenith:float = OFFICIAL_ZENITH) -> tuple[datetime, datetime]:
+    """Returns the sunrise and the sunset of a location on a local date.
+
+    Args:
+        location: The location, with `latitude`, `longitude` and `timezone` attributes.
+        day (date): The local date.
+        zenith (float): The zenith angle of the Sun at sunrise and sunset, in degrees.
+
+    Returns:
+        tuple[datetime, datetime]: The sunrise and the sunset, in the timezone of the location.
+
+    Raises:
+        SolarError: If the Sun does not rise or does not set on that day.
+    """
+    zone = zone_of(location);
+    sunrise, sunset = solar_events(solar_terms, location.latitude, location.longitude, utc_day_of(location, day, zone), zenith);
+    return (to_datetime(sunrise, zone), to_datetime(sunset, zone));
+
+def planetary_hours(location, day:date) -> PlanetaryHours:
+    """Returns the planetary hours of a location on a local date, from its sunrise to the sunrise of the next day."""
+    sunrise, sunset = sunrise_sunset(location, day);
+    next_sunrise = sunrise_sunset(location, day + timedelta(days=1))[0];
+    return getPlanetaryHoursTable([sunrise], [sunset], [next_sunrise]).day(0);
+
+
+#   Date ranges
+class SolarCalendar:
+    """A `SolarCalendar` computes the position of the Sun once per day of a date range, for every location.
+
+    The declination of the Sun and the equation of time are computed at 00:00 UTC of each day, and interpolated
+    linearly in between, which moves sunrise and sunset by less than a second. Every location then only costs a few
+    trigonometric operations per day.
+
+    @author nrosenthal
+    @version 1.0
+    @since 2024-10-30
+    """
+    __slots__ = ['first', 'last', 'origin', 'declinations', 'equations', 'zenith'];
+
+    def __init__(self, first:date, last:date, zenith:float = OFFICIAL_ZENITH):
+        """Initializes a `SolarCalendar` for the local dates from `first` to `last`, inclusive.
+
+        @param first: The first local date.
+        @param last: The last local date.
+        @param zenith: The zenith angle of the Sun at sunrise and sunset, in degrees.
+        """
+        if(last < first):
+            raise ValueError("The last day must not be before the first day");
+        self.first = first;
+        self.last = last;
+        self.zenith = zenith;
+        #   Local dates are at most a day away from their UTC days, and every event is within a day of its UTC day
+        self.origin = (first - UNIX_EPOCH).days - 2;
+        self.declinations = array("d");
+        self.equations = array("d");
+        for day in range(self.origin, (last - UNIX_EPOCH).days + 4):
+            declination, equation_of_time = solar_terms(day);
+            self.declinations.append(declination);
+            self.equations.append(equation_of_time);
+
+    def __len__(self) -> int:
+        """Returns the number of days of the calendar."""
+        return (self.last - self.first).days + 1;
+
+    def terms(self, day:float) -> tuple[float, float]:
+        """Returns the declination of the Sun and the equation of time at a time of the calendar, as `solar_terms` does."""
+        offset = day - self.origin;
+        index = int(offset);
+        if(index < 0 or index + 1 >= len(self.declinations)):
+            return solar_terms(day);
+        fraction = offset - index;
+        declinations = self.declinations;
+        equations = self.equations;
+        return (declinations[index] + (declinations[index + 1] - declinations[index]) * fraction,
+                equations[index] + (equations[index + 1] - equations[index]) * fraction);
+
+    def sunrise_sunset(self, location, day:date) -> tuple[datetime, datetime]:
+        """Returns the sunrise and the sunset of a location on a local date of the calendar, as `sunrise_sunset` does."""
+        zone = zone_of(location);
+        sunrise, sunset = solar_events(self.terms, location.latitude, location.longitude, utc_day_of(location, day, zone), self.zenith);
+        return (to_datetime(sunrise, zone), to_datetime(sunset, zone));
+
+    def days(self, location) -> tuple[list[datetime], list[datetime]]:
+        """Returns the sunrises and the sunsets of a location on every day of the calendar.
+
+        Args:
+            location: The location, with `latitude`, `longitude` and `timezone` attributes.
+
+        Returns:
+            tuple[list[datetime], list[datetime]]: The sunrises and the sunsets, the first day first.
+
+        Raises:
+            SolarError: If the Sun does not rise or does not set on one of the days.
+        """
+        sunrises = [];
+        sunsets = [];
+        for i in range(len(self)):
+            sunrise, sunset = self.sunrise_sunset(location, self.first + timedelta(days=i));
+            sunrises.append(sunrise);
+            sunsets.append(sunset);
+        return (sunrises, sunsets);
+
+    def provider(self, location) -> Callable[[date], tuple[datetime, datetime]]:
+        """Returns a function giving the sunrise and the sunset of a location on a day, for `getPlanetaryHoursBetween`."""
+        return lambda day: self.sunrise_sunset(location, day);
+
+    def planetary_hours(self, location) -> PlanetaryHoursTable:
+        """Returns the planetary hours of a location on every day of the calendar, each night ending at the next sunrise."""
+        sunrises, sunsets = self.days(location);
+        next_sunrise = self.sunrise_sunset(location, self.last + timedelta(days=1))[0];
+        return getPlanetaryHoursTable(sunrises, sunsets, sunrises[1:] + [next_sunrise]);
+
+def sunrises_sunsets(locations:Iterable, first:date, last:date, zenith:float = OFFICIAL_ZENITH) -> list[tuple[list[datetime], list[datetime]]]:
+    """Returns the sunrises and the sunsets of many locations on every day from `first` to `last`, inclusive.
+
+    Args:
+        locations (Iterable): The locations, with `latitude`, `longitude` and `timezone` attributes.
+        first (date): The first local date.
+        last (date): The last local date.
+        zenith (float): The zenith angle of the Sun at sunrise and sunset, in degrees.
+
+    Returns:
+        list[tuple[list[datetime], list[datetime]]]: The sunrises and the sunsets of each location, as `SolarCalendar.days` gives them.
+    """
+    calendar = SolarCalendar(first, last, zenith);
+    return [calendar.days(location) for location in locations];
+
+
+if __name__ == "__main__":
+    from types import SimpleNamespace;
+
+    SAO_PAULO = SimpleNamespace(latitude=-23.5505, longitude=-46.6333, timezone=ZoneInfo("America/Sao_Paulo"));
+    print(sunrise_sunset(SAO_PAULO, date(2024, 10, 30)));
+    print(planetary_hours(SAO_PAULO, date(2024, 10, 30)));
@@ -25,6 +25,7 @@ class TimingError(Exception):
     """
     def __init__(self, message:str):
         super().__init__(message);
+        self.message = message;
         
     def __str__(self):
         return self.message;
@@ -60,6 +61,8 @@ class Timing:
     @version 1.0
     @since 2024-10-28
     """
+    __slots__ = ['start', 'end'];
+    
     def _chk(self, start:datetime, end:datetime):
         """Checks if the given `start` and `end` times are a valid time interval.
         The start time must be before the end time.
@@ -138,6 +141,8 @@ class Duration(Timing):
     @version 1.0
     @since 2024-10-29
     """
+    __slots__ = [];
+    
     def __init__(self, start:datetime, end:datetime):
         """
         Initializes a `Duration` object with the given `start` and `end` timestamps.
@@ -0,0 +1,108 @@
+"""Test suite for the memory and SQLite tiers of the `HourCache.py` module
+
+    @author nrosenthal
+    @version 1.0
+    @since 2024-10-30
+"""
+import os;
+import sys;
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "..", "src", "astral"));
+
+from datetime import date, timedelta;
+from types import SimpleNamespace;
+from zoneinfo import ZoneInfo;
+from HourCache import HourCache;
+from Solar import SolarError, sunrise_sunset;
+import tempfile;
+
+
+#   Test data
+SAO_PAULO = SimpleNamespace(latitude=-23.55, longitude=-46.63, timezone="America/Sao_Paulo");
+NEARBY = SimpleNamespace(latitude=-23.5521, longitude=-46.6284, timezone="America/Sao_Paulo");
+"""`NEARBY` rounds to the coordinates of `SAO_PAULO`, so it shares its keys."""
+
+POLAR = SimpleNamespace(latitude=80.0, longitude=15.0, timezone="Europe/Oslo");
+
+DAY:date = date(2024, 10, 30);
+
+def days(count:int) -> list[date]:
+    return [DAY + timedelta(days=i) for i in range(count)];
+
+def keys(cache:HourCache) -> list[str]:
+    return [key.rsplit(",", 1)[1] for key in cache.entries];
+
+
+#   Tests
+def test_lru_eviction():
+    cache = HourCache(maxsize=3);
+    first, second, third, fourth = days(4);
+    for day in (first, second, third):
+        cache.sunrise_sunset(SAO_PAULO, day);
+    assert keys(cache) == [first.isoformat(), second.isoformat(), third.isoformat()];
+    #   A hit makes a day the most recently used, so the next insertion evicts the oldest of the others
+    cache.sunrise_sunset(SAO_PAULO, first);
+    cache.sunrise_sunset(SAO_PAULO, fourth);
+    assert keys(cache) == [third.isoformat(), first.isoformat(), fourth.isoformat()];
+    assert len(cache) == 3;
+    cache.sunrise_sunset(SAO_PAULO, second);
+    assert keys(cache) == [first.isoformat(), fourth.isoformat(), second.isoformat()];
+    assert cache.stats() == {"hits": 1, "disk_hits": 0, "misses": 5, "size": 3, "maxsize": 3};
+    try:
+        HourCache(maxsize=0);
+        assert False;
+    except ValueError:
+        pass;
+
+def test_counters():
+    cache = HourCache();
+    expected = sunrise_sunset(SAO_PAULO, DAY);
+    assert cache.sunrise_sunset(SAO_PAULO, DAY) == expected;
+    assert cache.sunrise_sunset(NEARBY, DAY) == expected;
+    hours = cache.planetary_hours(SAO_PAULO, DAY);
+    assert cache.planetary_hours(NEARBY, DAY) is hours;
+    assert cache.stats() == {"hits": 3, "disk_hits": 0, "misses": 1, "size": 1, "maxsize": cache.maxsize};
+    #   The hours before sunrise belong to the night of the day before
+    sunrise = expected[0];
+    cache.planetary_hour_at(SAO_PAULO, sunrise - timedelta(minutes=1));
+    assert cache.stats()["misses"] == 2 and cache.stats()["hits"] == 4;
+    cache.clear();
+    assert cache.stats() == {"hits": 0, "disk_hits": 0, "misses": 0, "size": 0, "maxsize": cache.maxsize};
+    #   Days without a sunrise are not cached
+    try:
+        cache.sunrise_sunset(POLAR, date(2024, 6, 21));
+        assert False;
+    except SolarError:
+        pass;
+    assert cache.stats()["size"] == 0;
+
+def test_persistent_tier():
+    with tempfile.TemporaryDirectory() as directory:
+        path = os.path.join(directory, "hours.sqlite");
+        with HourCache(path=path) as cache:
+            computed = [cache.sunrise_sunset(SAO_PAULO, day) for day in days(5)];
+            assert cache.stats()["misses"] == 5;
+        #   A new instance reads the solar times of the first from the file instead of computing them
+        with HourCache(maxsize=2, path=path) as cache:
+            loaded = [cache.sunrise_sunset(NEARBY, day) for day in days(5)];
+            assert loaded == computed;
+            assert all(value.tzinfo == ZoneInfo("America/Sao_Paulo") for times in loaded for value in times);
+            assert cache.stats() == {"hits": 0, "disk_hits": 5, "misses": 0, "size": 2, "maxsize": 2};
+            #   Days evicted from memory are found again in the file
+            cache.sunrise_sunset(SAO_PAULO, DAY);
+            assert cache.stats()["disk_hits"] == 6;
+            cache.sunrise_sunset(SAO_PAULO, DAY + timedelta(days=5));
+            assert cache.stats()["misses"] == 1;
+            #   Clearing the memory tier keeps the file
+            cache.clear();
+            cache.sunrise_sunset(SAO_PAULO, DAY + timedelta(days=5));
+            assert cache.stats()["disk_hits"] == 1;
+        #   A closed cache keeps working in memory
+        cache.sunrise_sunset(SAO_PAULO, DAY + timedelta(days=6));
+        assert cache.stats()["misses"] == 1;
+
+
+if __name__ == "__main__":
+    for name, test in list(globals().items()):
+        if(name.startswith("test_")):
+            test();
+    print("OK");
@@ -0,0 +1,122 @@
+"""Test suite for the `HourTable.py` module, checked against `HourCache.py` and `Planets.py`
+
+    @author nrosenthal
+    @version 1.0
+    @since 2024-10-30
+"""
+import os;
+import sys;
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "..", "src", "astral"));
+
+from datetime import date, datetime, timedelta, timezone;
+from types import SimpleNamespace;
+from zoneinfo import ZoneInfo;
+from HourCache import HourCache;
+from HourTable import HourTable, HourTableError, write_hour_table;
+from Planets import planetary_hour_at;
+from Solar import sunrise_sunset;
+import random;
+import struct;
+import tempfile;
+
+
+#   Test data
+FIRST:date = date(2025, 1, 1);
+LAST:date = date(2025, 12, 31);
+
+CITIES:list = [
+    SimpleNamespace(city="New York", region="NY", country="US", location=SimpleNamespace(latitude=40.71, longitude=-74.01, timezone="America/New_York")),
+    SimpleNamespace(city="Sao Paulo", region="SP", country="BR", location=SimpleNamespace(latitude=-23.55, longitude=-46.63, timezone="America/Sao_Paulo")),
+    SimpleNamespace(city="Sydney", region="NSW", country="AU", location=SimpleNamespace(latitude=-33.87, longitude=151.21, timezone="Australia/Sydney"))
+];
+"""Coordinates are already rounded to the precision of `HourCache`, so it computes the same solar times as the table."""
+
+DST_NIGHTS:list[date] = [date(2025, 3, 8), date(2025, 3, 9), date(2025, 11, 1), date(2025, 11, 2), date(2025, 4, 5), date(2025, 10, 4)];
+"""The nights around the changes of the UTC offset of New York and Sydney in 2025."""
+
+def makeInstants(count:int = 3000, seed:int = 11) -> list[datetime]:
+    """Returns aware UTC instants within the table, a third of them on the nights the UTC offset changes."""
+    rng = random.Random(seed);
+    start = datetime(2025, 1, 2, tzinfo=timezone.utc);
+    instants = [start + timedelta(seconds=rng.randrange(360 * 86400)) for i in range(count - count // 3)];
+    for i in range(count // 3):
+        night = datetime.combine(rng.choice(DST_NIGHTS), datetime.min.time(), timezone.utc);
+        instants.append(night + timedelta(seconds=rng.randrange(2 * 86400)));
+    return instants;
+
+def writeTable(directory:str) -> str:
+    path = os.path.join(directory, "hours.bin");
+    write_hour_table(path, CITIES, FIRST, LAST);
+    return path;
+
+
+#   Tests
+def test_table_cache_and_planets_agree():
+    cache = HourCache(maxsize=4096);
+    with tempfile.TemporaryDirectory() as directory:
+        with HourTable(writeTable(directory)) as table:
+            for instant in makeInstants():
+                for city in CITIES:
+                    index = table.index(city);
+                    zone = ZoneInfo(city.location.timezone);
+                    local = instant.astimezone(zone);
+                    day = local.date();
+                    if(local < sunrise_sunset(city.location, day)[0]):
+                        day -= timedelta(days=1);
+                    sunrise, sunset = sunrise_sunset(city.location, day);
+                    expected = planetary_hour_at(sunrise, sunset, sunrise_sunset(city.location, day + timedelta(days=1))[0], instant);
+                    cached = cache.planetary_hour_at(city.location, instant);
+                    found = table.hour_at(index, instant);
+                    for hour in (cached, found):
+                        assert (hour.planet, hour.start, hour.end) == (expected.planet, expected.start, expected.end), (city.city, instant);
+                    assert found.start.tzinfo == zone;
+                    assert table.planet_at(index, instant) == expected.planet;
+
+def test_outside_the_table():
+    with tempfile.TemporaryDirectory() as directory:
+        with HourTable(writeTable(directory)) as table:
+            index = table.index("Sao Paulo");
+            assert table.hour_at(index, datetime(2024, 12, 31, 12, tzinfo=timezone.utc)) == None;
+            assert table.planet_at(index, datetime(2026, 1, 2, 12, tzinfo=timezone.utc)) == None;
+
+def test_failed_write_leaves_no_temporary_file():
+    with tempfile.TemporaryDirectory() as directory:
+        path = writeTable(directory);
+        with open(path, "rb") as f:
+            before = f.read();
+        broken = SimpleNamespace(city="Nowhere", region="", country="", location=None);
+        try:
+            write_hour_table(path, CITIES + [broken], FIRST, LAST);
+            assert False;
+        except ValueError:
+            pass;
+        with open(path, "rb") as f:
+            assert f.read() == before;
+        #   The temporary file is written, but cannot replace a directory
+        occupied = os.path.join(directory, "occupied");
+        os.makedirs(os.path.join(occupied, "child"));
+        try:
+            write_hour_table(occupied, CITIES, FIRST, LAST);
+            assert False;
+        except OSError:
+            pass;
+        assert sorted(os.listdir(directory)) == ["hours.bin", "occupied"];
+
+def test_rejects_other_versions():
+    with tempfile.TemporaryDirectory() as directory:
+        path = writeTable(directory);
+        with open(path, "r+b") as f:
+            f.seek(4);
+            f.write(struct.pack("<H", 1));
+        try:
+            HourTable(path);
+            assert False;
+        except HourTableError:
+            pass;
+
+
+if __name__ == "__main__":
+    for name, test in list(globals().items()):
+        if(name.startswith("test_")):
+            test();
+    print("OK");
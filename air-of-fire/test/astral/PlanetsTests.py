@@ -0,0 +1,122 @@
+"""Test suite for the planetary hours tables, views and lookups of the `Planets.py` module, checked against `getPlanetaryHours`
+
+    @author nrosenthal
+    @version 1.0
+    @since 2024-10-30
+"""
+import os;
+import sys;
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "..", "src", "astral"));
+
+from array import array;
+from datetime import datetime, timedelta;
+from zoneinfo import ZoneInfo;
+from Planets import PlanetaryHour, getPlanetaryHours, getPlanetaryHoursTable, hour_index, planetary_hour_at, planetary_hours_at, to_microseconds;
+from Timing import TimingError;
+import random;
+
+
+#   Test data
+ZONE:ZoneInfo = ZoneInfo("America/Sao_Paulo");
+
+def makeDays(count:int = 200, seed:int = 5) -> list[tuple[datetime, datetime, datetime]]:
+    """Returns the sunrise, sunset and next sunrise of random days, naive and aware, with microsecond times."""
+    rng = random.Random(seed);
+    days = [];
+    for i in range(count):
+        sunrise = datetime(2024, 1, 1) + timedelta(days=rng.randrange(730), microseconds=rng.randrange(4 * 3600 * 1000000, 8 * 3600 * 1000000));
+        if(i % 2 == 0):
+            sunrise = sunrise.replace(tzinfo=ZONE);
+        sunset = sunrise + timedelta(microseconds=rng.randrange(9 * 3600 * 1000000, 15 * 3600 * 1000000));
+        next_sunrise = sunrise + timedelta(days=1, microseconds=rng.randrange(-180 * 1000000, 180 * 1000000));
+        days.append((sunrise, sunset, next_sunrise));
+    return days;
+
+def fields(hour:PlanetaryHour) -> tuple:
+    return (hour.planet, hour.start, hour.end);
+
+def expectedHour(hours, instant:datetime) -> int:
+    """Returns the index of the last hour starting at or before an instant, by scanning the hours."""
+    index = -1;
+    for i, hour in enumerate(hours):
+        if(hour.start <= instant):
+            index = i;
+    return index;
+
+
+#   Tests
+def test_table_matches_getPlanetaryHours():
+    #   The days of a table share a time zone, so the naive and the aware days go in separate tables
+    for aware in (False, True):
+        days = [day for day in makeDays() if((day[0].tzinfo != None) == aware)];
+        table = getPlanetaryHoursTable([day[0] for day in days], [day[1] for day in days]);
+        assert len(table) == len(days);
+        for i, (sunrise, sunset, next_sunrise) in enumerate(days):
+            assert [fields(hour) for hour in table.day(i)] == [fields(hour) for hour in getPlanetaryHours(sunrise, sunset)];
+
+def test_views_build_the_hours_of_the_table():
+    days = [day for day in makeDays(40) if(day[0].tzinfo != None)];
+    table = getPlanetaryHoursTable([day[0] for day in days], [day[1] for day in days], [day[2] for day in days]);
+    for i, view in enumerate(table):
+        hours = table.day(i);
+        assert len(view) == len(hours) == 24;
+        for k in range(24):
+            assert fields(view[k]) == fields(hours[k]);
+            assert view.planet(k) == hours[k].planet;
+        assert [fields(hour) for hour in view[3:9]] == [fields(hour) for hour in hours[3:9]];
+        assert fields(view[-1]) == fields(hours[23]);
+        assert str(view) == str(hours);
+        assert view.json() == hours.json();
+    try:
+        table.view(len(days));
+        assert False;
+    except IndexError:
+        pass;
+
+def test_views_reject_hours_outside_the_day():
+    sunrise, sunset, next_sunrise = makeDays(1)[0];
+    view = getPlanetaryHoursTable([sunrise], [sunset], [next_sunrise]).view(0);
+    for get in (lambda: view.planet(24), lambda: view.planet(-1), lambda: view[24], lambda: view[-25]):
+        try:
+            get();
+            assert False;
+        except IndexError:
+            pass;
+
+def test_planetary_hour_at_matches_the_table():
+    rng = random.Random(13);
+    for sunrise, sunset, next_sunrise in makeDays():
+        hours = getPlanetaryHoursTable([sunrise], [sunset], [next_sunrise]).day(0);
+        instants = [sunrise, sunset, next_sunrise - timedelta(microseconds=1)] + [hour.end for hour in hours[:-1]];
+        instants += [sunrise + (next_sunrise - sunrise) * rng.random() for i in range(50)];
+        for instant in instants:
+            index = expectedHour(hours, instant);
+            assert hour_index(to_microseconds(sunrise), to_microseconds(sunset), to_microseconds(next_sunrise), to_microseconds(instant)) == index;
+            assert fields(planetary_hour_at(sunrise, sunset, next_sunrise, instant)) == fields(hours[index]);
+        indices, planets = planetary_hours_at(sunrise, sunset, next_sunrise, instants);
+        assert list(indices) == [expectedHour(hours, instant) for instant in instants];
+        assert list(planets) == [hours[index].planet.value for index in indices];
+        assert planetary_hour_at(sunrise, sunset, next_sunrise, sunrise - timedelta(microseconds=1)) == None;
+        assert planetary_hour_at(sunrise, sunset, next_sunrise, next_sunrise) == None;
+
+def test_planetary_hours_at_outside_the_day():
+    sunrise, sunset, next_sunrise = makeDays(1)[0];
+    instants = array("q", [to_microseconds(sunrise) - 1, to_microseconds(next_sunrise)]);
+    indices, planets = planetary_hours_at(sunrise, sunset, next_sunrise, instants);
+    assert list(indices) == [-1, -1] and list(planets) == [-1, -1];
+
+def test_trusted_hours_equal_checked_hours():
+    for hour in getPlanetaryHours(datetime(2024, 10, 30, 6), datetime(2024, 10, 30, 18)):
+        assert fields(PlanetaryHour.trusted(hour.planet, hour.start, hour.end)) == fields(PlanetaryHour(hour.planet, hour.start, hour.end));
+    try:
+        PlanetaryHour(hour.planet, hour.start, hour.start + timedelta(hours=3));
+        assert False;
+    except TimingError:
+        pass;
+
+
+if __name__ == "__main__":
+    for name, test in list(globals().items()):
+        if(name.startswith("test_")):
+            test();
+    print("OK");
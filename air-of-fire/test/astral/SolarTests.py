@@ -0,0 +1,92 @@
+"""Test suite for the sunrise and sunset computations of the `Solar.py` module
+
+    @author nrosenthal
+    @version 1.0
+    @since 2024-10-30
+"""
+import os;
+import sys;
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "..", "src", "astral"));
+
+from datetime import date, datetime, timedelta;
+from types import SimpleNamespace;
+from zoneinfo import ZoneInfo;
+from Solar import SolarCalendar, SolarError, sunrise_sunset, sunrises_sunsets;
+
+
+#   Test data
+LONDON = SimpleNamespace(latitude=51.5074, longitude=-0.1278, timezone="Europe/London");
+NEW_YORK = SimpleNamespace(latitude=40.7128, longitude=-74.0060, timezone="America/New_York");
+SYDNEY = SimpleNamespace(latitude=-33.8688, longitude=151.2093, timezone="Australia/Sydney");
+TOKYO = SimpleNamespace(latitude=35.6762, longitude=139.6503, timezone=ZoneInfo("Asia/Tokyo"));
+TROMSO = SimpleNamespace(latitude=69.6492, longitude=18.9553, timezone="Europe/Oslo");
+
+REFERENCES:list = [
+    (LONDON, date(2024, 6, 20), "04:43", "21:21"),
+    (NEW_YORK, date(2024, 12, 21), "07:17", "16:32"),
+    (SYDNEY, date(2024, 12, 21), "05:41", "20:05"),
+    (TOKYO, date(2024, 3, 20), "05:45", "17:53")
+];
+"""Published sunrise and sunset times, on the local wall clock and rounded to the minute."""
+
+TOLERANCE:timedelta = timedelta(minutes=2);
+
+def at(location, day:date, clock:str) -> datetime:
+    hours, minutes = clock.split(":");
+    return datetime(day.year, day.month, day.day, int(hours), int(minutes), tzinfo=ZoneInfo(str(location.timezone)));
+
+
+#   Tests
+def test_reference_times():
+    for location, day, sunrise, sunset in REFERENCES:
+        computed = sunrise_sunset(location, day);
+        assert abs(computed[0] - at(location, day, sunrise)) <= TOLERANCE, (location, computed);
+        assert abs(computed[1] - at(location, day, sunset)) <= TOLERANCE, (location, computed);
+        #   Times are on the local date, in the timezone of the location
+        assert all(value.date() == day and value.utcoffset() == at(location, day, "12:00").utcoffset() for value in computed);
+
+def test_polar_day_and_night():
+    assert sunrise_sunset(TROMSO, date(2024, 3, 20))[0] < sunrise_sunset(TROMSO, date(2024, 3, 20))[1];
+    for day, message in ((date(2024, 6, 21), "does not set"), (date(2024, 12, 21), "does not rise")):
+        try:
+            sunrise_sunset(TROMSO, day);
+            assert False;
+        except SolarError as e:
+            assert message in str(e);
+    try:
+        SolarCalendar(date(2024, 12, 1), date(2024, 12, 31)).days(TROMSO);
+        assert False;
+    except SolarError:
+        pass;
+
+def test_calendar_matches_direct_computation():
+    first = date(2024, 1, 1);
+    last = date(2024, 12, 31);
+    calendar = SolarCalendar(first, last);
+    assert len(calendar) == 366;
+    for location in (LONDON, NEW_YORK, SYDNEY, TOKYO):
+        sunrises, sunsets = calendar.days(location);
+        assert len(sunrises) == len(sunsets) == 366;
+        for i in range(len(calendar)):
+            day = first + timedelta(days=i);
+            sunrise, sunset = sunrise_sunset(location, day);
+            assert abs(sunrises[i] - sunrise) < timedelta(seconds=1), (location, day);
+            assert abs(sunsets[i] - sunset) < timedelta(seconds=1), (location, day);
+            assert sunrises[i].utcoffset() == sunrise.utcoffset();
+    #   Days outside of the calendar fall back to the direct computation
+    assert abs(calendar.sunrise_sunset(LONDON, date(2026, 6, 1))[0] - sunrise_sunset(LONDON, date(2026, 6, 1))[0]) < timedelta(seconds=1);
+    provider = calendar.provider(SYDNEY);
+    assert provider(date(2024, 7, 1)) == calendar.sunrise_sunset(SYDNEY, date(2024, 7, 1));
+    assert sunrises_sunsets([LONDON, TOKYO], first, last) == [calendar.days(LONDON), calendar.days(TOKYO)];
+    try:
+        SolarCalendar(last, first);
+        assert False;
+    except ValueError:
+        pass;
+
+
+if __name__ == "__main__":
+    for name, test in list(globals().items()):
+        if(name.startswith("test_")):
+            test();
+    print("OK");
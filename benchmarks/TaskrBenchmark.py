@@ -0,0 +1,220 @@
+"""TaskrBenchmark measures `Taskr` and `TaskManager` on synthetic `ObsidianTask` stores of realistic sizes.
+
+For each store size and storage backend it records the latency of the main operations, the peak memory they allocate
+(as traced by `tracemalloc`) and the size of the store on disk, and prints the results as JSON. Passing a previous
+result file with `--compare` reports the ratio of every measurement to the previous one.
+
+Usage:
+    python benchmarks/TaskrBenchmark.py --sizes 1000 100000 1000000 --output results.json
+    python benchmarks/TaskrBenchmark.py --sizes 1000 --compare results.json
+"""
+
+import os;
+import sys;
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))));
+
+from primitives.Task import ObsidianTask;
+from TaskManager import TaskManager;
+from TaskStorage import JSONTaskStorage, SQLiteTaskStorage;
+from Taskr import Taskr;
+from datetime import datetime, timedelta;
+from typing import Callable;
+import argparse;
+import json;
+import platform;
+import random;
+import shutil;
+import statistics;
+import tempfile;
+import time;
+import tracemalloc;
+
+DEFAULT_SIZES:list[int] = [1000, 100000];
+"""`DEFAULT_SIZES` are the store sizes measured when none are given. Pass `--sizes 1000 100000 1000000` for the full suite."""
+
+BACKENDS:tuple = ("json", "json-journal", "sqlite");
+"""`BACKENDS` are the storage backends that can be measured."""
+
+TAGS:list[str] = ["#work", "#home", "#errand", "#study", "#health", "#finance", "#obsidian", "#reading"];
+
+def synthetic_tasks(count:int, seed:int = 0) -> list[dict]:
+    """Generates `count` task dictionaries, as written by `ObsidianTask.to_dict`, with reproducible contents.
+
+    Args:
+        count (int):        The number of tasks.
+        seed (int):         The random seed.
+
+    Returns:
+        list[dict]:         The tasks.
+    """
+    rng = random.Random(seed);
+    start = datetime(2024, 1, 1);
+    return [
+        ObsidianTask(
+            f"task-{i:07d}",
+            f"Synthetic task {i} " + "x" * rng.randint(0, 60),
+            rng.randint(1, 5),
+            None if(rng.random() < 0.1) else start + timedelta(days=rng.randint(0, 730)),
+            rng.random() < 0.3,
+            rng.sample(TAGS, rng.randint(0, 3))
+        ).to_dict()
+        for i in range(count)
+    ];
+
+def make_storage(backend:str, directory:str, tasks:list[dict]):
+    """Creates a storage backend in `directory` holding `tasks`.
+
+    Args:
+        backend (str):      One of `BACKENDS`.
+        directory (str):    An empty directory for the store.
+        tasks (list[dict]): The tasks of the store.
+
+    Returns:
+        tuple[TaskStorage, list[str]]:  The storage, and the paths of its files.
+    """
+    records = [{"op": "add", "task": task} for task in tasks];
+    if(backend == "sqlite"):
+        storage = SQLiteTaskStorage(os.path.join(directory, "tasks.db"));
+        storage.prepare();
+        storage.commit(records);
+        return (storage, [storage.path]);
+    storage = JSONTaskStorage(directory, journal=(backend == "json-journal"));
+    storage.prepare();
+    task_manager, version = storage.load();
+    task_manager.add_tasks(ObsidianTask.from_dict(task) for task in tasks);
+    storage.save(task_manager, version);
+    return (storage, [storage.path, storage.journal.path]);
+
+def measure(function:Callable, repeat:int) -> dict:
+    """Runs `function` once under `tracemalloc` to measure its peak memory, then `repeat` more times to measure its latency.
+
+    Args:
+        function (Callable):    The operation to measure. It receives the index of the run, from 0 to `repeat`.
+        repeat (int):           The number of timed runs.
+
+    Returns:
+        dict:               The median, mean and minimum latency in seconds, and the peak memory in bytes.
+    """
+    tracemalloc.start();
+    function(0);
+    peak = tracemalloc.get_traced_memory()[1];
+    tracemalloc.stop();
+    times = [];
+    for i in range(1, repeat + 1):
+        start = time.perf_counter();
+        function(i);
+        times.append(time.perf_counter() - start);
+    return {
+        "median_s": statistics.median(times),
+        "mean_s": statistics.fmean(times),
+        "min_s": min(times),
+        "peak_bytes": peak,
+        "runs": repeat
+    };
+
+def file_size(paths:list[str]) -> int:
+    """Returns the total size of the files that exist among `paths`."""
+    return sum(os.path.getsize(path) for path in paths if os.path.exists(path));
+
+def bench_size(size:int, backends:list[str], repeat:int, seed:int) -> dict:
+    """Measures every operation on a store of `size` tasks, for each backend.
+
+    Args:
+        size (int):             The number of tasks of the store.
+        backends (list[str]):   The backends to measure.
+        repeat (int):           The number of runs of each operation; slow operations on large stores run fewer times.
+        seed (int):             The random seed of the synthetic tasks.
+
+    Returns:
+        dict:                   The measurements, by backend and then by operation.
+    """
+    tasks = synthetic_tasks(size, seed);
+    data = {"tasks": tasks};
+    #   Whole-store operations on large stores take seconds each
+    slow_repeat = max(1, min(repeat, 100000 // max(size, 1)));
+    results = {
+        "TaskManager.from_dict": measure(lambda i: TaskManager.from_dict(data), slow_repeat)
+    };
+    task_manager = TaskManager.from_dict(data);
+    names = [task["name"] for task in random.Random(seed).sample(tasks, min(size, 1000))];
+    results["TaskManager.to_dict"] = measure(lambda i: task_manager.to_dict(), slow_repeat);
+    results["TaskManager.get_task"] = measure(lambda i: task_manager.get_task(names[i % len(names)]), max(repeat, 1000));
+    report = {"TaskManager": results};
+    for backend in backends:
+        directory = tempfile.mkdtemp(prefix=f"taskr-bench-{backend}-");
+        try:
+            storage, paths = make_storage(backend, directory, tasks);
+            taskr = Taskr(storage=storage);
+            results = {"file_bytes": file_size(paths)};
+            new_tasks = [ObsidianTask.from_dict(task) for task in synthetic_tasks(slow_repeat + 1, seed + 1)];
+            for task in new_tasks:
+                task.name = "new-" + task.name;
+            results["Taskr.add_task"] = measure(lambda i: taskr.add_task(new_tasks[i]), slow_repeat);
+            results["Taskr.remove_task"] = measure(lambda i: taskr.remove_task(new_tasks[i]), slow_repeat);
+            results["Taskr.get_task"] = measure(lambda i: taskr.get_task(names[i % len(names)]), slow_repeat);
+            results["Taskr.getAllTasks"] = measure(lambda i: taskr.getAllTasks(), slow_repeat);
+            results["file_bytes_after"] = file_size(paths);
+            report[backend] = results;
+            if(backend == "sqlite"):
+                storage.close();
+        finally:
+            shutil.rmtree(directory, ignore_errors=True);
+    return report;
+
+def compare(current:dict, previous:dict) -> dict:
+    """Computes the ratio current / previous of every numeric measurement present in both results.
+
+    Args:
+        current (dict):     The results of this run.
+        previous (dict):    The results of a previous run, as printed by this script.
+
+    Returns:
+        dict:               The ratios, with the same nesting as the results.
+    """
+    ratios = {};
+    for key, value in current.items():
+        if(key not in previous):
+            continue;
+        if(isinstance(value, dict) and isinstance(previous[key], dict)):
+            nested = compare(value, previous[key]);
+            if(len(nested) > 0):
+                ratios[key] = nested;
+        elif(isinstance(value, (int, float)) and isinstance(previous[key], (int, float)) and not isinstance(value, bool) and previous[key] != 0 and key != "runs"):
+            ratios[key] = round(value / previous[key], 3);
+    return ratios;
+
+def main(argv:list[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(description="Benchmarks Taskr and TaskManager on synthetic task stores.");
+    parser.add_argument("--sizes", type=int, nargs="+", default=DEFAULT_SIZES, help="store sizes, in tasks");
+    parser.add_argument("--backends", nargs="+", default=list(BACKENDS), choices=BACKENDS, help="storage backends to measure");
+    parser.add_argument("--repeat", type=int, default=20, help="timed runs of each operation");
+    parser.add_argument("--seed", type=int, default=0, help="random seed of the synthetic tasks");
+    parser.add_argument("--output", help="also write the results to this file");
+    parser.add_argument("--compare", help="a previous result file to compare against");
+    args = parser.parse_args(argv);
+
+    results = {
+        "environment": {
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+            "timestamp": datetime.now().isoformat(timespec="seconds"),
+            "seed": args.seed,
+            "repeat": args.repeat
+        },
+        "sizes": {}
+    };
+    for size in args.sizes:
+        results["sizes"][str(size)] = bench_size(size, args.backends, args.repeat, args.seed);
+    if(args.compare != None):
+        with open(args.compare, "r") as f:
+            results["ratios"] = compare(results["sizes"], json.loads(f.read())["sizes"]);
+    text = json.dumps(results, indent=2);
+    if(args.output != None):
+        with open(args.output, "w") as f:
+            f.write(text + "\n");
+    print(text);
+    return 0;
+
+if __name__ == "__main__":
+    sys.exit(main());
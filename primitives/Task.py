@@ -1,8 +1,11 @@
 from dataclasses import dataclass;
 from datetime import datetime;
+from typing import ClassVar;
+import sys;
 
-@dataclass
+@dataclass(slots=True)
 class Task:
+    """A Task is a to-do item with a name, a description, a priority from 1 to 5, an optional due date and a completion flag."""
     name            :str;
     description     :str;
     priority        :int;
@@ -22,7 +25,7 @@ class Task:
         return {
             "name": self.name,
             "description": self.description,
-            "priority": self.priority.name,
+            "priority": self.priority,
             "due_date": self.due_date,
             "completed": self.completed
         };
@@ -37,9 +40,12 @@ class Task:
             data["completed"]
         );
         
-@dataclass
+@dataclass(slots=True)
 class ObsidianTask(Task):
-    """A ObsidianTask is a Task engineered to work with Obsidian."""
+    """A ObsidianTask is a Task engineered to work with Obsidian.
+
+    Tags are interned, so the many tasks sharing a tag share a single string.
+    """
     tags: list[str];
     
     PRIORITIES = {
@@ -50,7 +56,10 @@ class ObsidianTask(Task):
         5: r"🔺"
     };
     
-    DUE:str = r"📅";
+    DUE:ClassVar[str] = r"📅";
+    
+    def __post_init__(self):
+        self.tags = [sys.intern(tag) for tag in self.tags];
     
     def __str__(self) -> str:
         if(self.completed):
@@ -74,13 +83,32 @@ class ObsidianTask(Task):
             data["name"],
             data["description"],
             data["priority"],
-            data["due_date"],
+            ObsidianTask.parseDueDate(data["due_date"]),
             data["completed"],
             data["tags"]
         );
         
+    @staticmethod
+    def parseDueDate(due_date) -> datetime | None:
+        """Parses a due date as rendered by `dueDate` (e.g. `2024-10-30 📅`) back into a `datetime`.
+
+        Args:
+            due_date (str | datetime | None): The due date to parse.
+
+        Returns:
+            datetime | None:    The parsed due date, or `None` if the task has no due date.
+        """
+        if(due_date == None or isinstance(due_date, datetime)):
+            return due_date;
+        due_date = due_date.replace(ObsidianTask.DUE, "").strip();
+        if(due_date == ""):
+            return None;
+        return datetime.strptime(due_date, "%Y-%m-%d");
+        
     @property
     def dueDate(self):
+        if(self.due_date == None):
+            return "";
         return self.due_date.strftime("%Y-%m-%d") + " 📅";    
     
         
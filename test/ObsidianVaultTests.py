@@ -0,0 +1,115 @@
+"""Test suite for the synchronization of the `ObsidianVault.py` module with Taskr
+
+    @author nrosenthal
+    @version 1.0
+    @since 2024-10-30
+"""
+import os;
+import sys;
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."));
+
+from ObsidianVault import ObsidianVault;
+from TaskStorage import JSONTaskStorage;
+from Taskr import Taskr;
+import tempfile;
+
+
+#   Test data
+NOTE:str = "# Note\r\n- [ ] 🔼 A - first task - 2024-10-30 📅 #work\r\nsome text\r\n- [ ] ⏫ B - second task\r\n";
+
+def makeVault(directory:str) -> tuple[ObsidianVault, Taskr, str]:
+    """Returns a vault with a single note, its state file, and a Taskr storing its tasks next to it."""
+    root = os.path.join(directory, "vault");
+    os.makedirs(root);
+    with open(os.path.join(root, "note.md"), "wb") as f:
+        f.write(NOTE.encode("utf-8"));
+    state_path = os.path.join(directory, "vault.json");
+    return (ObsidianVault(root, state_path), Taskr(storage=JSONTaskStorage(os.path.join(directory, ".taskr"))), state_path);
+
+def names(taskr:Taskr) -> list[str]:
+    return sorted(task.name for task in taskr.getAllTasks());
+
+
+def test_sync_pushes_vault_tasks():
+    with tempfile.TemporaryDirectory() as directory:
+        vault, taskr, _ = makeVault(directory);
+        assert vault.sync(taskr) == (2, 0);
+        assert names(taskr) == ["A", "B"];
+        task = taskr.get_task("A");
+        assert task.description == "first task";
+        assert task.priority == 3;
+        assert task.tags == ["#work"];
+        assert task.due_date.strftime("%Y-%m-%d") == "2024-10-30";
+
+
+def test_sync_twice_does_not_duplicate():
+    with tempfile.TemporaryDirectory() as directory:
+        vault, taskr, _ = makeVault(directory);
+        vault.sync(taskr);
+        assert vault.sync(taskr) == (0, 0);
+        assert names(taskr) == ["A", "B"];
+
+
+def test_sync_after_deleting_state_does_not_duplicate():
+    with tempfile.TemporaryDirectory() as directory:
+        vault, taskr, state_path = makeVault(directory);
+        vault.sync(taskr);
+        os.remove(state_path);
+        vault = ObsidianVault(vault.root, state_path);
+        assert vault.sync(taskr) == (0, 0);
+        assert names(taskr) == ["A", "B"];
+
+
+def test_first_sync_against_populated_storage():
+    with tempfile.TemporaryDirectory() as directory:
+        vault, taskr, _ = makeVault(directory);
+        other = ObsidianVault(vault.root, os.path.join(directory, "other.json"));
+        other.scan();
+        taskr.add_tasks(other.tasks());
+        #   A duplicate left by an earlier sync is folded into a single task
+        taskr.add_task(taskr.get_task("B"));
+        assert vault.sync(taskr) == (1, 0);
+        assert names(taskr) == ["A", "B"];
+
+
+def test_sync_round_trip():
+    with tempfile.TemporaryDirectory() as directory:
+        vault, taskr, _ = makeVault(directory);
+        path = os.path.join(vault.root, "note.md");
+        vault.sync(taskr);
+        #   Taskr to vault: only the checkbox of the completed task changes
+        taskr.complete_task(taskr.get_task("A"));
+        assert vault.sync(taskr) == (0, 1);
+        with open(path, "rb") as f:
+            content = f.read();
+        assert content == NOTE.replace("- [ ] 🔼 A", "- [x] 🔼 A").encode("utf-8");
+        #   Vault to Taskr: an edited line replaces its task, a deleted line removes it
+        with open(path, "wb") as f:
+            f.write("- [ ] ⏫ B - edited task\n- [ ] C - new task\n".encode("utf-8"));
+        assert vault.sync(taskr) == (2, 0);
+        assert names(taskr) == ["B", "C"];
+        assert taskr.get_task("B").description == "edited task";
+        assert vault.sync(taskr) == (0, 0);
+
+
+def test_write_back_keeps_line_endings_and_emoji():
+    with tempfile.TemporaryDirectory() as directory:
+        vault, taskr, _ = makeVault(directory);
+        vault.sync(taskr);
+        task = taskr.get_task("B");
+        taskr.remove_task(task);
+        task.description = "renamed ✨";
+        taskr.add_task(task);
+        assert vault.sync(taskr) == (0, 1);
+        with open(os.path.join(vault.root, "note.md"), "rb") as f:
+            content = f.read().decode("utf-8");
+        assert "\r\r\n" not in content;
+        assert content.count("\r\n") == 4;
+        assert "⏫ B - renamed ✨\r\n" in content;
+
+
+if __name__ == "__main__":
+    for name, test in list(globals().items()):
+        if(name.startswith("test_")):
+            test();
+    print("OK");
@@ -0,0 +1,63 @@
+"""Test suite for the `TaskArchive.py` module
+
+    @author nrosenthal
+    @version 1.0
+    @since 2024-10-30
+"""
+import os;
+import sys;
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."));
+
+from datetime import datetime;
+from primitives.Task import ObsidianTask;
+from TaskArchive import TaskArchive;
+from TaskStorage import JSONTaskStorage, SQLiteTaskStorage;
+from Taskr import Taskr, TaskrStatus;
+import tempfile;
+
+
+#   Test data
+def makeStorages(directory:str) -> dict:
+    return {
+        "rewrite": JSONTaskStorage(os.path.join(directory, "rewrite")),
+        "journal": JSONTaskStorage(os.path.join(directory, "journal"), journal=True),
+        "sqlite": SQLiteTaskStorage(os.path.join(directory, "sqlite", "tasks.db")),
+    };
+
+
+def test_archive_removes_the_archived_task_of_a_shared_name():
+    with tempfile.TemporaryDirectory() as directory:
+        for mode, storage in makeStorages(directory).items():
+            taskr = Taskr(storage=storage, archive_directory=os.path.join(directory, mode + "-archive"));
+            #   The open task comes first by priority, so removing by name would remove it instead of the completed one
+            taskr.add_tasks([
+                ObsidianTask("report", "open", 1, datetime(2024, 12, 1), False, []),
+                ObsidianTask("report", "done", 4, datetime(2024, 9, 1), True, []),
+                ObsidianTask("other", "done", 3, datetime(2024, 9, 2), True, []),
+            ]);
+            assert taskr.archive_tasks(datetime(2024, 11, 1)) == TaskrStatus.SUCCESS, mode;
+            assert [(task.name, task.description) for task in storage.load()[0]] == [("report", "open")], mode;
+            assert [(task.name, task.description) for task in storage.iter_tasks()] == [("report", "open")], mode;
+            assert sorted(task.description for task in taskr.archive.iter_tasks()) == ["done", "done"], mode;
+
+
+def test_get_task_searches_newest_month_first_then_undated():
+    with tempfile.TemporaryDirectory() as directory:
+        archive = TaskArchive(directory);
+        archive.add([
+            ObsidianTask("report", "undated", 3, None, True, []),
+            ObsidianTask("report", "september", 3, datetime(2024, 9, 1), True, []),
+            ObsidianTask("report", "october", 3, datetime(2024, 10, 1), True, []),
+        ]);
+        assert archive.segments() == ["2024-09", "2024-10", "undated"];
+        assert archive.get_task("report").description == "october";
+        archive.add([ObsidianTask("lonely", "undated", 3, None, True, [])]);
+        assert archive.get_task("lonely").description == "undated";
+        assert archive.get_task("missing") == None;
+
+
+if __name__ == "__main__":
+    for name, test in list(globals().items()):
+        if(name.startswith("test_")):
+            test();
+    print("OK");
@@ -0,0 +1,114 @@
+"""Test suite for the completion bitmask, tag columns and reports of the `TaskColumns.py` module
+
+    @author nrosenthal
+    @version 1.0
+    @since 2024-10-30
+"""
+import os;
+import sys;
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."));
+
+from datetime import date, datetime, timedelta, timezone;
+from primitives.Task import ObsidianTask;
+from TaskColumns import TaskColumns;
+from TaskManager import TaskManager;
+import json;
+import random;
+import tempfile;
+
+
+#   Test data
+FIRST_DUE:datetime = datetime(2024, 10, 1);
+TAGS:list[str] = ["#work", "#home", "#urgent", "#later"];
+
+def makeTasks(count:int = 300, seed:int = 3) -> list[ObsidianTask]:
+    """Returns tasks with random priorities, tags, completion and due dates, some without a due date."""
+    rng = random.Random(seed);
+    tasks = [];
+    for i in range(count):
+        due_date = None if(i % 7 == 0) else FIRST_DUE + timedelta(days=rng.randrange(90), hours=rng.randrange(24));
+        tasks.append(ObsidianTask(f"task {i}", "", rng.randint(1, 5), due_date, rng.random() < 0.4, rng.sample(TAGS, rng.randrange(4))));
+    return tasks;
+
+def maskOf(tasks:list[ObsidianTask], keep) -> int:
+    """Returns the bitset of the tasks for which `keep` is true, computed row by row."""
+    return sum(1 << row for row, task in enumerate(tasks) if keep(task));
+
+
+#   Tests
+def test_completion_bitmask():
+    tasks = makeTasks();
+    columns = TaskColumns.from_tasks(tasks);
+    assert len(columns) == len(tasks);
+    assert len(columns.completed) == (len(tasks) + 7) // 8;
+    for row, task in enumerate(tasks):
+        assert columns.is_completed(row) == task.completed;
+    assert columns.completed_mask() == maskOf(tasks, lambda task: task.completed);
+    assert list(columns.rows(columns.completed_mask())) == [row for row, task in enumerate(tasks) if task.completed];
+    assert columns.count(completed=False) == sum(not task.completed for task in tasks);
+
+def test_tag_lookups():
+    tasks = makeTasks();
+    columns = TaskColumns.from_tasks(tasks);
+    assert len(columns.tag_offsets) == len(tasks) + 1;
+    for row, task in enumerate(tasks):
+        assert columns.get_tags(row) == task.tags;
+    for tag in TAGS:
+        assert columns.tag_mask(tag) == maskOf(tasks, lambda task: tag in task.tags);
+    assert columns.tag_mask("#missing") == 0;
+    assert columns.count_by_tag() == {tag: sum(tag in task.tags for task in tasks) for tag in columns.tags};
+
+def test_combined_filters():
+    tasks = makeTasks();
+    columns = TaskColumns.from_tasks(tasks);
+    start = FIRST_DUE + timedelta(days=20);
+    end = FIRST_DUE + timedelta(days=50);
+    def due(task:ObsidianTask) -> bool:
+        return task.due_date != None and start <= task.due_date < end;
+    assert columns.mask(priority=3, completed=False) == maskOf(tasks, lambda task: task.priority == 3 and not task.completed);
+    assert columns.mask(tags=["#work", "#home"]) == maskOf(tasks, lambda task: "#work" in task.tags and "#home" in task.tags);
+    assert columns.mask(any_tags=["#urgent", "#later"], completed=True) == maskOf(tasks, lambda task: task.completed and ("#urgent" in task.tags or "#later" in task.tags));
+    assert columns.mask(due_from=start, due_to=end) == maskOf(tasks, due);
+    assert columns.count(priority=5, tags=["#urgent"], due_from=start) == sum(task.priority == 5 and "#urgent" in task.tags and task.due_date != None and task.due_date >= start for task in tasks);
+    assert columns.count_by_priority(completed=False) == {priority: sum(task.priority == priority and not task.completed for task in tasks) for priority in range(1, 6)};
+    #   Masks are cached, and rebuilt after an append
+    before = columns.tag_mask("#work");
+    columns.append("task new", 1, None, False, ["#work"]);
+    assert columns.tag_mask("#work") == before | (1 << len(tasks));
+
+def test_open_by_priority_per_week():
+    tasks = makeTasks();
+    expected = {};
+    for task in tasks:
+        if(task.due_date == None):
+            continue;
+        monday = task.due_date.date() - timedelta(days=task.due_date.weekday());
+        expected.setdefault(monday, {priority: 0 for priority in range(1, 6)});
+        if(not task.completed):
+            expected[monday][task.priority] += 1;
+    assert TaskColumns.from_tasks(tasks).open_by_priority_per_week() == expected;
+    assert TaskColumns().open_by_priority_per_week() == {};
+
+def test_from_task_manager_and_file():
+    tasks = makeTasks(50);
+    task_manager = TaskManager.from_tasks(tasks);
+    columns = TaskColumns.from_task_manager(task_manager);
+    assert columns.names == [task.name for task in task_manager];
+    with tempfile.TemporaryDirectory() as directory:
+        path = os.path.join(directory, "tasks.json");
+        with open(path, "w") as f:
+            json.dump(task_manager.to_dict(), f);
+        loaded = TaskColumns.from_file(path);
+    assert loaded.names == columns.names;
+    assert loaded.completed_mask() == columns.completed_mask();
+    for row, task in enumerate(task_manager):
+        expected = None if(task.due_date == None) else datetime.combine(task.due_date.date(), datetime.min.time(), timezone.utc);
+        assert loaded.get_due_date(row) == expected;
+        assert loaded.get_tags(row) == task.tags;
+
+
+if __name__ == "__main__":
+    for name, test in list(globals().items()):
+        if(name.startswith("test_")):
+            test();
+    print("OK");
@@ -0,0 +1,121 @@
+"""Test suite for the persistent change feed of the `TaskFeed.py` module, and the shared task encoding of `TaskStream.py`
+
+    @author nrosenthal
+    @version 1.0
+    @since 2024-10-30
+"""
+import os;
+import sys;
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."));
+
+from datetime import datetime;
+from primitives.Task import Task, ObsidianTask;
+from TaskFeed import TaskFeed, TaskFeedGap;
+from TaskManager import TaskManager;
+from TaskStream import decode_task, encode_task;
+import json;
+import tempfile;
+
+
+#   Test data
+def makeTask(name:str, priority:int = 3, due_date:datetime | None = None, tags:list[str] | None = None) -> ObsidianTask:
+    return ObsidianTask(name, f"about {name}", priority, due_date, False, ["#feed"] if(tags == None) else tags);
+
+def changeTasks(task_manager:TaskManager) -> None:
+    """Makes one change of every kind, five in all."""
+    task_manager.add_task(makeTask("a", 2, datetime(2024, 10, 30)));
+    task_manager.add_task(makeTask("b"));
+    task_manager.complete_task(task_manager.get_task("a"));
+    task_manager.edit_task(task_manager.get_task("b"), priority=5, due_date=datetime(2024, 11, 2), tags=["#moved"]);
+    task_manager.remove_task(task_manager.get_task("a"));
+
+def summary(events) -> list[tuple]:
+    return [(event.seq, event.op, event.task.name) for event in events];
+
+
+#   Tests
+def test_since():
+    with tempfile.TemporaryDirectory() as directory:
+        feed = TaskFeed(os.path.join(directory, "tasks.feed"));
+        task_manager = TaskManager();
+        feed.attach(task_manager);
+        changeTasks(task_manager);
+        assert feed.last_seq == 5;
+        assert summary(feed.since(0)) == [(1, "add", "a"), (2, "add", "b"), (3, "complete", "a"), (4, "edit", "b"), (5, "remove", "a")];
+        assert summary(feed.since(3)) == [(4, "edit", "b"), (5, "remove", "a")];
+        assert list(feed.since(5)) == [];
+        #   A feed reopened after a restart keeps numbering where it stopped
+        feed.detach(task_manager);
+        task_manager.add_task(makeTask("ignored"));
+        reopened = TaskFeed(feed.log.path);
+        reopened.attach(task_manager);
+        task_manager.add_task(makeTask("c"));
+        assert summary(reopened.since(5)) == [(6, "add", "c")];
+
+def test_edit_events():
+    with tempfile.TemporaryDirectory() as directory:
+        feed = TaskFeed(os.path.join(directory, "tasks.feed"));
+        task_manager = TaskManager();
+        feed.attach(task_manager);
+        changeTasks(task_manager);
+        edit = [event for event in feed.since(0) if event.op == "edit"][0];
+        assert edit.previous == {"priority": 3, "due_date": None, "tags": ["#feed"]};
+        assert (edit.task.priority, edit.task.due_date, edit.task.tags) == (5, datetime(2024, 11, 2), ["#moved"]);
+        task_manager.edit_task(task_manager.get_task("b"), due_date=datetime(2024, 12, 1));
+        assert list(feed.since(5))[0].previous == {"due_date": datetime(2024, 11, 2)};
+
+def test_buffered_feed():
+    with tempfile.TemporaryDirectory() as directory:
+        feed = TaskFeed(os.path.join(directory, "tasks.feed"), buffered=True);
+        task_manager = TaskManager();
+        feed.attach(task_manager);
+        changeTasks(task_manager);
+        assert list(feed.since(0)) == [];
+        assert feed.flush() == 5;
+        with open(feed.log.path) as f:
+            assert len(f.readlines()) == 5;
+
+def test_truncate_and_gaps():
+    with tempfile.TemporaryDirectory() as directory:
+        feed = TaskFeed(os.path.join(directory, "tasks.feed"));
+        task_manager = TaskManager();
+        feed.attach(task_manager);
+        changeTasks(task_manager);
+        feed.truncate();
+        assert feed.last_seq == 5;
+        assert list(feed.since(5)) == [];
+        #   A consumer that missed events before the truncation must rebuild its view
+        for seq in (0, 4):
+            try:
+                list(feed.since(seq));
+                assert False;
+            except TaskFeedGap:
+                pass;
+        task_manager.add_task(makeTask("c"));
+        assert summary(feed.since(5)) == [(6, "add", "c")];
+
+def test_task_encoding():
+    tasks = [
+        makeTask("a", 4, datetime(2024, 10, 30, 15, 0), ["#x", "#y"]),
+        makeTask("b"),
+        Task("plain", "no tags", 1, None, True)
+    ];
+    for task in tasks:
+        data = json.loads(json.dumps(encode_task(task)));
+        decoded = decode_task(data);
+        assert type(decoded) == type(task);
+        assert (decoded.name, decoded.description, decoded.priority, decoded.completed) == (task.name, task.description, task.priority, task.completed);
+        assert decoded.due_date == (None if(task.due_date == None) else datetime(task.due_date.year, task.due_date.month, task.due_date.day));
+        assert getattr(decoded, "tags", None) == getattr(task, "tags", None);
+    assert encode_task(tasks[0])["due_date"] == "2024-10-30";
+    assert encode_task(tasks[1])["due_date"] == None;
+    #   Task file forms and older records, with the due marker, still decode
+    assert decode_task(tasks[0].to_dict()).due_date == datetime(2024, 10, 30);
+    assert decode_task({**encode_task(tasks[1]), "due_date": ""}).due_date == None;
+
+
+if __name__ == "__main__":
+    for name, test in list(globals().items()):
+        if(name.startswith("test_")):
+            test();
+    print("OK");
@@ -0,0 +1,134 @@
+"""Test suite for the journal replay and compaction of the `TaskJournal.py` and `TaskStorage.py` modules
+
+    @author nrosenthal
+    @version 1.0
+    @since 2024-10-30
+"""
+import os;
+import sys;
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."));
+
+from primitives.Task import ObsidianTask;
+from TaskJournal import TaskJournal, write_atomic;
+from TaskManager import TaskManager;
+from TaskStorage import JSONTaskStorage;
+import json;
+import tempfile;
+
+
+#   Test data
+def addRecord(name:str, priority:int = 3) -> dict:
+    return {"op": "add", "task": ObsidianTask(name, "", priority, None, False, []).to_dict()};
+
+def names(task_manager:TaskManager) -> list[str]:
+    return sorted(task.name for task in task_manager);
+
+
+def test_journal_numbers_and_replays_records():
+    with tempfile.TemporaryDirectory() as directory:
+        journal = TaskJournal(os.path.join(directory, "tasks.journal"));
+        assert journal.append(addRecord("A")) == 1;
+        assert journal.extend([addRecord("B"), {"op": "complete", "name": "A"}, {"op": "remove", "name": "B"}]) == 4;
+        assert [record["seq"] for record in journal.records()] == [1, 2, 3, 4];
+        assert len(journal) == 4;
+        task_manager = TaskManager();
+        assert journal.replay(task_manager) == 4;
+        assert names(task_manager) == ["A"];
+        assert task_manager.get_task("A").completed;
+        #   Records already folded into the task file are skipped
+        task_manager = TaskManager();
+        assert journal.replay(task_manager, after=2) == 4;
+        assert names(task_manager) == [];
+
+
+def test_journal_ignores_torn_records():
+    with tempfile.TemporaryDirectory() as directory:
+        journal = TaskJournal(os.path.join(directory, "tasks.journal"));
+        journal.extend([addRecord("A"), addRecord("B")]);
+        with open(journal.path, "a") as f:
+            f.write('{"seq": 3, "op": "add", "ta');
+        task_manager = TaskManager();
+        assert journal.replay(task_manager) == 2;
+        assert names(task_manager) == ["A", "B"];
+        #   The next record starts on its own line instead of being glued to the torn one
+        assert journal.append(addRecord("C")) == 3;
+        task_manager = TaskManager();
+        journal.replay(task_manager);
+        assert names(task_manager) == ["A", "B", "C"];
+
+
+def test_journal_numbers_records_after_a_torn_first_line():
+    with tempfile.TemporaryDirectory() as directory:
+        journal = TaskJournal(os.path.join(directory, "tasks.journal"));
+        with open(journal.path, "w") as f:
+            f.write('{"seq": 1, "op": "add", "ta');
+        assert journal.append(addRecord("A")) == 1;
+        assert journal.append(addRecord("B")) == 2;
+        assert len(journal) == 2;
+        task_manager = TaskManager();
+        assert journal.replay(task_manager) == 2;
+        assert names(task_manager) == ["A", "B"];
+
+def test_journal_reset_keeps_sequence():
+    with tempfile.TemporaryDirectory() as directory:
+        journal = TaskJournal(os.path.join(directory, "tasks.journal"));
+        journal.extend([addRecord("A"), addRecord("B")]);
+        journal.reset(2);
+        assert len(journal) == 0;
+        assert journal.last_seq == 2;
+        assert journal.append(addRecord("C")) == 3;
+        assert len(journal) == 1;
+
+
+def test_storage_replays_journal_on_load():
+    with tempfile.TemporaryDirectory() as directory:
+        storage = JSONTaskStorage(directory, journal=True);
+        storage.prepare();
+        assert storage.commit([addRecord("A"), addRecord("B", 4)]) != None;
+        assert storage.commit([{"op": "complete", "name": "B"}]) != None;
+        assert len(storage.journal) == 3;
+        with open(storage.path) as f:
+            assert json.load(f)["tasks"] == [];
+        task_manager, version = storage.load();
+        assert [task.name for task in task_manager] == ["A", "B"];
+        assert task_manager.get_task("B").completed;
+        assert version == (0, 3);
+
+
+def test_storage_compacts_at_threshold():
+    with tempfile.TemporaryDirectory() as directory:
+        storage = JSONTaskStorage(directory, journal=True, compaction_threshold=3);
+        storage.prepare();
+        storage.commit([addRecord("A"), addRecord("B")]);
+        assert len(storage.journal) == 2;
+        storage.commit([{"op": "remove", "name": "A"}]);
+        assert len(storage.journal) == 0;
+        with open(storage.path) as f:
+            data = json.load(f);
+        assert (data["version"], data["seq"]) == (1, 3);
+        assert [task["name"] for task in data["tasks"]] == ["B"];
+        storage.commit([addRecord("C")]);
+        assert storage.journal.last_seq == 4;
+        assert names(storage.load()[0]) == ["B", "C"];
+
+
+def test_storage_skips_records_folded_before_a_crash():
+    with tempfile.TemporaryDirectory() as directory:
+        storage = JSONTaskStorage(directory, journal=True);
+        storage.prepare();
+        storage.commit([addRecord("A"), addRecord("B")]);
+        #   The task file was written with the journal folded in, but the journal was not reset
+        task_manager, version = storage.load();
+        write_atomic(storage.path, json.dumps({"version": 2, "seq": version[1], **task_manager.to_dict()}));
+        assert len(storage.journal) == 2;
+        assert names(storage.load()[0]) == ["A", "B"];
+        storage.compact();
+        assert len(storage.journal) == 0;
+        assert names(storage.load()[0]) == ["A", "B"];
+
+
+if __name__ == "__main__":
+    for name, test in list(globals().items()):
+        if(name.startswith("test_")):
+            test();
+    print("OK");
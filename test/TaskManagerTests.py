@@ -0,0 +1,118 @@
+"""Test suite for the name, tag and due date indexes of the `TaskManager.py` module
+
+    @author nrosenthal
+    @version 1.0
+    @since 2024-10-30
+"""
+import os;
+import sys;
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."));
+
+from datetime import datetime, timedelta;
+from primitives.Task import ObsidianTask;
+from TaskManager import TaskManager;
+import random;
+
+
+#   Test data
+FIRST_DUE:datetime = datetime(2024, 10, 1);
+
+def makeTasks(count:int = 200, seed:int = 7) -> list[ObsidianTask]:
+    """Returns tasks with repeated names, random priorities, random tags and some without a due date."""
+    rng = random.Random(seed);
+    tasks = [];
+    for i in range(count):
+        due_date = None if(i % 5 == 0) else FIRST_DUE + timedelta(days=rng.randrange(60));
+        tags = rng.sample(["#work", "#home", "#urgent", "#later"], rng.randrange(3));
+        tasks.append(ObsidianTask(f"task {i % 50}", f"description {i}", rng.randint(1, 5), due_date, i % 3 == 0, tags));
+    return tasks;
+
+
+def test_add_task_keeps_priority_order():
+    task_manager = TaskManager();
+    tasks = makeTasks();
+    for task in tasks:
+        task_manager.add_task(task);
+    assert [task.priority for task in task_manager] == sorted(task.priority for task in tasks);
+    #   Tasks of the same priority keep their insertion order
+    for priority in range(1, 6):
+        assert [task for task in task_manager if task.priority == priority] == [task for task in tasks if task.priority == priority];
+
+
+def test_get_task_by_name():
+    tasks = makeTasks();
+    task_manager = TaskManager.from_tasks(tasks);
+    for name in {task.name for task in tasks}:
+        expected = next(task for task in task_manager if task.name == name);
+        assert task_manager.get_task(name) is expected;
+    assert task_manager.get_task("missing") == None;
+
+
+def test_get_by_tag():
+    tasks = makeTasks();
+    task_manager = TaskManager.from_tasks(tasks);
+    for tag in ("#work", "#home", "#urgent", "#later"):
+        expected = [task for task in task_manager if tag in task.tags];
+        assert task_manager.get_by_tag(tag) == expected;
+        assert task_manager.get_tags().get(tag, 0) == len(expected);
+    assert task_manager.get_by_tags(["#work", "#home"]) == [task for task in task_manager if "#work" in task.tags and "#home" in task.tags];
+    found = task_manager.get_by_tags(["#work", "#home"], "any");
+    assert sorted(map(id, found)) == sorted(id(task) for task in tasks if "#work" in task.tags or "#home" in task.tags);
+    assert [task.priority for task in found] == sorted(task.priority for task in found);
+
+
+def test_due_between():
+    tasks = makeTasks();
+    task_manager = TaskManager.from_tasks(tasks);
+    start = FIRST_DUE + timedelta(days=10);
+    end = FIRST_DUE + timedelta(days=20);
+    found = task_manager.due_between(start, end);
+    assert sorted(map(id, found)) == sorted(id(task) for task in tasks if task.due_date != None and start <= task.due_date < end);
+    assert [task.due_date for task in found] == sorted(task.due_date for task in found);
+    assert sorted(map(id, task_manager.get_undated())) == sorted(id(task) for task in tasks if task.due_date == None);
+    now = FIRST_DUE + timedelta(days=30);
+    assert all(task.due_date < now and not task.completed for task in task_manager.overdue(now));
+    assert [task.due_date for task in task_manager.next_due(5, now)] == sorted(task.due_date for task in tasks if task.due_date != None and task.due_date >= now and not task.completed)[:5];
+
+
+def test_remove_task_updates_indexes():
+    tasks = makeTasks();
+    task_manager = TaskManager.from_tasks(tasks);
+    for task in tasks[::2]:
+        task_manager.remove_task(task);
+    remaining = tasks[1::2];
+    assert len(task_manager) == len(remaining);
+    for task in tasks[::2]:
+        assert task not in task_manager or any(other == task for other in remaining);
+    for tag in ("#work", "#home", "#urgent", "#later"):
+        assert sorted(map(id, task_manager.get_by_tag(tag))) == sorted(id(task) for task in remaining if tag in task.tags);
+    assert sorted(map(id, task_manager.due_between(datetime.min, datetime.max))) == sorted(id(task) for task in remaining if task.due_date != None);
+    assert sorted(map(id, task_manager.get_undated())) == sorted(id(task) for task in remaining if task.due_date == None);
+
+
+def test_remove_task_with_duplicate_names_removes_that_task():
+    first = ObsidianTask("same", "first", 3, FIRST_DUE, False, ["#a"]);
+    second = ObsidianTask("same", "second", 3, None, True, ["#b"]);
+    task_manager = TaskManager.from_tasks([first, second]);
+    task_manager.remove_task(second);
+    assert task_manager.get_tasks() == [first];
+    assert task_manager.get_by_tag("#b") == [];
+    assert task_manager.get_undated() == [];
+
+
+def test_edit_task_moves_indexes():
+    task = ObsidianTask("edited", "", 1, FIRST_DUE, False, ["#old"]);
+    task_manager = TaskManager.from_tasks(makeTasks(20) + [task]);
+    task_manager.edit_task(task, priority=5, due_date=None, tags=["#new"]);
+    assert task_manager.get_tasks()[-1] is task;
+    assert task_manager.get_by_tag("#old") == [];
+    assert task_manager.get_by_tag("#new") == [task];
+    assert task in task_manager.get_undated();
+    assert task not in task_manager.due_between(datetime.min, datetime.max);
+
+
+if __name__ == "__main__":
+    for name, test in list(globals().items()):
+        if(name.startswith("test_")):
+            test();
+    print("OK");
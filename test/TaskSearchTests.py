@@ -0,0 +1,105 @@
+"""Test suite for the full-text index of the `TaskSearch.py` module
+
+    @author nrosenthal
+    @version 1.0
+    @since 2024-10-30
+"""
+import os;
+import sys;
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."));
+
+from primitives.Task import Task;
+from TaskManager import TaskManager;
+from TaskSearch import TaskSearch, normalize, tokenize;
+
+
+#   Test data
+def makeTasks() -> list[Task]:
+    return [
+        Task("Reunião de projeto", "Preparar a ação do trimestre", 2, None, False),
+        Task("Relatório", "Enviar o relatório do projeto", 1, None, False),
+        Task("Compras", "Café e pão", 3, None, True),
+        Task("ＦＵＬＬＷＩＤＴＨ", "Straße", 3, None, False)
+    ];
+
+def names(tasks:list[Task]) -> list[str]:
+    return [task.name for task in tasks];
+
+
+#   Tests
+def test_normalization():
+    assert normalize("Ação") == "acao";
+    assert normalize("ＦＵＬＬ") == "full";
+    assert normalize("Straße") == "strasse";
+    assert tokenize("Reunião, de PROJETO!") == ["reuniao", "de", "projeto"];
+    search = TaskSearch(makeTasks());
+    for query in ("acao", "ACAO", "Ação", "AÇÃO"):
+        assert names(search.search(query)) == ["Reunião de projeto"];
+    assert names(search.search("fullwidth")) == ["ＦＵＬＬＷＩＤＴＨ"];
+    assert names(search.search("STRASSE")) == ["ＦＵＬＬＷＩＤＴＨ"];
+    assert names(search.search("cafe")) == ["Compras"];
+
+def test_prefix_expansion():
+    search = TaskSearch(makeTasks());
+    assert names(search.search("reun")) == ["Reunião de projeto"];
+    assert names(search.search("rel")) == ["Relatório"];
+    assert set(names(search.search("re"))) == {"Reunião de projeto", "Relatório"};
+    assert search.search("reuniaox") == [];
+    assert search.search("zzz") == [];
+    assert search.search("") == [];
+
+def test_every_word_must_match():
+    search = TaskSearch(makeTasks());
+    assert set(names(search.search("projeto"))) == {"Reunião de projeto", "Relatório"};
+    assert names(search.search("projeto trimestre")) == ["Reunião de projeto"];
+    assert names(search.search("proj envi")) == ["Relatório"];
+    assert search.search("projeto cafe") == [];
+    assert names(search.search("cafe pao", include_completed=False)) == [];
+
+def test_ranking():
+    tasks = [
+        Task("Plano", "revisar o orçamento", 1, None, False),
+        Task("Orçamento", "revisar o plano", 5, None, False),
+        Task("Orçamentos antigos", "arquivar", 1, None, False),
+        Task("Nota", "orçamento", 1, None, False)
+    ];
+    search = TaskSearch(tasks);
+    #   A word in the name beats one in the description, and a whole word beats a prefix match in the name
+    assert names(search.search("orcamento")) == ["Orçamento", "Orçamentos antigos", "Nota", "Plano"];
+    #   Rare words count more than common ones
+    search = TaskSearch([Task("alpha beta", "", 1, None, False), Task("alpha", "", 1, None, False), Task("alpha gamma", "", 1, None, False), Task("beta", "", 1, None, False)]);
+    assert names(search.search("alpha gamma")) == ["alpha gamma"];
+    assert names(search.search("a"))[:1] == ["alpha"];
+    #   Ties are broken by priority and then by name
+    search = TaskSearch([Task("b tie", "", 2, None, False), Task("a tie", "", 2, None, False), Task("c tie", "", 1, None, False)]);
+    assert names(search.search("tie")) == ["c tie", "a tie", "b tie"];
+    assert names(search.search("tie", limit=2)) == ["c tie", "a tie"];
+
+def test_follows_task_manager():
+    task_manager = TaskManager();
+    task_manager.add_tasks(makeTasks()[:2]);
+    search = TaskSearch.from_task_manager(task_manager);
+    assert len(search) == 2;
+    #   Added tasks are indexed
+    task_manager.add_task(Task("Dentista", "Marcar consulta", 1, None, False));
+    assert names(search.search("consul")) == ["Dentista"];
+    #   Edited tasks are indexed again under their new words
+    task_manager.edit_task(task_manager.get_task("Dentista"), description="Remarcar a consulta");
+    assert names(search.search("remarcar")) == ["Dentista"];
+    assert names(search.search("marcar")) == [];
+    task_manager.edit_task(task_manager.get_task("Dentista"), name="Médico");
+    assert names(search.search("medico consulta")) == ["Médico"];
+    assert search.search("dentista") == [];
+    #   Removed tasks are dropped, along with the words only they contained
+    task_manager.remove_task(task_manager.get_task("Médico"));
+    assert search.search("medico") == [];
+    assert len(search) == 2;
+    assert "medico" not in search.words and "remarcar" not in search.postings;
+    assert search.words == sorted(search.postings);
+
+
+if __name__ == "__main__":
+    for name, test in list(globals().items()):
+        if(name.startswith("test_")):
+            test();
+    print("OK");
@@ -0,0 +1,138 @@
+"""Test suite for the `TaskSnapshot.py` module, and its use by `TaskStorage.py` and `TaskrCLI.py`
+
+    @author nrosenthal
+    @version 1.0
+    @since 2024-10-30
+"""
+import os;
+import sys;
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."));
+
+from contextlib import redirect_stdout;
+from datetime import datetime, timedelta, timezone, tzinfo;
+from primitives.Task import Task, ObsidianTask;
+from TaskManager import TaskManager;
+from TaskSnapshot import TaskSnapshot, TaskSnapshotError, write_snapshot;
+from TaskStorage import JSONTaskStorage;
+from zoneinfo import ZoneInfo;
+import io;
+import json;
+import tempfile;
+import TaskrCLI;
+
+
+#   Test data
+def makeTasks() -> list[Task]:
+    """Returns tasks with every kind of due date, repeated names, tags and non-ASCII text."""
+    return [
+        ObsidianTask("Ligar para a mãe", "Domingo à tarde", 4, datetime(2024, 10, 30, 17, 45, 12, 345678), False, ["#família", "#casa"]),
+        ObsidianTask("Pay rent", "", 5, datetime(2024, 11, 1, 9, 30, 0, 1, tzinfo=timezone(timedelta(hours=-3))), True, ["#casa"]),
+        ObsidianTask("Dentist", "Check-up", 2, datetime(2024, 11, 3, 1, 30, tzinfo=ZoneInfo("America/New_York"), fold=1), False, []),
+        ObsidianTask("Pay rent", "second", 1, None, False, ["#casa"]),
+        Task("Plain", "no tags", 3, datetime(1969, 12, 31, 23, 59, 59, 999999, tzinfo=timezone.utc), False),
+        ObsidianTask("Big priority", "", 1000, None, False, [])
+    ];
+
+def fields(task:Task) -> tuple:
+    return (type(task), task.name, task.description, task.priority, task.due_date, task.due_date and task.due_date.utcoffset(), task.completed, getattr(task, "tags", None));
+
+
+#   Tests
+def test_round_trip():
+    tasks = makeTasks();
+    with tempfile.TemporaryDirectory() as directory:
+        path = os.path.join(directory, "tasks.snapshot");
+        assert write_snapshot(path, tasks, (3, 7)) == len(tasks);
+        with TaskSnapshot(path) as snapshot:
+            assert snapshot.stamp == (3, 7);
+            assert len(snapshot) == len(tasks);
+            assert [fields(task) for task in snapshot] == [fields(task) for task in tasks];
+            assert fields(snapshot[-1]) == fields(tasks[-1]);
+            assert snapshot[2].due_date.fold == 1 and snapshot[2].due_date.tzinfo == ZoneInfo("America/New_York");
+            try:
+                snapshot[len(tasks)];
+                assert False;
+            except IndexError:
+                pass;
+
+def test_name_lookup():
+    tasks = makeTasks();
+    with tempfile.TemporaryDirectory() as directory:
+        path = os.path.join(directory, "tasks.snapshot");
+        write_snapshot(path, tasks);
+        with TaskSnapshot(path) as snapshot:
+            for task in tasks:
+                #   Equal names give the first task written
+                assert fields(snapshot.get(task.name)) == fields(next(other for other in tasks if other.name == task.name));
+            assert snapshot.get("Pay rent").description == "";
+            assert snapshot.get("missing") == None;
+            assert "Plain" in snapshot and "Pla" not in snapshot;
+        write_snapshot(path, []);
+        with TaskSnapshot(path) as snapshot:
+            assert len(snapshot) == 0 and list(snapshot) == [] and snapshot.get("Plain") == None;
+
+class Shifted(tzinfo):
+    def utcoffset(self, moment):
+        return timedelta(hours=1);
+
+def test_rejects_what_it_cannot_store():
+    with tempfile.TemporaryDirectory() as directory:
+        path = os.path.join(directory, "tasks.snapshot");
+        for task in (Task("a", "", 1 << 31, None, False), Task("b", "", 1, datetime(2024, 1, 1, tzinfo=Shifted()), False)):
+            try:
+                write_snapshot(path, [task]);
+                assert False;
+            except ValueError:
+                pass;
+        assert not os.path.exists(path);
+        with open(path, "wb") as f:
+            f.write(b"TSNP\x01\x00" + bytes(200));
+        try:
+            TaskSnapshot(path);
+            assert False;
+        except TaskSnapshotError:
+            pass;
+
+def test_storage_keeps_snapshot_current():
+    with tempfile.TemporaryDirectory() as directory:
+        storage = JSONTaskStorage(directory, journal=True);
+        storage.prepare();
+        storage.commit([{"op": "add", "task": task.to_dict()} for task in makeTasks() if isinstance(task, ObsidianTask)]);
+        #   The journal holds tasks the snapshot does not
+        assert storage.snapshot() == None;
+        storage.compact();
+        task_manager = storage.load()[0];
+        with storage.snapshot() as snapshot:
+            assert [fields(task) for task in snapshot] == [fields(task) for task in task_manager];
+        assert fields(storage.get_task("Pay rent")) == fields(task_manager.get_task("Pay rent"));
+        storage.commit([{"op": "complete", "name": "Dentist"}]);
+        assert storage.snapshot() == None;
+        assert storage.get_task("Dentist").completed;
+
+def test_cli_reads_the_snapshot():
+    with tempfile.TemporaryDirectory() as directory:
+        storage = JSONTaskStorage(directory);
+        storage.prepare();
+        storage.commit([{"op": "add", "task": ObsidianTask(name, "", priority, None, False, ["#work"]).to_dict()} for name, priority in (("A", 2), ("B", 5))]);
+        def output(*argv:str) -> list[str]:
+            out = io.StringIO();
+            with redirect_stdout(out):
+                assert TaskrCLI.main(["--directory", directory, *argv]) == 0;
+            return out.getvalue().splitlines();
+        expected = output("list", "--json");
+        assert [json.loads(line)["name"] for line in expected] == ["A", "B"];
+        #   Only the header of the task file is read: the tasks come from the snapshot
+        with open(storage.path) as f:
+            text = f.read();
+        with open(storage.path, "w") as f:
+            f.write(text[:text.index('"tasks"')] + "broken");
+        assert output("list", "--json") == expected;
+        assert output("query", "--tags", "#work", "--priority", "5", "--json") == expected[1:];
+        assert len(output("get", "B")) == 1;
+
+
+if __name__ == "__main__":
+    for name, test in list(globals().items()):
+        if(name.startswith("test_")):
+            test();
+    print("OK");
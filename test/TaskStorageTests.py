@@ -0,0 +1,145 @@
+"""Test suite for the backends of the `TaskStorage.py` module
+
+    @author nrosenthal
+    @version 1.0
+    @since 2024-10-30
+"""
+import os;
+import sys;
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."));
+
+from datetime import datetime, timedelta, timezone;
+import sqlite3;
+from primitives.Task import ObsidianTask;
+from TaskStorage import JSONTaskStorage, SQLiteTaskStorage;
+from Taskr import Taskr, TaskrStatus;
+import tempfile;
+
+
+#   Test data
+TASKS:list[ObsidianTask] = [
+    ObsidianTask("A", "first", 3, datetime(2024, 10, 30), False, ["#work"]),
+    ObsidianTask("B", "second", 4, None, False, []),
+];
+
+def makeStorages(directory:str) -> dict:
+    """Returns a storage of every backend, each holding `TASKS`."""
+    storages = {
+        "rewrite": JSONTaskStorage(os.path.join(directory, "rewrite")),
+        "journal": JSONTaskStorage(os.path.join(directory, "journal"), journal=True),
+        "sqlite": SQLiteTaskStorage(os.path.join(directory, "tasks.db")),
+    };
+    for storage in storages.values():
+        storage.prepare();
+        assert storage.commit([{"op": "add", "task": task.to_dict()} for task in TASKS]) != None;
+    return storages;
+
+def snapshot(storage) -> list[dict]:
+    return [task.to_dict() for task in storage.load()[0]];
+
+
+def test_backends_agree_on_missing_tasks():
+    with tempfile.TemporaryDirectory() as directory:
+        for mode, storage in makeStorages(directory).items():
+            taskr = Taskr(storage=storage);
+            before = snapshot(storage);
+            assert taskr.remove_task(ObsidianTask("missing", "", 3, None, False, [])) == TaskrStatus.FAILURE, mode;
+            assert taskr.complete_task(ObsidianTask("missing", "", 3, None, False, [])) == TaskrStatus.FAILURE, mode;
+            assert snapshot(storage) == before, mode;
+            assert taskr.remove_task(TASKS[0]) == TaskrStatus.SUCCESS, mode;
+            assert [task.name for task in storage.load()[0]] == ["B"], mode;
+
+
+def test_commit_is_all_or_nothing():
+    with tempfile.TemporaryDirectory() as directory:
+        for mode, storage in makeStorages(directory).items():
+            before = snapshot(storage);
+            records = [{"op": "add", "task": ObsidianTask("C", "", 3, None, False, []).to_dict()}, {"op": "complete", "name": "A"}, {"op": "remove", "name": "missing"}];
+            assert storage.commit(records) == None, mode;
+            assert snapshot(storage) == before, mode;
+
+
+def test_journal_keeps_no_invalid_records():
+    with tempfile.TemporaryDirectory() as directory:
+        storage = makeStorages(directory)["journal"];
+        pending = len(storage.journal);
+        assert storage.commit([{"op": "remove", "name": "missing"}]) == None;
+        assert len(storage.journal) == pending;
+        assert storage.commit([{"op": "remove", "name": "A"}]) != None;
+        assert len(storage.journal) == pending + 1;
+
+
+def test_sqlite_due_between_orders_by_instant():
+    east = timezone(timedelta(hours=3));
+    west = timezone(timedelta(hours=-5));
+    #   As text, "2024-10-30T08:00:00+03:00" sorts before "2024-10-30T09:00:00-05:00", but it is 5:00 UTC against 14:00 UTC
+    tasks = [
+        ObsidianTask("late", "", 3, datetime(2024, 10, 30, 9, tzinfo=west), False, []),
+        ObsidianTask("early", "", 3, datetime(2024, 10, 30, 8, tzinfo=east), False, []),
+        ObsidianTask("middle", "", 3, datetime(2024, 10, 30, 10, tzinfo=timezone.utc), False, []),
+    ];
+    with tempfile.TemporaryDirectory() as directory:
+        storage = SQLiteTaskStorage(os.path.join(directory, "tasks.db"));
+        storage.prepare();
+        #   `to_dict` only keeps the day of a due date, so the records carry the datetimes themselves
+        assert storage.commit([{"op": "add", "task": {**task.to_dict(), "due_date": task.due_date}} for task in tasks]) != None;
+        found = storage.due_between(datetime(2024, 10, 30, 4, tzinfo=timezone.utc), datetime(2024, 10, 30, 12, tzinfo=timezone.utc));
+        assert [task.name for task in found] == ["early", "middle"];
+        found = storage.due_between(datetime(2024, 10, 29), datetime(2024, 10, 31));
+        assert [task.name for task in found] == ["early", "middle", "late"];
+        storage.close();
+
+
+def test_sqlite_migrates_due_epoch():
+    with tempfile.TemporaryDirectory() as directory:
+        path = os.path.join(directory, "tasks.db");
+        connection = sqlite3.connect(path);
+        connection.executescript("""
+            CREATE TABLE tasks (id INTEGER PRIMARY KEY AUTOINCREMENT, name TEXT NOT NULL, description TEXT NOT NULL, priority INTEGER NOT NULL, due_date TEXT, completed INTEGER NOT NULL);
+            CREATE INDEX tasks_due_date ON tasks(due_date);
+            INSERT INTO tasks (name, description, priority, due_date, completed) VALUES ('old', '', 3, '2024-10-30T00:00:00', 0);
+        """);
+        connection.commit();
+        connection.close();
+        storage = SQLiteTaskStorage(path);
+        storage.prepare();
+        assert [task.name for task in storage.due_between(datetime(2024, 10, 30), datetime(2024, 10, 31))] == ["old"];
+        storage.close();
+
+
+def test_session_flush_does_not_reload():
+    with tempfile.TemporaryDirectory() as directory:
+        for mode, storage in makeStorages(directory).items():
+            loads = [];
+            load = storage.load;
+            storage.load = lambda: loads.append(1) or load();
+            with Taskr(storage=storage).session(autosave_every=2) as session:
+                for i in range(6):
+                    assert session.add_task(ObsidianTask(f"T{i}", "", 3, None, False, [])) == TaskrStatus.SUCCESS, mode;
+            assert len(loads) == 1, mode;
+            storage.load = load;
+            assert sorted(task.name for task in storage.load()[0]) == ["A", "B"] + [f"T{i}" for i in range(6)], mode;
+
+
+def test_session_flush_keeps_other_writers():
+    with tempfile.TemporaryDirectory() as directory:
+        for mode, storage in makeStorages(directory).items():
+            session = Taskr(storage=storage).session().open();
+            assert session.complete_task(TASKS[0]) == TaskrStatus.SUCCESS;
+            assert session.flush() == TaskrStatus.SUCCESS;
+            #   Another writer changes the storage between two flushes of the session
+            assert Taskr(storage=storage).remove_task(TASKS[1]) == TaskrStatus.SUCCESS, mode;
+            assert session.add_task(ObsidianTask("C", "", 3, None, False, [])) == TaskrStatus.SUCCESS;
+            assert session.flush() == TaskrStatus.SUCCESS;
+            assert session.add_task(ObsidianTask("D", "", 3, None, False, [])) == TaskrStatus.SUCCESS;
+            assert session.flush() == TaskrStatus.SUCCESS;
+            tasks = {task.name: task for task in storage.load()[0]};
+            assert sorted(tasks) == ["A", "C", "D"], mode;
+            assert tasks["A"].completed, mode;
+
+
+if __name__ == "__main__":
+    for name, test in list(globals().items()):
+        if(name.startswith("test_")):
+            test();
+    print("OK");
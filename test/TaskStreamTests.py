@@ -0,0 +1,93 @@
+"""Test suite for the streaming task file reader of the `TaskStream.py` module
+
+    @author nrosenthal
+    @version 1.0
+    @since 2024-10-30
+"""
+import os;
+import sys;
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."));
+
+from datetime import datetime, timedelta;
+from io import StringIO;
+from primitives.Task import ObsidianTask, Task;
+from TaskStorage import JSONTaskStorage;
+from TaskStream import TaskStreamError, iter_task_dicts, iter_tasks;
+import json;
+import tempfile;
+
+
+#   Test data
+def makeTaskFile(count:int = 50) -> dict:
+    """Returns the data of a task file with a header, tasks with and without tags, and values that span chunks."""
+    tasks = [];
+    for i in range(count):
+        if(i % 7 == 0):
+            tasks.append(Task(f"plain {i}", "no tags", 2, None, False).to_dict());
+        else:
+            due_date = datetime(2024, 10, 1) + timedelta(days=i);
+            tasks.append(ObsidianTask(f"task {i}", "é ✨ \" , ] }" * (i % 4), i % 5 + 1, due_date, i % 2 == 0, [f"#tag{i % 3}"]).to_dict());
+    return {"version": 12345678901, "seq": 42, "tasks": tasks};
+
+
+def test_iter_task_dicts_matches_json():
+    data = makeTaskFile();
+    text = json.dumps(data, ensure_ascii=False);
+    for chunk_size in (1, 2, 3, 7, 64, 1 << 16):
+        header = {};
+        assert list(iter_task_dicts(StringIO(text), header, chunk_size)) == data["tasks"];
+        assert header == {"version": 12345678901, "seq": 42};
+
+
+def test_iter_task_dicts_reads_indented_and_empty_files():
+    data = makeTaskFile(5);
+    assert list(iter_task_dicts(StringIO(json.dumps(data, indent=4)), None, 5)) == data["tasks"];
+    assert list(iter_task_dicts(StringIO('{"tasks": []}'))) == [];
+    assert list(iter_task_dicts(StringIO(' { "tasks" : [ ] } '), None, 1)) == [];
+
+
+def test_iter_task_dicts_rejects_invalid_files():
+    for text in ('[]', '{"version": 1}', '{"tasks": {}}'):
+        try:
+            list(iter_task_dicts(StringIO(text)));
+        except TaskStreamError:
+            continue;
+        assert False, text;
+    try:
+        list(iter_task_dicts(StringIO('{"tasks": [{"name": "trunc'), None, 4));
+        assert False;
+    except json.JSONDecodeError:
+        pass;
+
+
+def test_iter_tasks_matches_from_dict():
+    data = makeTaskFile();
+    with tempfile.TemporaryDirectory() as directory:
+        path = os.path.join(directory, "tasks.json");
+        with open(path, "w") as f:
+            json.dump(data, f);
+        streamed = list(iter_tasks(path, chunk_size=16));
+        assert streamed == [ObsidianTask.from_dict(task) if("tags" in task) else Task.from_dict(task) for task in data["tasks"]];
+        assert [type(task) for task in streamed] == [ObsidianTask if("tags" in task) else Task for task in data["tasks"]];
+
+
+def test_storage_load_and_iter_tasks_agree():
+    with tempfile.TemporaryDirectory() as directory:
+        for journal in (False, True):
+            storage = JSONTaskStorage(os.path.join(directory, str(journal)), journal=journal);
+            storage.prepare();
+            #   Journal tasks over an empty task file, then over a compacted one
+            assert storage.commit([{"op": "add", "task": ObsidianTask(f"T{i}", "", i % 5 + 1, None, False, []).to_dict()} for i in range(10)]) != None;
+            assert sorted(task.name for task in storage.iter_tasks()) == sorted(task.name for task in storage.load()[0]);
+            storage.compact();
+            assert storage.commit([{"op": "remove", "name": "T3"}, {"op": "complete", "name": "T4"}, {"op": "add", "task": ObsidianTask("N", "", 1, None, False, []).to_dict()}]) != None;
+            loaded = {task.name: task.completed for task in storage.load()[0]};
+            assert {task.name: task.completed for task in storage.iter_tasks()} == loaded;
+            assert "T3" not in loaded and loaded["T4"] and "N" in loaded;
+
+
+if __name__ == "__main__":
+    for name, test in list(globals().items()):
+        if(name.startswith("test_")):
+            test();
+    print("OK");
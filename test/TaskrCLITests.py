@@ -0,0 +1,169 @@
+"""Test suite for the commands, queries and NDJSON batches of the `TaskrCLI.py` module
+
+    @author nrosenthal
+    @version 1.0
+    @since 2024-10-30
+"""
+import os;
+import sys;
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."));
+
+from contextlib import redirect_stdout;
+from datetime import datetime;
+from Taskr import Taskr;
+from TaskrCLI import execute_command, main, query, run_batch;
+from TaskStorage import JSONTaskStorage;
+import io;
+import json;
+import tempfile;
+
+
+#   Test data
+class CountingStorage(JSONTaskStorage):
+    """A `JSONTaskStorage` counting its loads and commits."""
+    def __init__(self, directory:str) -> None:
+        super().__init__(directory);
+        self.loads = 0;
+        self.commits = 0;
+
+    def load(self):
+        self.loads += 1;
+        return super().load();
+
+    def commit(self, records, task_manager = None, version = None):
+        self.commits += 1;
+        return super().commit(records, task_manager, version);
+
+def addCommand(name:str, priority:int = 3, due_date:str | None = None, tags:list[str] = [], id = None) -> dict:
+    command = {"op": "add", "task": {"name": name, "priority": priority, "due_date": due_date, "tags": tags}};
+    return command if(id == None) else {"id": id, **command};
+
+COMMANDS:list[dict] = [
+    addCommand("report", 5, "2024-10-30", ["#work"]),
+    addCommand("groceries", 2, "2024-11-02", ["#home"]),
+    addCommand("taxes", 4, "2024-11-15", ["#work", "#home"]),
+    addCommand("call", 1, None, ["#home"])
+];
+
+def batch(storage:JSONTaskStorage, lines:list[str]) -> tuple[bool, list[dict]]:
+    """Runs NDJSON lines against one session of a storage, returning whether they all succeeded and their results."""
+    output = io.StringIO();
+    with Taskr(storage=storage).session() as session:
+        ok = run_batch(lambda command: execute_command(session, command), lines, output);
+    return (ok, [json.loads(line) for line in output.getvalue().splitlines()]);
+
+def names(results:dict) -> list[str]:
+    return [task["name"] for task in results["tasks"]];
+
+
+#   Tests
+def test_execute_command():
+    with tempfile.TemporaryDirectory() as directory:
+        with Taskr(storage=JSONTaskStorage(directory)).session() as session:
+            for command in COMMANDS:
+                assert execute_command(session, command) == {"ok": True, "status": "SUCCESS"};
+            assert execute_command(session, {"id": 7, "op": "complete", "name": "taxes"}) == {"id": 7, "ok": True, "status": "SUCCESS"};
+            result = execute_command(session, {"op": "get", "name": "taxes"});
+            assert result["ok"] and result["task"]["completed"] and result["task"]["due_date"] == "2024-11-15";
+            assert execute_command(session, {"op": "get", "name": "missing"}) == {"ok": False, "task": None};
+            assert execute_command(session, {"op": "remove", "name": "missing"})["error"] == "Task not found: missing";
+            assert execute_command(session, {"op": "remove", "name": "call"})["ok"];
+            assert names(execute_command(session, {"op": "list"})) == ["groceries", "taxes", "report"];
+            assert not execute_command(session, {"op": "rename"})["ok"];
+            result = execute_command(session, addCommand("bad", "high"));
+            assert not result["ok"] and result["error"].startswith("ValueError");
+            assert execute_command(session, {"op": "flush"})["ok"];
+        assert names(execute_command(Taskr(storage=JSONTaskStorage(directory)).session(), {"op": "list"})) == ["groceries", "taxes", "report"];
+
+def test_query():
+    with tempfile.TemporaryDirectory() as directory:
+        with Taskr(storage=JSONTaskStorage(directory)).session() as session:
+            for command in COMMANDS:
+                execute_command(session, command);
+            session.complete_task(session.get_task("groceries"));
+            task_manager = session.task_manager;
+            def found(**command) -> list[str]:
+                return [task.name for task in query(task_manager, command)];
+            assert found() == ["call", "groceries", "taxes", "report"];
+            assert found(tags=["#work", "#home"]) == ["taxes"];
+            assert found(tags=["#work"], tag="#home", match="any") == ["call", "groceries", "taxes", "report"];
+            assert found(due_from="2024-11-01", due_to="2024-11-15") == ["groceries"];
+            assert found(due_from="2024-11-01", tags=["#home"]) == ["groceries", "taxes"];
+            assert found(due_to="2024-11-01 📅") == ["report"];
+            assert found(tags=["#home"], completed=False) == ["call", "taxes"];
+            assert found(priority="4") == ["taxes"];
+
+def test_batch_runs_one_session_per_stream():
+    with tempfile.TemporaryDirectory() as directory:
+        storage = CountingStorage(directory);
+        lines = [json.dumps(command) for command in COMMANDS] + ["", json.dumps({"id": "q", "op": "query", "tags": ["#home"]})];
+        ok, results = batch(storage, lines);
+        assert ok;
+        assert [result["ok"] for result in results] == [True] * 5;
+        assert results[-1]["id"] == "q" and names(results[-1]) == ["call", "groceries", "taxes"];
+        #   Four mutations, one load and one commit
+        assert (storage.loads, storage.commits) == (1, 1);
+        assert len(storage.load()[0]) == 4;
+
+def test_batch_answers_malformed_lines():
+    with tempfile.TemporaryDirectory() as directory:
+        storage = JSONTaskStorage(directory);
+        lines = [
+            json.dumps(addCommand("a", id=1)),
+            '{"op": "add", "task": ',
+            "[1, 2]",
+            json.dumps(addCommand("b", "x", id=2)),
+            json.dumps({"id": 3, "op": "add"}),
+            json.dumps(addCommand("c", id=4))
+        ];
+        ok, results = batch(storage, lines);
+        assert not ok;
+        assert [result["ok"] for result in results] == [True, False, False, False, False, True];
+        assert results[1]["error"].startswith("Invalid command line") and results[2]["error"].startswith("Invalid command line");
+        assert [result.get("id") for result in results] == [1, None, None, 2, 3, 4];
+        assert sorted(task.name for task in storage.load()[0]) == ["a", "c"];
+
+def test_batch_survives_any_error():
+    def execute(command:dict) -> dict:
+        if(command["op"] == "boom"):
+            raise RuntimeError("boom");
+        return {"ok": True};
+    output = io.StringIO();
+    assert not run_batch(execute, ['{"op": "boom", "id": 1}', '{"op": "fine"}'], output);
+    assert [json.loads(line) for line in output.getvalue().splitlines()] == [{"id": 1, "ok": False, "error": "RuntimeError: boom"}, {"ok": True}];
+
+class BrokenOutput(io.StringIO):
+    """An output that breaks after its first line, like a closed pipe."""
+    def write(self, text:str) -> int:
+        if(self.tell() > 0):
+            raise BrokenPipeError("closed");
+        return super().write(text);
+
+def test_main_batch_flushes_when_the_stream_breaks():
+    with tempfile.TemporaryDirectory() as directory:
+        stdin = sys.stdin;
+        sys.stdin = io.StringIO("\n".join(json.dumps(command) for command in COMMANDS) + "\n");
+        try:
+            with redirect_stdout(BrokenOutput()):
+                main(["--directory", directory, "batch"]);
+            assert False;
+        except BrokenPipeError:
+            pass;
+        finally:
+            sys.stdin = stdin;
+        assert [task.name for task in JSONTaskStorage(directory).load()[0]] == ["groceries", "report"];
+        sys.stdin = io.StringIO(json.dumps({"op": "complete", "name": "report"}) + "\n");
+        try:
+            with redirect_stdout(io.StringIO()) as out:
+                assert main(["--directory", directory, "batch"]) == 0;
+        finally:
+            sys.stdin = stdin;
+        assert json.loads(out.getvalue()) == {"ok": True, "status": "SUCCESS"};
+        assert JSONTaskStorage(directory).load()[0].get_task("report").completed;
+
+
+if __name__ == "__main__":
+    for name, test in list(globals().items()):
+        if(name.startswith("test_")):
+            test();
+    print("OK");
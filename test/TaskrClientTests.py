@@ -0,0 +1,80 @@
+"""Test suite for the `TaskrClient.py` module, and `Taskr` as a thin client of the Taskr daemon
+
+    @author nrosenthal
+    @version 1.0
+    @since 2024-10-30
+"""
+import os;
+import sys;
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."));
+
+from datetime import datetime;
+from primitives.Task import ObsidianTask;
+from Taskr import Taskr, TaskrStatus;
+from TaskrClient import TaskrClient;
+from TaskrDaemonTests import names, running;
+from TaskStorage import JSONTaskStorage;
+import socket;
+import tempfile;
+import threading;
+
+
+#   Tests
+def test_connect_without_a_daemon():
+    with tempfile.TemporaryDirectory() as directory:
+        path = os.path.join(directory, "taskr.sock");
+        assert TaskrClient.connect(path) == None;
+        #   A socket left behind by a daemon that is not running anymore
+        stale = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM);
+        stale.bind(path);
+        stale.close();
+        assert TaskrClient.connect(path) == None;
+
+def test_closed_connections_raise():
+    with running() as (daemon, storage, thread):
+        client = TaskrClient(daemon.socket_path);
+        client.close();
+        client.close();
+        try:
+            client.request({"op": "ping"});
+            assert False;
+        except ConnectionError:
+            pass;
+        client = TaskrClient(daemon.socket_path);
+        with TaskrClient(daemon.socket_path) as other:
+            other.request({"op": "shutdown"});
+        thread.join(10);
+        #   The daemon closed the connection: the client says so, and stays closed
+        for i in range(2):
+            try:
+                client.request({"op": "ping"});
+                assert False;
+            except OSError:
+                pass;
+        assert client.file == None;
+
+def test_taskr_thin_client():
+    with running() as (daemon, storage, thread):
+        with Taskr(storage=storage, socket_path=daemon.socket_path) as taskr:
+            assert taskr.client != None;
+            task = ObsidianTask("a", "remote", 4, datetime(2024, 10, 30), False, ["#daemon"]);
+            assert taskr.add_task(task) == TaskrStatus.SUCCESS;
+            assert taskr.complete_task(task) == TaskrStatus.SUCCESS;
+            found = taskr.get_task("a");
+            assert (found.description, found.priority, found.due_date, found.completed, found.tags) == ("remote", 4, datetime(2024, 10, 30), True, ["#daemon"]);
+            assert [task.name for task in taskr.getAllTasks()] == ["a"];
+            #   Nothing is on disk until the daemon flushes
+            assert names(storage) == [];
+        assert taskr.client == None;
+        with TaskrClient(daemon.socket_path) as client:
+            client.request({"op": "flush"});
+        assert names(storage) == ["a"];
+    with tempfile.TemporaryDirectory() as directory:
+        assert Taskr(storage=JSONTaskStorage(directory), socket_path=os.path.join(directory, "taskr.sock")).client == None;
+
+
+if __name__ == "__main__":
+    for name, test in list(globals().items()):
+        if(name.startswith("test_")):
+            test();
+    print("OK");
@@ -0,0 +1,196 @@
+"""Test suite for the socket protocol, concurrency, background flushes and shutdown of the `TaskrDaemon.py` module
+
+    @author nrosenthal
+    @version 1.0
+    @since 2024-10-30
+"""
+import os;
+import sys;
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."));
+
+from contextlib import contextmanager;
+from Taskr import Taskr;
+from TaskrClient import TaskrClient;
+from TaskrDaemon import TaskrDaemon;
+from TaskStorage import JSONTaskStorage;
+from typing import Iterator;
+import tempfile;
+import threading;
+import time;
+
+
+#   Test data
+TIMEOUT:float = 10.0;
+
+def addCommand(name:str, priority:int = 3) -> dict:
+    return {"op": "add", "task": {"name": name, "priority": priority, "tags": ["#daemon"]}};
+
+def waitFor(condition, timeout:float = TIMEOUT) -> bool:
+    """Polls a condition until it holds or the timeout expires."""
+    deadline = time.monotonic() + timeout;
+    while(time.monotonic() < deadline):
+        if(condition()):
+            return True;
+        time.sleep(0.01);
+    return condition();
+
+class SlowStorage(JSONTaskStorage):
+    """A `JSONTaskStorage` whose commits take a while, like those of a large task file."""
+    def commit(self, records, task_manager = None, version = None):
+        time.sleep(0.3);
+        return super().commit(records, task_manager, version);
+
+@contextmanager
+def running(flush_interval:float = 60.0, storage_class:type = JSONTaskStorage) -> Iterator[tuple[TaskrDaemon, JSONTaskStorage, threading.Thread]]:
+    """Runs a daemon over a new Taskr directory in a thread, shutting it down on exit if it is still running."""
+    with tempfile.TemporaryDirectory() as directory:
+        storage = JSONTaskStorage(directory);
+        storage.prepare();
+        daemon = TaskrDaemon(Taskr(storage=storage_class(directory)), os.path.join(directory, "taskr.sock"), flush_interval);
+        thread = threading.Thread(target=daemon.run, daemon=True);
+        thread.start();
+        assert waitFor(lambda: os.path.exists(daemon.socket_path));
+        try:
+            yield (daemon, storage, thread);
+        finally:
+            if(thread.is_alive()):
+                client = TaskrClient.connect(daemon.socket_path);
+                if(client != None):
+                    with client:
+                        client.request({"op": "shutdown"});
+                thread.join(TIMEOUT);
+
+def names(storage:JSONTaskStorage) -> list[str]:
+    return sorted(task.name for task in storage.load()[0]);
+
+
+#   Tests
+def test_round_trip():
+    with running() as (daemon, storage, thread):
+        with TaskrClient(daemon.socket_path) as client:
+            assert client.request({"op": "ping"}) == {"ok": True, "pending": 0};
+            assert client.request(addCommand("a", 4)) == {"ok": True, "status": "SUCCESS"};
+            assert client.request({"id": 1, "op": "get", "name": "a"})["task"]["priority"] == 4;
+            assert client.request({"op": "list"})["tasks"][0]["name"] == "a";
+            assert not client.request({"op": "complete", "name": "missing"})["ok"];
+            assert client.request({"op": "nonsense"})["ok"] == False;
+            assert client.request({"op": "ping"})["pending"] == 1;
+            assert client.request({"op": "flush"}) == {"ok": True, "status": "SUCCESS"};
+        assert names(storage) == ["a"];
+
+def test_invalid_lines_keep_the_connection():
+    with running() as (daemon, storage, thread):
+        with TaskrClient(daemon.socket_path) as client:
+            client.file.write(b"not json\n" + b"x" * (1 << 17) + b"\n");
+            client.file.flush();
+            assert client.file.readline().startswith(b'{"ok": false');
+            assert b"stream limit" in client.file.readline();
+            assert client.request({"op": "ping"})["ok"];
+
+def test_concurrent_reads():
+    with running() as (daemon, storage, thread):
+        with TaskrClient(daemon.socket_path) as client:
+            for i in range(20):
+                client.request(addCommand(f"task {i}", i % 5 + 1));
+        errors = [];
+        def read(worker:int) -> None:
+            with TaskrClient(daemon.socket_path) as client:
+                for i in range(50):
+                    name = f"task {(worker + i) % 20}";
+                    result = client.request({"op": "get", "name": name});
+                    if(not result["ok"] or result["task"]["name"] != name):
+                        errors.append(result);
+        readers = [threading.Thread(target=read, args=(worker,)) for worker in range(8)];
+        for reader in readers:
+            reader.start();
+        for reader in readers:
+            reader.join(TIMEOUT);
+        assert errors == [];
+
+def test_mutations_are_serialized():
+    with running() as (daemon, storage, thread):
+        def write(worker:int) -> None:
+            with TaskrClient(daemon.socket_path) as client:
+                for i in range(25):
+                    assert client.request(addCommand(f"{worker}-{i}"))["ok"];
+                    if(i % 5 == 0):
+                        client.request({"op": "flush"});
+                    assert client.request({"op": "complete", "name": f"{worker}-{i}"})["ok"];
+        writers = [threading.Thread(target=write, args=(worker,)) for worker in range(6)];
+        for writer in writers:
+            writer.start();
+        for writer in writers:
+            writer.join(TIMEOUT);
+        with TaskrClient(daemon.socket_path) as client:
+            client.request({"op": "flush"});
+        task_manager = storage.load()[0];
+        assert len(task_manager) == 150;
+        assert all(task.completed for task in task_manager);
+
+def test_flush_interval():
+    with running(flush_interval=0.05) as (daemon, storage, thread):
+        with TaskrClient(daemon.socket_path) as client:
+            client.request(addCommand("a"));
+            assert waitFor(lambda: client.request({"op": "ping"})["pending"] == 0);
+            assert names(storage) == ["a"];
+    with running(flush_interval=60.0) as (daemon, storage, thread):
+        with TaskrClient(daemon.socket_path) as client:
+            client.request(addCommand("a"));
+            time.sleep(0.2);
+            assert names(storage) == [];
+
+def test_shutdown_persists_and_closes_idle_clients():
+    with running() as (daemon, storage, thread):
+        idle = TaskrClient(daemon.socket_path);
+        with TaskrClient(daemon.socket_path) as client:
+            client.request(addCommand("a"));
+            client.request(addCommand("b"));
+            assert client.request({"op": "shutdown"}) == {"ok": True};
+        #   The idle client does not keep the daemon running
+        thread.join(TIMEOUT);
+        assert not thread.is_alive();
+        assert not os.path.exists(daemon.socket_path);
+        assert names(storage) == ["a", "b"];
+        #   Nothing sent afterwards is taken as accepted
+        try:
+            result = idle.request(addCommand("c"));
+            assert not result["ok"];
+        except OSError:
+            pass;
+        idle.close();
+        assert names(storage) == ["a", "b"];
+
+def test_mutations_after_shutdown_are_refused():
+    with running() as (daemon, storage, thread):
+        with TaskrClient(daemon.socket_path) as client:
+            client.request(addCommand("a"));
+            #   Both lines arrive together, so the mutation is read after the daemon started shutting down
+            client.file.write(b'{"op": "shutdown"}\n{"op": "add", "task": {"name": "late"}}\n');
+            client.file.flush();
+            responses = [client.file.readline(), client.file.readline()];
+        thread.join(TIMEOUT);
+        assert responses[0] == b'{"ok": true}\n';
+        assert responses[1] == b"" or b"shutting down" in responses[1];
+        assert names(storage) == ["a"];
+
+
+def test_every_accepted_mutation_survives_shutdown():
+    with running(storage_class=SlowStorage) as (daemon, storage, thread):
+        idle = TaskrClient(daemon.socket_path);
+        with TaskrClient(daemon.socket_path) as client:
+            client.request(addCommand("a"));
+            assert client.request({"op": "shutdown"}) == {"ok": True};
+        #   Sent while the final flush is running
+        try:
+            accepted = idle.request(addCommand("c"))["ok"];
+        except OSError:
+            accepted = False;
+        idle.close();
+        thread.join(TIMEOUT);
+        assert names(storage) == (["a", "c"] if(accepted) else ["a"]);
+
+if __name__ == "__main__":
+    for name, test in list(globals().items()):
+        if(name.startswith("test_")):
+            test();
+    print("OK");